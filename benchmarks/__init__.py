@@ -0,0 +1 @@
+# api/benchmarks/__init__.py
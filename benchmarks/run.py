@@ -0,0 +1,237 @@
+# api/benchmarks/run.py
+"""
+AzuraForge API yük ve performans ölçüm paketi.
+
+Gerçek `create_app()` uygulamasını uvicorn ile yerel bir portta çalıştırır ve dış bağımlılıklar için
+yerel yedekler kullanır: veritabanı (varsayılan geçici SQLite, ya da --database-url ile yerel Postgres),
+Redis (--redis-url, PATH'teki redis-server ya da fakeredis), bellek içi Celery broker'ı ve onu tüketen
+sahte bir worker. Her senaryo için p50/p95/p99 gecikme ve RPS'i JSON olarak yazar; --compare ile
+önceki bir çıktıyla (örn. başka bir commit) karşılaştırır.
+
+Örnek:
+    pip install -e .[dev,benchmark]
+    python -m benchmarks.run --experiments 10000 --output bench-main.json
+    python -m benchmarks.run --experiments 10000 --compare bench-main.json --max-regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from . import scenarios
+from .standins import StandInWorker, free_port, redis_standin
+
+logger = logging.getLogger("benchmarks")
+
+SCENARIOS = ("list", "walk", "catalog", "sweep", "predict", "websocket")
+# Karşılaştırmada "daha kötü" yön: gecikmeler artınca, RPS düşünce gerileme sayılır.
+COMPARED_METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "rps": -1}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="AzuraForge API benchmark suite")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Virgülle ayrılmış senaryolar ({', '.join(SCENARIOS)})")
+    parser.add_argument("--experiments", type=int, default=10_000, help="Veritabanına eklenecek deney sayısı (örn. 10000 veya 100000)")
+    parser.add_argument("--requests", type=int, default=500, help="Senaryo başına ölçülen istek sayısı")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--walk-page-size", type=int, default=1000)
+    parser.add_argument("--sweep-size", type=int, default=500)
+    parser.add_argument("--sweep-requests", type=int, default=10)
+    parser.add_argument("--prediction-latency", type=float, default=0.02, help="Sahte worker'ın tahmin başına gecikmesi (s)")
+    parser.add_argument("--sockets", type=int, default=1000)
+    parser.add_argument("--socket-tasks", type=int, default=10, help="WebSocket'lerin dağıtılacağı görev sayısı")
+    parser.add_argument("--socket-messages", type=int, default=20)
+    parser.add_argument("--socket-interval", type=float, default=0.05)
+    parser.add_argument("--database-url", default=None, help="Varsayılan: geçici bir SQLite dosyası")
+    parser.add_argument("--redis-url", default=None, help="Varsayılan: redis-server veya fakeredis başlatılır")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON dosyası (varsayılan: stdout)")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki JSON çıktısı")
+    parser.add_argument("--max-regression", type=float, default=None, help="Bu yüzdeden büyük gerilemede çıkış kodu 1")
+    return parser.parse_args(argv)
+
+
+def _git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+async def _prepare_database(experiments: int, pipeline_id: str) -> Dict[str, Any]:
+    """Şemayı oluşturur, deneyleri toplu ekler ve bir kullanıcı/token hazırlar."""
+    from sqlalchemy import insert
+    from azuraforge_dbmodels import Experiment, User
+    from azuraforge_api.core.security import create_access_token
+    from azuraforge_api.database import SessionLocal, get_engine
+    from azuraforge_api.schemas import UserCreate
+    from azuraforge_api.services import summary_service, user_service
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Experiment.metadata.create_all)
+        await conn.run_sync(User.metadata.create_all)
+    await summary_service.install_summary_schema(get_engine())
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with SessionLocal() as db:
+        for offset in range(0, experiments, 5000):
+            rows = []
+            for i in range(offset, min(offset + 5000, experiments)):
+                succeeded = i % 3 != 2
+                rows.append({
+                    "id": f"bench-{i:08d}", "task_id": f"bench-task-{i:08d}", "pipeline_name": pipeline_id,
+                    "status": "SUCCESS" if succeeded else "FAILURE", "batch_id": f"bench-batch-{i // 100}", "batch_name": f"Benchmark {i // 100}",
+                    "config": {"pipeline_name": pipeline_id, "data_sourcing": {"ticker": "MSFT"}, "training_params": {"epochs": 10 + i % 40, "lr": 0.001}},
+                    "results": {"final_loss": 1.0 / (i + 1), "metrics": {"r2_score": (i % 97) / 97, "mae": (i % 13) / 13}, "history": {"loss": [1.0 / (e + 1) for e in range(50)]}} if succeeded else None,
+                    "model_path": f"/tmp/benchmark-models/{i}.pkl" if succeeded else None,
+                    "created_at": now - timedelta(seconds=experiments - i), "completed_at": now if succeeded else None,
+                })
+            await db.execute(insert(Experiment), rows)
+            await db.commit()
+        if await user_service.get_user_by_username(db, "benchmark") is None:
+            await user_service.create_user(db, UserCreate(username="benchmark", password="benchmark-password"))
+    return {"token": create_access_token({"sub": "benchmark"}), "model_experiment_id": "bench-00000000" if experiments else None}
+
+
+async def _run(args: argparse.Namespace, stand_ins: Dict[str, str]) -> Dict[str, Any]:
+    import httpx
+    import uvicorn
+    from azuraforge_api.core.redis_pool import redis_pools
+    from azuraforge_api.main import app
+    from azuraforge_api.services.experiment_service import get_available_pipelines, get_celery_app
+    from azuraforge_api.services.progress_hub import publish_progress
+
+    # Eğitim ve tahmin görevleri bellek içi broker'a gider; sonuçlar yine Redis backend'inden okunur.
+    celery_app = get_celery_app()
+    celery_app.conf.broker_url = "memory://"
+    worker = StandInWorker(celery_app, prediction_latency=args.prediction_latency)
+    worker.start()
+
+    pipelines = get_available_pipelines()
+    # Kurulu pipeline yoksa config okumaları atlanır; sweep ve tahminler pipeline'ı çözmeden yayınlanır.
+    pipeline_id = pipelines[0]["id"] if pipelines else None
+    prepared = await _prepare_database(args.experiments, pipeline_id or "stock_predictor")
+    headers = {"Authorization": f"Bearer {prepared['token']}"}
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on", ws_max_queue=1024))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if server_task.done():
+            server_task.result()
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    selected = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    results: Dict[str, Any] = {}
+    sync_redis = redis_pools.sync_client()
+    limits = httpx.Limits(max_connections=max(args.concurrency, 1) * 2, max_keepalive_connections=max(args.concurrency, 1) * 2)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            for name in selected:
+                logger.info(f"Running scenario '{name}'...")
+                if name == "list":
+                    results["list_experiments"] = await scenarios.list_experiments(client, headers, args.requests, args.concurrency, args.warmup, args.page_size)
+                elif name == "walk":
+                    results["walk_experiments"] = await scenarios.walk_experiments(client, headers, args.walk_page_size)
+                elif name == "catalog":
+                    results["catalog_reads"] = await scenarios.catalog_reads(client, headers, pipeline_id, args.requests, args.concurrency, args.warmup)
+                elif name == "sweep":
+                    results[f"sweep_{args.sweep_size}"] = await scenarios.sweep_submission(client, headers, pipeline_id or "stock_predictor", args.sweep_size, args.sweep_requests, min(args.warmup, 1))
+                elif name == "predict":
+                    if prepared["model_experiment_id"] is None:
+                        continue
+                    results["predictions"] = await scenarios.predictions(client, headers, prepared["model_experiment_id"], args.requests, args.concurrency, args.warmup)
+                elif name == "websocket":
+                    results[f"websocket_fanout_{args.sockets}"] = await scenarios.websocket_fanout(
+                        base_url, lambda task_id, data: publish_progress(sync_redis, task_id, data),
+                        args.sockets, args.socket_tasks, args.socket_messages, args.socket_interval,
+                    )
+                else:
+                    raise SystemExit(f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}")
+    finally:
+        server.should_exit = True
+        await server_task
+        worker.stop()
+
+    return {
+        "schema_version": 1,
+        **_git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(), "platform": platform.platform(),
+        "stand_ins": {**stand_ins, "broker": "memory"},
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "max_regression", "database_url", "redis_url")},
+        "worker_tasks_received": dict(worker.received),
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Her senaryo/metrik için değişim yüzdesi; pozitif `regression_pct` daha kötü demektir."""
+    rows = []
+    for scenario, stats in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            old, new = previous.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            rows.append({"scenario": scenario, "metric": metric, "baseline": old, "current": new, "change_pct": round(change, 2), "regression_pct": round(change * direction, 2)})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    # API'nin kendi INFO logları (bağlantı aç/kapa) ölçüm çıktısını boğmasın.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stderr)
+    logger.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix="azuraforge-bench-") as workdir, redis_standin(args.redis_url) as (redis_url, redis_kind):
+        # Ayarlar import anında okunur; ortam, API modülleri import edilmeden önce hazırlanmalı.
+        database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        os.environ.update({
+            "DATABASE_URL": database_url, "REDIS_URL": redis_url,
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret"),
+            # Arka plan doldurması ölçümlere karışmasın; tetikleyiciler zaten eklemeleri izler.
+            "EXPERIMENT_SUMMARY_BACKFILL_ON_STARTUP": "false",
+            "SWEEP_MAX_COMBINATIONS": str(max(args.sweep_size, 5000)),
+        })
+        stand_ins = {"database": database_url.split(":", 1)[0], "redis": redis_kind}
+        report = asyncio.run(_run(args, stand_ins))
+
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(report, json.load(f))
+        for row in report["comparison"]:
+            logger.info(f"{row['scenario']:<28} {row['metric']:<7} {row['baseline']:>10} -> {row['current']:>10} ({row['change_pct']:+.1f}%)")
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        logger.info(f"Results written to {args.output}")
+    else:
+        print(output)
+
+    if args.max_regression is not None:
+        regressions = [row for row in report.get("comparison", []) if row["regression_pct"] > args.max_regression]
+        for row in regressions:
+            logger.error(f"Regression: {row['scenario']} {row['metric']} {row['baseline']} -> {row['current']} ({row['change_pct']:+.1f}%)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# api/benchmarks/scenarios.py
+
+import asyncio
+import json
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+# Her senaryo aynı biçimde rapor verir; sonuçlar commit'ler arasında doğrudan karşılaştırılabilir.
+Stats = Dict[str, Any]
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """En yakın sıra (nearest-rank) yüzdeliği."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int, **extra: Any) -> Stats:
+    ordered = sorted(latencies)
+
+    def to_ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "requests": len(ordered), "errors": errors, "elapsed_s": round(elapsed, 3),
+        "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else None,
+        "p50_ms": to_ms(percentile(ordered, 0.50)), "p95_ms": to_ms(percentile(ordered, 0.95)),
+        "p99_ms": to_ms(percentile(ordered, 0.99)), "max_ms": to_ms(ordered[-1] if ordered else None),
+        "mean_ms": to_ms(sum(ordered) / len(ordered) if ordered else None),
+        **extra,
+    }
+
+
+async def drive(request: Callable[[int], Awaitable[httpx.Response]], total: int, concurrency: int, warmup: int = 0) -> Stats:
+    """
+    `request(i)` çağrısını `total` kez, en fazla `concurrency` eşzamanlı olacak şekilde çalıştırır.
+    Isınma istekleri ölçülmez. 2xx/3xx dışındaki yanıtlar ve istisnalar hata sayılır.
+    """
+    for i in range(warmup):
+        await request(-1 - i)
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await request(i)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return summarize(latencies, time.perf_counter() - start, errors, concurrency=concurrency)
+
+
+async def list_experiments(client: httpx.AsyncClient, headers: Dict[str, str], requests: int, concurrency: int, warmup: int, page_size: int) -> Stats:
+    """İlk sayfanın eşzamanlı okunması (listeleme ekranının en sık isteği)."""
+    return await drive(lambda i: client.get("/api/v1/experiments", params={"limit": page_size}, headers=headers), requests, concurrency, warmup)
+
+
+async def walk_experiments(client: httpx.AsyncClient, headers: Dict[str, str], page_size: int) -> Stats:
+    """Tüm deney geçmişini keyset imleciyle sayfa sayfa, sırayla dolaşır (sayfa başına gecikme + satır/s)."""
+    latencies, rows, cursor, errors = [], 0, None, 0
+    start = time.perf_counter()
+    while True:
+        params = {"limit": page_size, **({"cursor": cursor} if cursor else {})}
+        page_start = time.perf_counter()
+        response = await client.get("/api/v1/experiments", params=params, headers=headers)
+        if response.status_code != 200:
+            errors += 1
+            break
+        latencies.append(time.perf_counter() - page_start)
+        rows += len(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, errors, page_size=page_size, rows=rows, rows_per_s=round(rows / elapsed, 1) if elapsed > 0 else None)
+
+
+async def catalog_reads(client: httpx.AsyncClient, headers: Dict[str, str], pipeline_id: Optional[str], requests: int, concurrency: int, warmup: int) -> Stats:
+    """Pipeline kataloğu ve varsayılan config okumaları, dönüşümlü (pipeline yoksa sadece katalog)."""
+    def request(i: int):
+        if pipeline_id and i % 2:
+            return client.get(f"/api/v1/pipelines/{pipeline_id}/config", headers=headers)
+        return client.get("/api/v1/pipelines", headers=headers)
+    return await drive(request, requests, concurrency, warmup)
+
+
+def sweep_config(pipeline_id: str, combinations: int) -> Dict[str, Any]:
+    """`combinations` kombinasyonlu bir ızgara: lr x epochs (ör. 500 = 20 x 25)."""
+    lr_count = next(n for n in range(int(math.sqrt(combinations)), 0, -1) if combinations % n == 0)
+    return {
+        "pipeline_name": pipeline_id, "batch_name": "benchmark-sweep",
+        "training_params": {"lr": [round(0.0001 * (i + 1), 6) for i in range(lr_count)], "epochs": list(range(1, combinations // lr_count + 1))},
+    }
+
+
+async def sweep_submission(client: httpx.AsyncClient, headers: Dict[str, str], pipeline_id: str, combinations: int, requests: int, warmup: int) -> Stats:
+    """`combinations` kombinasyonlu sweep'in gönderimi (force: tekrar kullanım kontrolü atlanır, her seferinde hepsi yayınlanır)."""
+    config = sweep_config(pipeline_id, combinations)
+    return await drive(lambda i: client.post("/api/v1/experiments", params={"force": "true"}, json=config, headers=headers), requests, 1, warmup)
+
+
+async def predictions(client: httpx.AsyncClient, headers: Dict[str, str], experiment_id: str, requests: int, concurrency: int, warmup: int) -> Stats:
+    """Eşzamanlı, birbirinden farklı (önbelleğe düşmeyen) tahmin istekleri; yanıtı sahte worker verir."""
+    return await drive(lambda i: client.post(f"/api/v1/experiments/{experiment_id}/predict", json={"prediction_steps": abs(i) + 1}, headers=headers), requests, concurrency, warmup)
+
+
+async def websocket_fanout(base_url: str, publish: Callable[[str, Dict[str, Any]], None], sockets: int, tasks: int, messages: int, interval: float) -> Stats:
+    """
+    `sockets` WebSocket'i `tasks` göreve dağıtarak açar, her göreve `messages` ilerleme mesajı yayınlar
+    ve yayından istemciye teslim gecikmesini ölçer. Teslim edilmeyen mesajlar hata sayılır.
+    """
+    import websockets
+
+    ws_url = base_url.replace("http://", "ws://")
+    task_ids = [f"benchmark-task-{i}" for i in range(tasks)]
+    latencies: List[float] = []
+    connect_latencies: List[float] = []
+    received = 0
+
+    async def client(task_id: str, ready: asyncio.Event, done: asyncio.Event, connected: List[int]) -> None:
+        nonlocal received
+        start = time.perf_counter()
+        async with websockets.connect(f"{ws_url}/ws/task_status/{task_id}", open_timeout=60, max_queue=None) as socket:
+            connect_latencies.append(time.perf_counter() - start)
+            connected[0] += 1
+            if connected[0] == sockets:
+                ready.set()
+            count = 0
+            while count < messages:
+                try:
+                    payload = json.loads(await asyncio.wait_for(socket.recv(), timeout=30))
+                except asyncio.TimeoutError:
+                    break
+                latencies.append(time.time() - payload["details"]["sent_at"])
+                count += 1
+                received += 1
+            await done.wait()
+
+    ready, done, connected = asyncio.Event(), asyncio.Event(), [0]
+    clients = [asyncio.create_task(client(task_ids[i % tasks], ready, done, connected)) for i in range(sockets)]
+    await asyncio.wait_for(ready.wait(), timeout=120)
+    # Hub aboneliklerinin yerleşmesi için kısa bir bekleme.
+    await asyncio.sleep(0.5)
+    start = time.perf_counter()
+    for n in range(messages):
+        for task_id in task_ids:
+            await asyncio.to_thread(publish, task_id, {"epoch": n, "sent_at": time.time()})
+        await asyncio.sleep(interval)
+    while received < sockets * messages and time.perf_counter() - start < 60:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+
+    expected = sockets * messages
+    # Burada "requests" teslim edilen mesaj, "rps" saniyedeki teslimat sayısıdır.
+    stats = summarize(latencies, elapsed, expected - received, sockets=sockets, tasks=tasks, messages_per_task=messages)
+    stats["connect_p95_ms"] = round(percentile(sorted(connect_latencies), 0.95) * 1000, 3) if connect_latencies else None
+    return stats
@@ -0,0 +1,117 @@
+# api/benchmarks/standins.py
+
+import contextlib
+import logging
+import queue
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"Stand-in on port {port} did not start within {timeout}s")
+
+
+@contextlib.contextmanager
+def redis_standin(url: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """
+    (Redis adresi, türü) üretir. Adres verilmişse o kullanılır; yoksa PATH'teki `redis-server`
+    geçici bir portta, o da yoksa fakeredis'in TCP sunucusu süreç içinde başlatılır.
+    API, Celery backend'i ve ilerleme yayıncısı hepsi aynı adrese gerçek protokolle bağlanır.
+    """
+    if url:
+        yield url, "external"
+        return
+    port = free_port()
+    if shutil.which("redis-server"):
+        process = subprocess.Popen(["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_for_port(port)
+            yield f"redis://127.0.0.1:{port}/0", "redis-server"
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+        return
+    try:
+        from fakeredis import TcpFakeServer
+    except ImportError:
+        raise RuntimeError("No Redis available: pass --redis-url, put redis-server on PATH or pip install fakeredis.")
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="fakeredis", daemon=True)
+    thread.start()
+    try:
+        _wait_for_port(port)
+        yield f"redis://127.0.0.1:{port}/0", "fakeredis"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StandInWorker:
+    """
+    Bellek içi (memory://) Celery broker'ını tüketen sahte worker. Tahmin görevlerini sabit bir
+    gecikmeden sonra gerçek bir worker gibi sonuç backend'ine (SET + PUBLISH) yazarak yanıtlar;
+    eğitim görevlerini sadece sayar. API tarafındaki yayın ve sonuç bekleme yolları değişmeden çalışır.
+    """
+
+    def __init__(self, celery_app: Any, prediction_latency: float, queue_name: str = "celery"):
+        self._celery_app = celery_app
+        self._prediction_latency = prediction_latency
+        self._queue_name = queue_name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._replies = ThreadPoolExecutor(max_workers=8, thread_name_prefix="standin-worker")
+        self.received: Counter = Counter()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="standin-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._replies.shutdown(wait=True)
+
+    def _run(self) -> None:
+        with self._celery_app.connection_for_read() as connection:
+            simple_queue = connection.SimpleQueue(self._queue_name, no_ack=True)
+            while not self._stop.is_set():
+                try:
+                    message = simple_queue.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                task_name, task_id = message.headers.get("task"), message.headers.get("id")
+                self.received[task_name] += 1
+                if task_name == "predict_from_model_task":
+                    args = message.payload[0]
+                    self._replies.submit(self._reply, task_id, args)
+
+    def _reply(self, task_id: str, args: Any) -> None:
+        time.sleep(self._prediction_latency)
+        experiment_id, _request_data, steps = (list(args) + [None, None, None])[:3]
+        steps = steps or 1
+        result: Dict[str, Any] = {
+            "prediction": 1.0, "experiment_id": experiment_id, "target_col": "Close",
+            "forecasted_series": {"dates": [f"d{i}" for i in range(steps)], "values": [1.0] * steps},
+        }
+        self._celery_app.backend.store_result(task_id, result, "SUCCESS")
@@ -0,0 +1,141 @@
+# api/benchmarks/startup.py
+"""
+API başlangıç süresi raporu ve bütçe kontrolü.
+
+Temiz bir süreçte `azuraforge_api.main` import süresini (birkaç tekrarın medyanı) ve uygulama
+lifespan'ının başlayıp istek kabul etmeye hazır olma süresini ölçer; `-X importtime` çıktısından en
+pahalı modülleri listeler. Ağır bağımlılıklar (pandas, numpy, pyarrow, celery) import anında yüklenmemelidir.
+
+Örnek:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --import-budget-ms 1500 --startup-budget-ms 2500 --output startup.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from .standins import redis_standin
+
+logger = logging.getLogger("benchmarks")
+
+# Import anında yüklenmemesi gereken modüller (ilk kullanımda veya lifespan içinde yüklenirler).
+LAZY_MODULES = ("pandas", "numpy", "pyarrow", "celery", "kombu")
+
+_MEASURE_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+import azuraforge_api.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_s": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+_MEASURE_STARTUP = """
+import asyncio, json, time
+start = time.perf_counter()
+from azuraforge_api.main import app
+imported = time.perf_counter()
+
+async def main():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    print(json.dumps({"import_s": imported - start, "lifespan_s": ready - imported, "ready_s": ready - start}))
+
+asyncio.run(main())
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _run(code: str, env: Dict[str, str], *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def _last_json_line(output: str) -> Dict[str, Any]:
+    return json.loads([line for line in output.splitlines() if line.startswith("{")][-1])
+
+
+def import_time_report(env: Dict[str, str], top: int) -> List[Dict[str, Any]]:
+    """`-X importtime` çıktısından kümülatif süresi en yüksek, doğrudan import edilen üçüncü parti ve API modülleri."""
+    stderr = _run("import azuraforge_api.main", env, "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append({"module": match[4], "self_ms": int(match[1]) / 1000, "cumulative_ms": int(match[2]) / 1000, "depth": len(match[3]) // 2})
+    # Derinlik 0-2: API'nin kendi modülleri ve onların doğrudan getirdiği paketler.
+    shallow = [r for r in rows if r["depth"] <= 2]
+    return sorted(shallow, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="AzuraForge API startup report")
+    parser.add_argument("--repeat", type=int, default=5, help="Import ölçümü tekrar sayısı (medyan raporlanır)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--import-budget-ms", type=float, default=None)
+    parser.add_argument("--startup-budget-ms", type=float, default=None, help="Import + lifespan (istek kabul etmeye hazır) bütçesi")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stderr)
+    logger.setLevel(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix="azuraforge-startup-") as workdir, redis_standin(args.redis_url) as (redis_url, redis_kind):
+        env = {
+            **os.environ, "REDIS_URL": redis_url,
+            "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret"),
+            "EXPERIMENT_SUMMARY_BACKFILL_ON_STARTUP": "false",
+        }
+        if not args.database_url:
+            # Boş SQLite dosyasına şemayı bir kez kur (üretimde bunu alembic ve entrypoint.sh yapar).
+            _run("import asyncio\nfrom azuraforge_dbmodels import Experiment, User\nfrom azuraforge_api.database import get_engine\n"
+                 "from azuraforge_api.services.summary_service import install_summary_schema\n"
+                 "async def main():\n    async with get_engine().begin() as conn:\n"
+                 "        await conn.run_sync(Experiment.metadata.create_all)\n        await conn.run_sync(User.metadata.create_all)\n"
+                 "    await install_summary_schema(get_engine())\n"
+                 "asyncio.run(main())", env)
+        imports = [_last_json_line(_run(_MEASURE_IMPORT, env).stdout) for _ in range(max(args.repeat, 1))]
+        # İlk lifespan varsayılan kullanıcıyı oluşturur; "sıcak" başlangıç ikinci çalıştırmadır.
+        startups = [_last_json_line(_run(_MEASURE_STARTUP, env).stdout) for _ in range(2)]
+        modules = import_time_report(env, args.top)
+
+    import_ms = round(statistics.median(r["import_s"] for r in imports) * 1000, 1)
+    report = {
+        "import_ms": import_ms,
+        "cold_start": {f"{k[:-2]}_ms": round(v * 1000, 1) for k, v in startups[0].items()},
+        "warm_start": {f"{k[:-2]}_ms": round(v * 1000, 1) for k, v in startups[1].items()},
+        "eagerly_loaded": sorted({m for r in imports for m in r["loaded"]}),
+        "top_imports": modules,
+        "stand_ins": {"redis": redis_kind, "database": env["DATABASE_URL"].split(":", 1)[0]},
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    failures = []
+    if report["eagerly_loaded"]:
+        failures.append(f"modules that should load lazily were imported at startup: {', '.join(report['eagerly_loaded'])}")
+    if args.import_budget_ms is not None and import_ms > args.import_budget_ms:
+        failures.append(f"import took {import_ms} ms (budget {args.import_budget_ms} ms)")
+    ready_ms = report["warm_start"]["ready_ms"]
+    if args.startup_budget_ms is not None and ready_ms > args.startup_budget_ms:
+        failures.append(f"startup took {ready_ms} ms (budget {args.startup_budget_ms} ms)")
+    for failure in failures:
+        logger.error(f"Startup budget exceeded: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
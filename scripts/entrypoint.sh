@@ -45,6 +45,11 @@ echo "Found alembic.ini at: $ALEMBIC_INI_PATH"
 alembic -c "$ALEMBIC_INI_PATH" upgrade head
 
 echo "API: Database migrations complete."
+
+# API'nin kendi nesneleri (deney özet tablosu ve tetikleyicileri); dbmodels'ten sonra, ayrı sürüm tablosuyla.
+# API başlangıcı DDL çalıştırmaz, sadece kontrol eder; eksik özetleri arka planda doldurur.
+echo "API: Running API migrations to 'head'..."
+python -m azuraforge_api.migrations upgrade head
 # === YENİ ADIM SONU ===
 
 echo "Starting application command: $@"
@@ -37,6 +37,97 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     ALGORITHM: str = "HS256"
 
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Tüm Redis kullanıcıları (katalog, WebSocket, tahmin vb.) süreç başına paylaşılan
+    # havuzları kullanır. Havuz dolduğunda yeni bağlantı açmak yerine en fazla
+    # REDIS_POOL_TIMEOUT saniye boş bir bağlantı beklenir.
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_POOL_DRAIN_TIMEOUT: float = 5.0
+    # WebSocket başına ilerleme mesajı kuyruğunun boyutu. Dolduğunda en eski mesaj atılır.
+    PROGRESS_QUEUE_SIZE: int = 100
+    # Geç bağlanan / yeniden bağlanan istemciler için görev başına sınırlı Redis Stream.
+    PROGRESS_STREAM_MAXLEN: int = 1000
+    PROGRESS_STREAM_TTL_SECONDS: int = 60 * 60 * 24
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    # Hiperparametre sweep'leri: tek bir istekte izin verilen en fazla kombinasyon,
+    # istek içinde senkron gönderilecek en fazla kombinasyon ve broker'a parti boyutu.
+    SWEEP_MAX_COMBINATIONS: int = 5000
+    SWEEP_SYNC_DISPATCH_LIMIT: int = 50
+    SWEEP_DISPATCH_BATCH_SIZE: int = 100
+    SWEEP_DISPATCH_WORKERS: int = 2
+    # Adaptif (halving/hyperband) sweep izleyicisinin biten denemeleri kontrol etme aralığı.
+    SWEEP_MONITOR_POLL_SECONDS: float = 30.0
+    # Tahmin görevinin sonucunun en fazla ne kadar bekleneceği.
+    PREDICTION_TIMEOUT_SECONDS: float = 60.0
+    # Tahmin sonuçları önbelleği: süreç içi LRU kapasitesi, yaşam süresi ve
+    # API süreçleri arasında paylaşılan opsiyonel Redis katmanı.
+    PREDICTION_CACHE_SIZE: int = 256
+    PREDICTION_CACHE_TTL_SECONDS: float = 300.0
+    PREDICTION_CACHE_SHARED: bool = False
+    # Opsiyonel süreç içi model sunumu: sıcak modeller API'nin yerel process pool'unda
+    # tutulur ve tahminler broker'a uğramadan çalıştırılır. Soğuk veya bu boyuttan büyük
+    # modeller her zaman worker'daki `predict_from_model_task`'e gider.
+    # Her model sabit bir sunum sürecine yönlendirilir; MODEL_SERVING_MAX_MODELS süreç başına sınırdır.
+    MODEL_SERVING_ENABLED: bool = False
+    MODEL_SERVING_WORKERS: int = 1
+    MODEL_SERVING_MAX_MODELS: int = 4
+    MODEL_SERVING_MAX_MODEL_BYTES: int = 50 * 1024 * 1024
+    # Celery kendi (kombu) havuzlarını yönetir; üst sınırları buradan verilir.
+    CELERY_BROKER_POOL_LIMIT: int = 10
+    # Celery sonuçlarının backend'de tutulma süresi (worker'ın `result_expires` ayarıyla aynı olmalı).
+    # Parmak izi indeksi bundan uzun yaşamaz: süresi dolan bir sonuç PENDING görünür ve güvenilmez.
+    CELERY_RESULT_EXPIRES_SECONDS: int = 60 * 60 * 24
+
+    # Tek asenkron SQLAlchemy engine'inin bağlantı havuzu ayarları.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Prometheus /metrics uç noktası ve istek ölçüm middleware'i. Kuyruk derinliği bu Celery kuyruklarından okunur.
+    METRICS_ENABLED: bool = True
+    METRICS_CELERY_QUEUES: str = "celery"
+
+    # Yönetim uç noktalarına (profiller vb.) erişebilen kullanıcı adları, virgülle ayrılmış.
+    ADMIN_USERNAMES: str = "admin"
+    # Yönetici isteklerinin yanıtlarına auth/db/redis/broker/serialize fazlarını gösteren Server-Timing
+    # başlığı eklenir; diğer kullanıcılar iç zamanlama bilgisini görmez.
+    SERVER_TIMING_ENABLED: bool = True
+    # Örnekleyici profilleyici: yöneticiler `X-Profile: 1` başlığı veya `?profile=1` ile ister;
+    # ayrıca isteklerin bu oranı (0-1) rastgele profillenir. Son profiller bellekte tutulur.
+    PROFILING_ENABLED: bool = True
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_MAX_PROFILES: int = 50
+
+    # Deney özet tablosu (experiment_summaries): şema kuruluysa başlangıçta eksik özetler arka planda bu boyutta parçalarla doldurulur.
+    EXPERIMENT_SUMMARY_BACKFILL_ON_STARTUP: bool = True
+    EXPERIMENT_SUMMARY_BACKFILL_BATCH_SIZE: int = 1000
+
+    # Bitmiş deneylerin rapor dosyaları değişmez; tarayıcılar bu süre boyunca yeniden istemez.
+    REPORT_CACHE_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 365
+    # Deney id -> rapor dizini eşlemesi (rapor görselleri veritabanına uğramadan sunulur).
+    REPORT_DIR_CACHE_SIZE: int = 4096
+    # Bitmiş deneylerin küçültülmüş eğrileri (karşılaştırma uç noktası) için önbellek: toplam nokta
+    # sayısı (her nokta bir x/y çifti) ve kayıt yaşam süresi.
+    CURVE_CACHE_MAX_POINTS: int = 500_000
+    CURVE_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Doğrulanmış token'ların kullanıcıları (token konusu/username ile) kısa süre önbelleğe alınır.
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    # bcrypt hash/doğrulama işlemlerini çalıştıran process pool'un boyutu.
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Pipeline kataloğu süreç içinde önbelleğe alınır. Değişiklikler Redis keyspace
+    # bildirimleri veya sürüm anahtarı ile algılanır; bu süre sadece bir emniyet ağıdır.
+    PIPELINE_CATALOG_REFRESH_SECONDS: int = 300
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding='utf-8',
@@ -37,4 +37,75 @@ class ExperimentNotFoundException(AzuraForgeException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Experiment with ID '{experiment_id}' not found.",
             error_code="EXPERIMENT_NOT_FOUND"
-        )
\ No newline at end of file
+        )
+
+class InvalidCursorException(AzuraForgeException):
+    def __init__(self, cursor: str):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Pagination cursor '{cursor}' is invalid.",
+            error_code="INVALID_CURSOR"
+        )
+
+class InvalidFieldsException(AzuraForgeException):
+    def __init__(self, fields: Any):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s) requested: {', '.join(sorted(fields))}.",
+            error_code="INVALID_FIELDS"
+        )
+class InvalidEventIdException(AzuraForgeException):
+    def __init__(self, event_id: str):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Event id '{event_id}' is not a valid progress stream id.",
+            error_code="INVALID_EVENT_ID"
+        )
+
+
+class SweepTooLargeException(AzuraForgeException):
+    def __init__(self, num_combinations: int, limit: int):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sweep would create {num_combinations} experiments; the limit is {limit}.",
+            error_code="SWEEP_TOO_LARGE"
+        )
+
+class BatchNotFoundException(AzuraForgeException):
+    def __init__(self, batch_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch with ID '{batch_id}' not found.",
+            error_code="BATCH_NOT_FOUND"
+        )
+
+class InvalidSweepException(AzuraForgeException):
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            error_code="INVALID_SWEEP"
+        )
+class AdminRequiredException(AzuraForgeException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is restricted to administrators.",
+            error_code="ADMIN_REQUIRED"
+        )
+
+class ProfileNotFoundException(AzuraForgeException):
+    def __init__(self, profile_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile '{profile_id}' not found (profiles are kept in memory, per API process).",
+            error_code="PROFILE_NOT_FOUND"
+        )
+
+class InvalidMetricException(AzuraForgeException):
+    def __init__(self, metric: str, allowed):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown metric '{metric}'. Allowed metrics: {', '.join(sorted(allowed))}.",
+            error_code="INVALID_METRIC"
+        )
@@ -0,0 +1,90 @@
+# api/src/azuraforge_api/core/http_cache.py
+
+import gzip
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+try:
+    import brotli  # opsiyonel: pip install azuraforge-api[compression]
+except ImportError:
+    brotli = None
+
+from .config import settings
+from .profiling import phase
+
+# Bu boyuttan küçük içerikleri sıkıştırmak kazançtan çok CPU harcar.
+MIN_COMPRESS_BYTES = 512
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Dosyanın değişiklik zamanı ve boyutundan türetilmiş güçlü ETag."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def is_not_modified(headers, etag: str, last_modified: float) -> bool:
+    """
+    İstek koşullu başlıklarına (If-None-Match, yoksa If-Modified-Since) göre
+    istemcinin kopyasının hâlâ geçerli olup olmadığını söyler.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # GET için zayıf karşılaştırma: W/ öneki ve sıkıştırma son eki yok sayılır.
+        base = etag.strip('"')
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            candidate = candidate.strip('"')
+            if candidate.split("-")[:2] == base.split("-")[:2]:
+                return True
+        return False
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cache_headers(etag: str, last_modified: float, immutable: bool) -> Dict[str, str]:
+    """
+    Doğrulayıcı başlıklar ve Cache-Control. İçerik kimlik doğrulaması gerektirdiği için `private`;
+    bitmiş deneylerin raporları değişmediğinden uzun ömürlü, diğerleri her seferinde doğrulanır.
+    """
+    cache_control = f"private, max-age={settings.REPORT_CACHE_MAX_AGE_SECONDS}, immutable" if immutable else "private, no-cache"
+    return {"ETag": etag, "Last-Modified": formatdate(last_modified, usegmt=True), "Cache-Control": cache_control}
+
+
+def choose_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """İstemcinin kabul ettiği en iyi kodlamayı seçer (varsa brotli, sonra gzip); küçük içerikler sıkıştırılmaz."""
+    if not accept_encoding or size < MIN_COMPRESS_BYTES:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Sıkıştırılmış temsil için ayrı bir güçlü ETag (aynı dosyanın farklı baytları)."""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def compress(content: bytes, encoding: Optional[str]) -> bytes:
+    if encoding is None:
+        return content
+    with phase("serialize"):
+        if encoding == "br":
+            return brotli.compress(content, quality=5)
+        return gzip.compress(content, compresslevel=6)
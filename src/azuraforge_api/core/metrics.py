@@ -0,0 +1,121 @@
+# api/src/azuraforge_api/core/metrics.py
+
+import threading
+import time
+from typing import Dict
+
+from prometheus_client import Gauge, Histogram
+
+from .profiling import record_phase
+
+# Sıcak yollardaki ölçümler sadece sayaç/histogram güncellemesidir (kilit + toplama); havuz, hub ve
+# kuyruk durumları gibi değerler ise ancak /metrics okunurken toplanır. Böylece üretimde açık kalabilir.
+# Etiketler sınırlı kümelerden gelir (route şablonu, komut adı, görev adı); ham yol veya id kullanılmaz.
+
+# Saniye cinsinden. LATENCY_BUCKETS API istekleri, FAST_BUCKETS milisaniye altı Redis/havuz/broker işlemleri için.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+PREDICTION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_DURATION = Histogram("azuraforge_http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route", "status"], buckets=LATENCY_BUCKETS)
+HTTP_REQUESTS_IN_PROGRESS = Gauge("azuraforge_http_requests_in_progress", "HTTP requests currently being served.", ["method"])
+WEBSOCKET_CONNECTIONS = Gauge("azuraforge_websocket_connections", "Open WebSocket connections.")
+DB_POOL_CHECKOUT = Histogram("azuraforge_db_pool_checkout_seconds", "Time spent waiting for a database connection from the pool.", buckets=FAST_BUCKETS)
+REDIS_COMMAND_DURATION = Histogram("azuraforge_redis_command_duration_seconds", "Redis command latency (including pool checkout).", ["command"], buckets=FAST_BUCKETS)
+CELERY_PUBLISH_DURATION = Histogram("azuraforge_celery_publish_duration_seconds", "Time to publish a task message to the broker.", ["task"], buckets=FAST_BUCKETS)
+PREDICTION_WAIT = Histogram("azuraforge_prediction_wait_seconds", "Time a prediction request waits for its result.", ["source"], buckets=PREDICTION_BUCKETS)
+
+
+def _route_template(scope) -> str:
+    """Eşleşen route'un tam şablonu (örn. /api/v1/experiments/{experiment_id}/details); eşleşme yoksa sabit bir etiket."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Dahil edilen router'ların route'ları kendi önekleri olmadan gelebilir; önek, istek yolunun
+    # route'a karşılık gelen kısmından önceki bölümdür.
+    try:
+        rendered = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope.get("path", "")
+    return path[:len(path) - len(rendered)] + template if path.endswith(rendered) else template
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: istek süresi ve eşzamanlı istek sayısını, WebSocket'ler için açık bağlantı sayısını tutar.
+    BaseHTTPMiddleware yerine ASGI seviyesinde çalışır; akış (streaming) yanıtlarını tamponlamaz.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            WEBSOCKET_CONNECTIONS.inc()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                WEBSOCKET_CONNECTIONS.dec()
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(scope["method"])
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # Yönlendirici eşleşen route'u scope'a yazar; etiket isteğin sonunda okunur.
+            HTTP_REQUEST_DURATION.labels(scope["method"], _route_template(scope), str(status_code)).observe(time.perf_counter() - start)
+
+
+def observe_redis_command(args, start: float) -> None:
+    command = args[0] if args else "UNKNOWN"
+    if isinstance(command, bytes):
+        command = command.decode("ascii", "replace")
+    elapsed = time.perf_counter() - start
+    REDIS_COMMAND_DURATION.labels(str(command).upper()).observe(elapsed)
+    record_phase("redis", elapsed)
+
+
+_publish_started: Dict[str, float] = {}
+_publish_lock = threading.Lock()
+_celery_instrumented = False
+
+
+def instrument_celery() -> None:
+    """Celery yayın sinyallerine bağlanarak `send_task` süresini ölçer. Birden çok kez çağrılabilir."""
+    global _celery_instrumented
+    if _celery_instrumented:
+        return
+    from celery.signals import after_task_publish, before_task_publish
+
+    # Mesaj protokolü 2'de görev id'si başlıklarda taşınır; iki sinyal aynı yayını bununla eşleştirir.
+    def on_before_publish(sender=None, headers=None, **kwargs):
+        with _publish_lock:
+            _publish_started[(headers or {}).get("id")] = time.perf_counter()
+
+    def on_after_publish(sender=None, headers=None, **kwargs):
+        with _publish_lock:
+            start = _publish_started.pop((headers or {}).get("id"), None)
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            CELERY_PUBLISH_DURATION.labels(sender or "unknown").observe(elapsed)
+            record_phase("broker", elapsed)
+
+    before_task_publish.connect(on_before_publish, weak=False)
+    after_task_publish.connect(on_after_publish, weak=False)
+    _celery_instrumented = True
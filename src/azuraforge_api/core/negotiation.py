@@ -0,0 +1,154 @@
+# api/src/azuraforge_api/core/negotiation.py
+
+import importlib.util
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from .profiling import phase
+
+# Hızlı kodlayıcılar opsiyoneldir: pip install azuraforge-api[fast-formats]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+# pyarrow büyük bir bağımlılıktır (import ~100 ms); başlangıçta sadece kurulu olup olmadığına bakılır,
+# modül ilk Arrow yanıtında yüklenir.
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def _pyarrow():
+    import pyarrow
+    return pyarrow
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+# Eski istemcilerin gönderdiği eşdeğer adlar.
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+def available_media_types(tabular: bool) -> List[str]:
+    """Bu süreçte üretilebilen temsiller, tercih sırasıyla. Arrow sadece tablo/zaman serisi verisi için."""
+    types = [JSON]
+    if msgpack is not None:
+        types.append(MSGPACK)
+    if tabular and ARROW_AVAILABLE:
+        types.append(ARROW)
+    return types
+
+
+def negotiate(accept: Optional[str], tabular: bool = False) -> str:
+    """
+    Accept başlığına göre en uygun temsili seçer. Başlık yoksa veya `*/*` ise JSON döner;
+    istenen hiçbir temsil üretilemiyorsa 406 fırlatır.
+    """
+    if not accept:
+        return JSON
+    offered = available_media_types(tabular)
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media_range, *params = [p.strip() for p in part.split(";")]
+        media_range = MEDIA_TYPE_ALIASES.get(media_range.lower(), media_range.lower())
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q <= 0:
+            continue
+        if media_range in ("*/*", "application/*"):
+            candidate = JSON
+        elif media_range in offered:
+            candidate = media_range
+        else:
+            continue
+        # Eşit q değerlerinde başlıkta önce gelen kazanır.
+        if q > best_q:
+            best, best_q = candidate, q
+    if best is None:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=f"Supported media types: {', '.join(offered)}.")
+    return best
+
+
+def _dumps_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _arrow_ipc(table: "pa.Table") -> bytes:
+    pa = _pyarrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render(data: Any, media_type: str, to_table: Optional[Callable[[Any], "pa.Table"]] = None, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Veriyi seçilen temsille kodlar. JSON varsayılandır (orjson varsa onunla);
+    Arrow için `to_table` veriyi bir pyarrow tablosuna çevirir.
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    with phase("serialize"):
+        if media_type == ARROW and to_table is not None:
+            content, media_type = _arrow_ipc(to_table(data)), ARROW
+        elif media_type == MSGPACK:
+            content = msgpack.packb(jsonable_encoder(data), use_bin_type=True)
+        else:
+            content, media_type = _dumps_json(data), JSON
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+def rows_to_table(rows: List[Dict[str, Any]], json_columns: Iterable[str] = ()) -> "pa.Table":
+    """
+    Satır listesini sütunlu bir Arrow tablosuna çevirir; sabit biçimli iç içe sözlükler struct sütunu olur.
+    Arrow her sütun için tek bir tip çıkarır; satırdan satıra biçimi değişen serbest alanlar (`json_columns`)
+    bu yüzden JSON metni olarak yazılır ve şema meta verisinde listelenir.
+    """
+    json_columns = [c for c in json_columns if any(c in row for row in rows)]
+    encoded = jsonable_encoder(rows)
+    for row in encoded:
+        for column in json_columns:
+            if column in row and row[column] is not None:
+                row[column] = json.dumps(row[column], separators=(",", ":"))
+    table = _pyarrow().Table.from_pylist(encoded)
+    return table.replace_schema_metadata({"json_columns": json.dumps(json_columns)}) if json_columns else table
+
+
+def _series_rows(name: str, series: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not series:
+        return []
+    values = list(series.values())
+    # Sütun odaklı seri: {"dates": [...], "values": [...]} -> her indeks bir satır.
+    if values and all(isinstance(v, list) for v in values):
+        keys = list(series.keys())
+        return [{"series": name, **dict(zip(keys, row))} for row in zip(*values)]
+    # Eşleme: {"2024-01-01": 150.0, ...} -> (anahtar, değer) satırları.
+    return [{"series": name, "index": str(k), "value": v} for k, v in series.items()]
+
+
+def prediction_to_table(prediction: Dict[str, Any]) -> "pa.Table":
+    """
+    Tahmin yanıtının zaman serisi kısımlarını (actual_history, forecasted_series) tek bir tabloya çevirir.
+    Skaler alanlar (prediction, experiment_id, target_col) şema meta verisine yazılır.
+    """
+    pa = _pyarrow()
+    rows = _series_rows("actual_history", prediction.get("actual_history")) + _series_rows("forecasted_series", prediction.get("forecasted_series"))
+    # İki seri farklı biçimde olabilir; şema tüm satırların sütunlarının birleşimidir.
+    columns = list(dict.fromkeys(key for row in rows for key in row)) or ["series"]
+    table = pa.Table.from_pylist(jsonable_encoder([{c: row.get(c) for c in columns} for row in rows])) if rows else pa.table({"series": pa.array([], pa.string())})
+    metadata = {k: json.dumps(prediction.get(k), default=str) for k in ("prediction", "experiment_id", "target_col")}
+    return table.replace_schema_metadata(metadata)
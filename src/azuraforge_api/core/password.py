@@ -1,15 +1,45 @@
 # api/src/azuraforge_api/core/password.py
 
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
-# Bu modül sadece parola işlemleriyle ilgilenir ve başka hiçbir
+from .config import settings
+
+# Bu modül sadece parola işlemleriyle ilgilenir ve ayarlar dışında başka hiçbir
 # proje modülüne bağımlı değildir.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt bilerek yavaştır (~250 ms CPU). Hash/doğrulama işlemleri sınırlı bir process
+# pool'da çalıştırılır; giriş patlamaları API sürecinin CPU'sunu ve GIL'ini tüketmez.
+_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _executor
+
+def shutdown_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
 def get_password_hash(password: str) -> str:
     """Verilen parolayı hash'ler."""
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Parolayı hash ile karşılaştırır."""
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash'i parola havuzunda çalıştırır; olay döngüsü beklerken serbest kalır."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password'ü parola havuzunda çalıştırır; olay döngüsü beklerken serbest kalır."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), verify_password, plain_password, hashed_password)
@@ -0,0 +1,223 @@
+# api/src/azuraforge_api/core/profiling.py
+
+import asyncio
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from jose import JWTError, jwt
+
+from .config import settings
+
+# --- Server-Timing: istek başına faz süreleri ---
+# Kancalar (auth bağımlılığı, SQLAlchemy olayları, Redis istemcisi, Celery yayını, render) süreleri
+# isteğin context'indeki sözlüğe ekler. Thread'lere (to_thread) kopyalanan context aynı sözlüğü görür.
+SERVER_TIMING_PHASES = ("auth", "db", "redis", "broker", "serialize")
+_phase_totals: ContextVar[Optional[Dict[str, float]]] = ContextVar("azuraforge_phase_totals", default=None)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    totals = _phase_totals.get()
+    if totals is not None:
+        totals[name] = totals.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def server_timing_header(totals: Dict[str, float], total: float) -> str:
+    parts = [f"{name};dur={totals[name] * 1000:.1f}" for name in SERVER_TIMING_PHASES if name in totals]
+    return ", ".join(parts + [f"total;dur={total * 1000:.1f}"])
+
+
+# --- Örnekleyici profilleyici ---
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Tek bir isteğin asyncio görevini ayrı bir thread'den sabit aralıklarla örnekler (duvar saati profili).
+    Görev o an çalışıyorsa olay döngüsü thread'inin yığını, görevin kök frame'ine kadar alınır; askıdaysa
+    await zinciri izlenir ve `[await]` ile biter. Böylece aynı döngüdeki diğer isteklerin yığınları karışmaz
+    ve I/O beklemeleri de (veritabanı, Redis, worker) profilde görünür.
+    """
+
+    def __init__(self, task: asyncio.Task, thread_id: int, interval: float):
+        self._task = task
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples: Counter = Counter()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="azuraforge-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self._sample()
+            except Exception:
+                # Görev tam o anda ilerliyor olabilir; bu örnek atlanır.
+                continue
+
+    def _sample(self) -> None:
+        coro = self._task.get_coro()
+        root = getattr(coro, "cr_frame", None)
+        if root is None:
+            return
+        stack = []
+        frame = sys._current_frames().get(self._thread_id)
+        while frame is not None:
+            stack.append(frame)
+            if frame is root:
+                break
+            frame = frame.f_back
+        if stack and stack[-1] is root:
+            labels = [_frame_label(f) for f in reversed(stack)]
+        else:
+            labels, awaitable = [], coro
+            while awaitable is not None:
+                frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+                if frame is None:
+                    break
+                labels.append(_frame_label(frame))
+                awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+            labels.append("[await]")
+        self.samples[";".join(labels)] += 1
+
+    def folded(self) -> str:
+        """Brendan Gregg'in 'folded stacks' biçimi (flamegraph.pl, inferno, speedscope bunu okur)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """Son profillerin süreç içindeki sınırlı deposu (en eskisi atılır)."""
+
+    def __init__(self, maxsize: int):
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != "folded"} for p in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((p for p in self._profiles if p["id"] == profile_id), None)
+
+
+profile_store = ProfileStore(maxsize=settings.PROFILING_MAX_PROFILES)
+
+
+def admin_usernames() -> frozenset:
+    return frozenset(u.strip() for u in settings.ADMIN_USERNAMES.split(",") if u.strip())
+
+
+def _bearer_username(scope) -> Optional[str]:
+    """Authorization başlığındaki token'ın kullanıcı adı; veritabanına gidilmez, sadece imza doğrulanır."""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+            except JWTError:
+                return None
+    return None
+
+
+def _profiling_trigger(scope) -> Optional[str]:
+    """İsteğin profillenip profillenmeyeceği: yöneticinin açıkça istemesi veya örnekleme oranı."""
+    if not settings.PROFILING_ENABLED:
+        return None
+    requested = any(name == b"x-profile" and value.lower() in (b"1", b"true") for name, value in scope.get("headers", []))
+    query_string = scope.get("query_string", b"")
+    if not requested and b"profile=" in query_string:
+        requested = parse_qs(query_string.decode("latin-1")).get("profile", [""])[0].lower() in ("1", "true")
+    if requested and _bearer_username(scope) in admin_usernames():
+        return "requested"
+    if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Saf ASGI middleware: yöneticilerin HTTP yanıtlarına Server-Timing başlığı ekler; tetiklenen isteklerde örnekleyici
+    profilleyiciyi çalıştırır, profili `profile_store`'a yazar ve kimliğini X-Profile-Id başlığıyla döndürür.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Server-Timing iç fazları (db/redis/broker) açığa çıkarır; profilleyici gibi sadece yöneticilere gönderilir.
+        emit_timing = settings.SERVER_TIMING_ENABLED and _bearer_username(scope) in admin_usernames()
+        trigger = _profiling_trigger(scope)
+        totals: Optional[Dict[str, float]] = {} if emit_timing or trigger else None
+        context_token = _phase_totals.set(totals)
+        profiler, profile_id = None, None
+        if trigger:
+            profiler = SamplingProfiler(asyncio.current_task(), threading.get_ident(), settings.PROFILING_INTERVAL_SECONDS)
+            profile_id = uuid.uuid4().hex
+            profiler.start()
+        started_at, start, status_code = datetime.now(timezone.utc), time.perf_counter(), 500
+
+        async def send_with_headers(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                if emit_timing:
+                    headers.append((b"server-timing", server_timing_header(totals, time.perf_counter() - start).encode("latin-1")))
+                if profile_id:
+                    headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _phase_totals.reset(context_token)
+            if profiler is not None:
+                profiler.stop()
+                profile_store.add({
+                    "id": profile_id, "trigger": trigger, "method": scope["method"], "path": scope["path"], "status": status_code,
+                    "started_at": started_at.isoformat(), "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "interval_ms": settings.PROFILING_INTERVAL_SECONDS * 1000, "samples": sum(profiler.samples.values()),
+                    "phases_ms": {name: round(value * 1000, 3) for name, value in (totals or {}).items()},
+                    "folded": profiler.folded(),
+                })
@@ -0,0 +1,129 @@
+# api/src/azuraforge_api/core/redis_pool.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Any, Union
+
+import redis
+import redis.asyncio as aioredis
+
+from .config import settings
+from .metrics import observe_redis_command
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_kwargs(decode_responses: bool) -> Dict[str, Any]:
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "decode_responses": decode_responses,
+    }
+
+
+def _pool_stats(pool: Union[redis.ConnectionPool, aioredis.ConnectionPool]) -> Dict[str, int]:
+    """Senkron ve asenkron havuzların iç sayaçlarını ortak bir formata çevirir."""
+    if hasattr(pool, "_in_use_connections"):
+        in_use, idle = len(pool._in_use_connections), len(pool._available_connections)
+    else:
+        # Senkron BlockingConnectionPool: kuyrukta None olmayanlar boşta bekleyen bağlantılardır.
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        in_use = len(pool._connections) - idle
+    return {"max_connections": pool.max_connections, "in_use": in_use, "idle": idle, "created": in_use + idle}
+
+
+class _TimedRedis(redis.Redis):
+    """Komut gecikmesini ölçen senkron istemci (pipeline ve pub/sub kendi yollarını kullanır, ölçülmez)."""
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(args, start)
+
+
+class _TimedAsyncRedis(aioredis.Redis):
+    """Komut gecikmesini ölçen asenkron istemci."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            observe_redis_command(args, start)
+
+
+class RedisPools:
+    """
+    Süreç genelinde paylaşılan senkron ve asenkron Redis bağlantı havuzları.
+    Havuzlar ilk kullanımda oluşturulur ve uygulama kapanırken `drain()` ile boşaltılır.
+    """
+
+    def __init__(self, url: str):
+        self._url = url
+        self._sync_pools: Dict[bool, redis.BlockingConnectionPool] = {}
+        self._async_pools: Dict[bool, aioredis.BlockingConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def _sync_pool(self, decode_responses: bool) -> redis.BlockingConnectionPool:
+        pool = self._sync_pools.get(decode_responses)
+        if pool is None:
+            with self._lock:
+                pool = self._sync_pools.get(decode_responses)
+                if pool is None:
+                    pool = redis.BlockingConnectionPool.from_url(self._url, **_pool_kwargs(decode_responses))
+                    self._sync_pools[decode_responses] = pool
+        return pool
+
+    def _async_pool(self, decode_responses: bool) -> aioredis.BlockingConnectionPool:
+        # Asenkron havuzlar olay döngüsüne bağlıdır ve sadece o döngüden kullanılır;
+        # bu yüzden kilide gerek yoktur.
+        pool = self._async_pools.get(decode_responses)
+        if pool is None:
+            pool = aioredis.BlockingConnectionPool.from_url(self._url, **_pool_kwargs(decode_responses))
+            self._async_pools[decode_responses] = pool
+        return pool
+
+    def sync_client(self, decode_responses: bool = False) -> redis.Redis:
+        """Paylaşılan havuzu kullanan bir senkron istemci döndürür. İstemciyi kapatmak gerekmez."""
+        return _TimedRedis(connection_pool=self._sync_pool(decode_responses))
+
+    def async_client(self, decode_responses: bool = False) -> aioredis.Redis:
+        """Paylaşılan havuzu kullanan bir asenkron istemci döndürür. İstemciyi kapatmak gerekmez."""
+        return _TimedAsyncRedis(connection_pool=self._async_pool(decode_responses))
+
+    def stats(self) -> Dict[str, Any]:
+        """Her havuz için kullanımda/boşta bağlantı sayılarını döndürür."""
+        pools = {}
+        for decode, pool in list(self._sync_pools.items()):
+            pools[f"sync{'_decoded' if decode else ''}"] = _pool_stats(pool)
+        for decode, pool in list(self._async_pools.items()):
+            pools[f"async{'_decoded' if decode else ''}"] = _pool_stats(pool)
+        return pools
+
+    async def drain(self, timeout: float) -> None:
+        """
+        Kullanımdaki bağlantıların havuza dönmesini en fazla `timeout` saniye bekler,
+        ardından tüm bağlantıları kapatır.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(s["in_use"] for s in self.stats().values()):
+            await asyncio.sleep(0.05)
+        busy = {name: s["in_use"] for name, s in self.stats().items() if s["in_use"]}
+        if busy:
+            logger.warning(f"Redis pools still busy after {timeout}s drain, closing anyway: {busy}")
+        for pool in self._async_pools.values():
+            await pool.disconnect()
+        for pool in self._sync_pools.values():
+            pool.disconnect()
+        self._async_pools.clear()
+        self._sync_pools.clear()
+
+
+redis_pools = RedisPools(settings.REDIS_URL)
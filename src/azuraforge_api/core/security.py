@@ -7,10 +7,13 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .config import settings
+from .exceptions import AdminRequiredException
+from .profiling import admin_usernames, phase
 from ..services import user_service
-from ..database import SessionLocal 
+from ..database import get_db
 
 # DİKKAT: Artık parola fonksiyonlarını buradan import ETMİYORUZ.
 # Onlar user_service içinde doğrudan password.py'den import edilecek.
@@ -29,11 +32,15 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     """
     Token'ı doğrular ve mevcut kullanıcıyı döndürür.
     Bu, korunmuş endpoint'lerde bir bağımlılık (dependency) olarak kullanılacak.
     """
+    with phase("auth"):
+        return await _authenticate(token, db)
+
+async def _authenticate(token: str, db: AsyncSession):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -48,12 +55,14 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    # Veritabanından kullanıcıyı al
-    db = SessionLocal()
-    try:
-        user = user_service.get_user_by_username(db, username=token_data.username)
-        if user is None:
-            raise credentials_exception
-        return user
-    finally:
-        db.close()
\ No newline at end of file
+    # Kullanıcıyı önbellekten (yoksa veritabanından) al; doğrulanmış okumalar ek sorgu gerektirmez.
+    user = await user_service.get_cached_user(db, token_data.username)
+    if user is None:
+        raise credentials_exception
+    return user
+
+async def get_current_admin_user(current_user = Depends(get_current_user)):
+    """Sadece ADMIN_USERNAMES içindeki kullanıcılara açık yönetim uç noktaları için bağımlılık."""
+    if current_user.username not in admin_usernames():
+        raise AdminRequiredException()
+    return current_user
@@ -1,20 +1,114 @@
 # api/src/azuraforge_api/database.py
 
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .core.config import settings
+from .core.metrics import DB_POOL_CHECKOUT
+from .core.profiling import record_phase
 
 # --- DEĞİŞİKLİK: Veritabanı modeli tanımını buradan kaldırıyoruz ---
 # Artık tüm modeller `azuraforge-dbmodels` paketinden gelecek.
 # Bu, tüm servislerin aynı veritabanı şemasına sahip olmasını garanti eder
 # ve "tek doğruluk kaynağı" ilkesini korur.
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("API: DATABASE_URL ortam değişkeni ayarlanmamış!")
+# DATABASE_URL senkron sürücüyle de verilebilir (alembic onu kullanır); API aynı
+# veritabanına asenkron sürücüsüyle bağlanır.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def to_async_url(url: str) -> str:
+    """`postgresql+psycopg2://...` gibi bir adresi asenkron sürücülü karşılığına çevirir."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS and parsed.drivername != ASYNC_DRIVERS[backend]:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Havuzdan bağlantı almak için geçen (bekleme dahil) süreyi ölçen kuyruk havuzu."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_POOL_CHECKOUT.observe(elapsed)
+            record_phase("db", elapsed)
+
+def _engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # SQLite (yerel testler) kendi havuz sınıfını kullanır; boyut ayarları sadece sunucu veritabanları için.
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(poolclass=TimedQueuePool, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW, pool_timeout=settings.DB_POOL_TIMEOUT, pool_recycle=settings.DB_POOL_RECYCLE_SECONDS)
+    return options
+
+# Sorgu süreleri isteğin Server-Timing `db` fazına eklenir. Başlangıç zamanı her çalıştırmanın kendi
+# execution context'inde tutulur; hata veren sorgular bağlantıda artık kayıt bırakmaz.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._azuraforge_query_start = time.perf_counter()
+
+def _record_query_time(context) -> None:
+    start = getattr(context, "_azuraforge_query_start", None)
+    if start is not None:
+        del context._azuraforge_query_start
+        record_phase("db", time.perf_counter() - start)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query_time(context)
+
+def _handle_error(exception_context):
+    _record_query_time(exception_context.execution_context)
+
+# Süreç başına tek engine ve tek bağlantı havuzu. Tüm servisler bunu kullanır. Import anında değil,
+# ilk kullanımda (normalde uygulama lifespan'ının başında) kurulur.
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> AsyncEngine:
+    global _engine, _session_factory
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                database_url = os.getenv("DATABASE_URL")
+                if not database_url:
+                    raise ValueError("API: DATABASE_URL ortam değişkeni ayarlanmamış!")
+                async_url = to_async_url(database_url)
+                engine = create_async_engine(async_url, **_engine_options(async_url))
+                event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+                event.listen(engine.sync_engine, "handle_error", _handle_error)
+                # expire_on_commit=False: commit sonrası nesneler yeniden (örtük, await'siz) yüklenmeye çalışılmaz.
+                _session_factory = async_sessionmaker(engine, expire_on_commit=False)
+                _engine = engine
+    return _engine
+
+def SessionLocal() -> AsyncSession:
+    """Paylaşılan engine'e bağlı yeni bir session (`async with SessionLocal() as db:`)."""
+    if _session_factory is None:
+        get_engine()
+    return _session_factory()
+
+async def dispose_engine() -> None:
+    """Bağlantı havuzunu kapatır; engine hiç kurulmadıysa bir şey yapmaz."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine, _session_factory = None, None
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """İstek ömürlü veritabanı session'ı. Bağlantı ancak ilk sorguda havuzdan alınır."""
+    async with SessionLocal() as session:
+        yield session
 
 # `Base` ve `Experiment` sınıfının tanımı buradan kaldırıldı.
-# `init_db` fonksiyonu da artık merkezi paketten çağrılacak.
\ No newline at end of file
+# `init_db` fonksiyonu da artık merkezi paketten çağrılacak.
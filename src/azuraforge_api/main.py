@@ -2,12 +2,22 @@
 
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 
 from .core.config import settings
-from .routes import experiments, pipelines, streaming, auth
-from .services import user_service
-from .database import SessionLocal
+from .core.redis_pool import redis_pools
+from .core import password
+from .core.metrics import MetricsMiddleware
+from .core.profiling import ProfilingMiddleware
+from .routes import experiments, pipelines, streaming, auth, system, batches, metrics
+from .services import user_service, summary_service
+from .services.experiment_service import result_waiter
+from .services.model_server import model_server
+from .services.pipeline_catalog import catalog_cache
+from .services.progress_hub import progress_hub
+from .services.sweep_service import sweep_scheduler
+from .database import SessionLocal, dispose_engine, get_engine
 
 # --- DEĞİŞİKLİK: init_db fonksiyonunu merkezi paketten import etmiyoruz. ---
 # from azuraforge_dbmodels import init_db # <-- BU SATIR SİLİNDİ
@@ -18,16 +28,47 @@ async def lifespan(app: FastAPI):
     # Bu görev artık api/scripts/entrypoint.sh tarafından `alembic` ile yapılıyor.
     # Bu, API başlamadan *önce* veritabanı şemasının güncel olmasını garanti eder.
     print("API: Veritabanı şemasının başlangıç script'i tarafından yönetildiği varsayılıyor.")
+    # Veritabanı ve Redis istemcileri import anında değil burada (veya ilk kullanımda) kurulur.
+    engine = get_engine()
     
-    db = SessionLocal()
-    try:
-        user_service.create_default_user_if_not_exists(db)
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        await user_service.create_default_user_if_not_exists(db)
+    # Özet tablosu ve tetikleyicileri migration'lar kurar; burada sadece kontrol edilir (DDL çalıştırılmaz).
+    # Şema hazır değilse sorgular özet tablosunu kullanmaz; hazırsa eksik özetler arka planda doldurulur.
+    summary_ready = await summary_service.check_summary_schema(engine)
+    summary_backfill = asyncio.create_task(summary_service.run_startup_backfill(SessionLocal)) if summary_ready and settings.EXPERIMENT_SUMMARY_BACKFILL_ON_STARTUP else None
     
+    # Pipeline kataloğu değişikliklerini dinleyerek süreç içi önbelleği güncel tut.
+    catalog_watcher = asyncio.create_task(catalog_cache.watch())
+    # Tüm WebSocket izleyicileri için tek bir Redis pub/sub bağlantısı.
+    progress_hub.start()
+    # Adaptif sweep izleyicileri thread pool'daki istek işleyicilerinden bu döngüye gönderilir.
+    sweep_scheduler.bind_loop(asyncio.get_running_loop())
+    # Tahmin sonuçları için paylaşılan backend dinleyicisi.
+    result_waiter.start()
+
     print("API: Uygulama başlangıcı tamamlandı. İstekler kabul ediliyor.")
     yield
 
+    await sweep_scheduler.stop()
+    await result_waiter.stop()
+    model_server.shutdown()
+    password.shutdown_pool()
+    await progress_hub.stop()
+    catalog_watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await catalog_watcher
+    if summary_backfill is not None:
+        summary_backfill.cancel()
+        with suppress(asyncio.CancelledError):
+            await summary_backfill
+
+    # Veritabanı bağlantı havuzunu kapat.
+    await dispose_engine()
+    # Devam eden Redis işlemlerinin bitmesini bekleyip havuzları kapat.
+    await redis_pools.drain(timeout=settings.REDIS_POOL_DRAIN_TIMEOUT)
+    print("API: Redis bağlantı havuzları kapatıldı.")
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME, 
@@ -48,15 +89,26 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Server-Timing", "X-Profile-Id"],
     )
+    # Server-Timing başlıkları ve istek üzerine profil alma.
+    app.add_middleware(ProfilingMiddleware)
+    if settings.METRICS_ENABLED:
+        # En dışta: CORS dahil tüm isteğin süresini ölçer.
+        app.add_middleware(MetricsMiddleware)
 
     api_router = APIRouter()
     api_router.include_router(auth.router)
     api_router.include_router(experiments.router)
+    api_router.include_router(batches.router)
     api_router.include_router(pipelines.router)
+    api_router.include_router(system.router)
     
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
     app.include_router(streaming.router)
+    if settings.METRICS_ENABLED:
+        # Prometheus kazıyıcıları için kök dizinde ve kimlik doğrulamasız (ağ seviyesinde korunmalı).
+        app.include_router(metrics.router)
     
     @app.get("/", tags=["Root"])
     def read_root():
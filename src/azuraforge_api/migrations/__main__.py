@@ -0,0 +1,22 @@
+# api/src/azuraforge_api/migrations/__main__.py
+
+import os
+import sys
+from typing import List, Optional
+
+from alembic.config import CommandLine, Config
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """alembic CLI'ı, alembic.ini dosyası olmadan bu paketin script dizinine yönlendirir."""
+    cli = CommandLine(prog="python -m azuraforge_api.migrations")
+    options = cli.parser.parse_args(argv)
+    if not hasattr(options, "cmd"):
+        cli.parser.error("too few arguments")
+    config = Config(cmd_opts=options)
+    config.set_main_option("script_location", os.path.dirname(os.path.abspath(__file__)))
+    cli.run_cmd(config, options)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,49 @@
+# api/src/azuraforge_api/migrations/env.py
+# API'nin sahip olduğu veritabanı nesneleri (deney özet tablosu ve tetikleyicileri) için alembic ortamı.
+# `experiments` tablosu dbmodels'in migration'larına aittir; bu ortam onlardan sonra çalıştırılır:
+#   python -m azuraforge_api.migrations upgrade head
+
+import asyncio
+
+from alembic import context
+
+from azuraforge_api.core.config import settings
+from azuraforge_api.database import dispose_engine, get_engine, to_async_url
+from azuraforge_api.services.summary_service import SUMMARY_TABLE, summary_metadata
+
+# dbmodels'in `alembic_version` tablosuyla çakışmasın diye API revizyonları ayrı bir tabloda izlenir.
+VERSION_TABLE = "azuraforge_api_alembic_version"
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # Autogenerate sadece API'nin nesnelerine baksın; dbmodels tablolarını silmeyi önermesin.
+    table = obj if type_ == "table" else getattr(obj, "table", None)
+    return table is None or table.name == SUMMARY_TABLE
+
+
+def _configure(**kwargs) -> None:
+    context.configure(target_metadata=summary_metadata, version_table=VERSION_TABLE, include_object=include_object, **kwargs)
+
+
+def run_migrations_offline() -> None:
+    _configure(url=to_async_url(settings.DATABASE_URL), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_migrations(connection) -> None:
+    _configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    async with get_engine().connect() as connection:
+        await connection.run_sync(_run_migrations)
+    await dispose_engine()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
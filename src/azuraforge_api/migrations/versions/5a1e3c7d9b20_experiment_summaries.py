@@ -0,0 +1,112 @@
+"""experiment summaries
+
+Deney listeleme/sıralama alanlarının düz ve indeksli kopyası (`experiment_summaries`) ve onu `experiments`
+üzerindeki yazmalarda güncel tutan tetikleyiciler. Tetikleyici gövdeleri bu revizyonda sabitlenmiştir;
+`summary_service` tanımı değişirse yeni bir revizyon eklenmelidir (başlangıç kontrolü eski gövdeyi fark eder).
+
+Revision ID: 5a1e3c7d9b20
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "5a1e3c7d9b20"
+down_revision = None
+branch_labels = ("azuraforge_api",)
+depends_on = None
+
+SUMMARY_TABLE = "experiment_summaries"
+SORTABLE_METRICS = ("final_loss", "r2_score", "mae", "accuracy")
+
+POSTGRESQL_UPGRADE = [
+    'CREATE OR REPLACE FUNCTION azuraforge_try_float(value text) RETURNS double precision AS $$ BEGIN '
+    'RETURN value::double precision; EXCEPTION WHEN others THEN RETURN NULL; END; $$ LANGUAGE plpgsql '
+    'IMMUTABLE',
+    'CREATE OR REPLACE FUNCTION azuraforge_refresh_experiment_summary() RETURNS trigger AS $$ BEGIN '
+    'INSERT INTO experiment_summaries (experiment_id, ticker, latitude, longitude, epochs, lr, '
+    'final_loss, r2_score, mae, accuracy, updated_at) SELECT NEW.id, NEW.config #>> '
+    "'{data_sourcing,ticker}', azuraforge_try_float(NEW.config #>> '{data_sourcing,latitude}'), "
+    "azuraforge_try_float(NEW.config #>> '{data_sourcing,longitude}'), azuraforge_try_float(NEW.config "
+    "#>> '{training_params,epochs}'), azuraforge_try_float(NEW.config #>> '{training_params,lr}'), "
+    "azuraforge_try_float(NEW.results #>> '{final_loss}'), azuraforge_try_float(NEW.results #>> "
+    "'{metrics,r2_score}'), azuraforge_try_float(NEW.results #>> '{metrics,mae}'), "
+    "azuraforge_try_float(NEW.results #>> '{metrics,accuracy}'), CURRENT_TIMESTAMP ON CONFLICT "
+    '(experiment_id) DO UPDATE SET ticker = excluded.ticker, latitude = excluded.latitude, longitude = '
+    'excluded.longitude, epochs = excluded.epochs, lr = excluded.lr, final_loss = excluded.final_loss, '
+    'r2_score = excluded.r2_score, mae = excluded.mae, accuracy = excluded.accuracy, updated_at = '
+    "excluded.updated_at; RETURN NEW; EXCEPTION WHEN others THEN RAISE WARNING 'experiment summary "
+    "refresh failed: %', SQLERRM; RETURN NEW; END; $$ LANGUAGE plpgsql",
+    'DROP TRIGGER IF EXISTS azuraforge_experiment_summary ON experiments',
+    'CREATE TRIGGER azuraforge_experiment_summary AFTER INSERT OR UPDATE OF config, results ON '
+    'experiments FOR EACH ROW EXECUTE FUNCTION azuraforge_refresh_experiment_summary()',
+    "COMMENT ON FUNCTION azuraforge_refresh_experiment_summary() IS 'azuraforge-summary:8f7cafbf435ee2b3'",
+]
+
+SQLITE_UPGRADE = [
+    'CREATE TRIGGER azuraforge_experiment_summary_insert AFTER INSERT ON experiments BEGIN INSERT OR '
+    'REPLACE INTO experiment_summaries (experiment_id, ticker, latitude, longitude, epochs, lr, '
+    'final_loss, r2_score, mae, accuracy, updated_at) SELECT NEW.id, json_extract(NEW.config, '
+    "'$.data_sourcing.ticker'), CASE WHEN json_type(NEW.config, '$.data_sourcing.latitude') IN "
+    "('integer', 'real') THEN json_extract(NEW.config, '$.data_sourcing.latitude') END, CASE WHEN "
+    "json_type(NEW.config, '$.data_sourcing.longitude') IN ('integer', 'real') THEN "
+    "json_extract(NEW.config, '$.data_sourcing.longitude') END, CASE WHEN json_type(NEW.config, "
+    "'$.training_params.epochs') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.training_params.epochs') END, CASE WHEN json_type(NEW.config, '$.training_params.lr') IN "
+    "('integer', 'real') THEN json_extract(NEW.config, '$.training_params.lr') END, CASE WHEN "
+    "json_type(NEW.results, '$.final_loss') IN ('integer', 'real') THEN json_extract(NEW.results, "
+    "'$.final_loss') END, CASE WHEN json_type(NEW.results, '$.metrics.r2_score') IN ('integer', 'real') "
+    "THEN json_extract(NEW.results, '$.metrics.r2_score') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.mae') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.mae') END, CASE "
+    "WHEN json_type(NEW.results, '$.metrics.accuracy') IN ('integer', 'real') THEN "
+    "json_extract(NEW.results, '$.metrics.accuracy') END, CURRENT_TIMESTAMP; END",
+    'CREATE TRIGGER azuraforge_experiment_summary_update AFTER UPDATE OF config, results ON experiments '
+    'BEGIN INSERT OR REPLACE INTO experiment_summaries (experiment_id, ticker, latitude, longitude, '
+    'epochs, lr, final_loss, r2_score, mae, accuracy, updated_at) SELECT NEW.id, '
+    "json_extract(NEW.config, '$.data_sourcing.ticker'), CASE WHEN json_type(NEW.config, "
+    "'$.data_sourcing.latitude') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.data_sourcing.latitude') END, CASE WHEN json_type(NEW.config, '$.data_sourcing.longitude') IN "
+    "('integer', 'real') THEN json_extract(NEW.config, '$.data_sourcing.longitude') END, CASE WHEN "
+    "json_type(NEW.config, '$.training_params.epochs') IN ('integer', 'real') THEN "
+    "json_extract(NEW.config, '$.training_params.epochs') END, CASE WHEN json_type(NEW.config, "
+    "'$.training_params.lr') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.training_params.lr') END, CASE WHEN json_type(NEW.results, '$.final_loss') IN ('integer', "
+    "'real') THEN json_extract(NEW.results, '$.final_loss') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.r2_score') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.r2_score') "
+    "END, CASE WHEN json_type(NEW.results, '$.metrics.mae') IN ('integer', 'real') THEN "
+    "json_extract(NEW.results, '$.metrics.mae') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.accuracy') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.accuracy') "
+    'END, CURRENT_TIMESTAMP; END',
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS azuraforge_experiment_summary ON experiments",
+    "DROP FUNCTION IF EXISTS azuraforge_refresh_experiment_summary()",
+    "DROP FUNCTION IF EXISTS azuraforge_try_float(text)",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS azuraforge_experiment_summary_insert",
+    "DROP TRIGGER IF EXISTS azuraforge_experiment_summary_update",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        SUMMARY_TABLE,
+        sa.Column("experiment_id", sa.String(), primary_key=True),
+        sa.Column("ticker", sa.String()),
+        *[sa.Column(name, sa.Float()) for name in ("latitude", "longitude", "epochs", "lr", *SORTABLE_METRICS)],
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.current_timestamp()),
+    )
+    for metric in SORTABLE_METRICS:
+        op.create_index(f"ix_{SUMMARY_TABLE}_{metric}", SUMMARY_TABLE, [metric])
+    for statement in POSTGRESQL_UPGRADE if op.get_bind().dialect.name == "postgresql" else SQLITE_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in POSTGRESQL_DOWNGRADE if op.get_bind().dialect.name == "postgresql" else SQLITE_DOWNGRADE:
+        op.execute(statement)
+    op.drop_table(SUMMARY_TABLE)
@@ -0,0 +1,119 @@
+"""summary config fingerprint
+
+Parmak izi aramasının (`fingerprint_service`) tüm `experiments` tablosunu JSON yolu üzerinden taramaması için
+`experiment_summaries`'e indeksli `config_fingerprint` sütunu eklenir ve tetikleyiciler onu da dolduracak
+şekilde yenilenir; mevcut özet satırlarının sütunu tek seferlik bir UPDATE ile doldurulur.
+
+Revision ID: 8c2f6b1e4d37
+Revises: 5a1e3c7d9b20
+Create Date: 2026-10-18 00:00:01
+
+"""
+import importlib.util
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "8c2f6b1e4d37"
+down_revision = "5a1e3c7d9b20"
+branch_labels = None
+depends_on = None
+
+SUMMARY_TABLE = "experiment_summaries"
+FINGERPRINT_INDEX = f"ix_{SUMMARY_TABLE}_config_fingerprint"
+SQLITE_TRIGGERS = ("azuraforge_experiment_summary_insert", "azuraforge_experiment_summary_update")
+
+POSTGRESQL_UPGRADE = [
+    'CREATE OR REPLACE FUNCTION azuraforge_refresh_experiment_summary() RETURNS trigger AS $$ BEGIN '
+    'INSERT INTO experiment_summaries (experiment_id, ticker, latitude, longitude, epochs, lr, '
+    'final_loss, r2_score, mae, accuracy, config_fingerprint, updated_at) SELECT NEW.id, NEW.config #>> '
+    "'{data_sourcing,ticker}', azuraforge_try_float(NEW.config #>> '{data_sourcing,latitude}'), "
+    "azuraforge_try_float(NEW.config #>> '{data_sourcing,longitude}'), azuraforge_try_float(NEW.config "
+    "#>> '{training_params,epochs}'), azuraforge_try_float(NEW.config #>> '{training_params,lr}'), "
+    "azuraforge_try_float(NEW.results #>> '{final_loss}'), azuraforge_try_float(NEW.results #>> "
+    "'{metrics,r2_score}'), azuraforge_try_float(NEW.results #>> '{metrics,mae}'), "
+    "azuraforge_try_float(NEW.results #>> '{metrics,accuracy}'), NEW.config #>> '{config_fingerprint}', "
+    'CURRENT_TIMESTAMP ON CONFLICT (experiment_id) DO UPDATE SET ticker = excluded.ticker, latitude = '
+    'excluded.latitude, longitude = excluded.longitude, epochs = excluded.epochs, lr = excluded.lr, '
+    'final_loss = excluded.final_loss, r2_score = excluded.r2_score, mae = excluded.mae, accuracy = '
+    'excluded.accuracy, config_fingerprint = excluded.config_fingerprint, updated_at = '
+    "excluded.updated_at; RETURN NEW; EXCEPTION WHEN others THEN RAISE WARNING 'experiment summary "
+    "refresh failed: %', SQLERRM; RETURN NEW; END; $$ LANGUAGE plpgsql",
+    "COMMENT ON FUNCTION azuraforge_refresh_experiment_summary() IS 'azuraforge-summary:346448f6103a3fe4'",
+]
+
+SQLITE_UPGRADE = [
+    'CREATE TRIGGER azuraforge_experiment_summary_insert AFTER INSERT ON experiments BEGIN INSERT OR '
+    'REPLACE INTO experiment_summaries (experiment_id, ticker, latitude, longitude, epochs, lr, '
+    'final_loss, r2_score, mae, accuracy, config_fingerprint, updated_at) SELECT NEW.id, '
+    "json_extract(NEW.config, '$.data_sourcing.ticker'), CASE WHEN json_type(NEW.config, "
+    "'$.data_sourcing.latitude') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.data_sourcing.latitude') END, CASE WHEN json_type(NEW.config, '$.data_sourcing.longitude') IN "
+    "('integer', 'real') THEN json_extract(NEW.config, '$.data_sourcing.longitude') END, CASE WHEN "
+    "json_type(NEW.config, '$.training_params.epochs') IN ('integer', 'real') THEN "
+    "json_extract(NEW.config, '$.training_params.epochs') END, CASE WHEN json_type(NEW.config, "
+    "'$.training_params.lr') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.training_params.lr') END, CASE WHEN json_type(NEW.results, '$.final_loss') IN ('integer', "
+    "'real') THEN json_extract(NEW.results, '$.final_loss') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.r2_score') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.r2_score') "
+    "END, CASE WHEN json_type(NEW.results, '$.metrics.mae') IN ('integer', 'real') THEN "
+    "json_extract(NEW.results, '$.metrics.mae') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.accuracy') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.accuracy') "
+    "END, json_extract(NEW.config, '$.config_fingerprint'), CURRENT_TIMESTAMP; END",
+    'CREATE TRIGGER azuraforge_experiment_summary_update AFTER UPDATE OF config, results ON experiments '
+    'BEGIN INSERT OR REPLACE INTO experiment_summaries (experiment_id, ticker, latitude, longitude, '
+    'epochs, lr, final_loss, r2_score, mae, accuracy, config_fingerprint, updated_at) SELECT NEW.id, '
+    "json_extract(NEW.config, '$.data_sourcing.ticker'), CASE WHEN json_type(NEW.config, "
+    "'$.data_sourcing.latitude') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.data_sourcing.latitude') END, CASE WHEN json_type(NEW.config, '$.data_sourcing.longitude') IN "
+    "('integer', 'real') THEN json_extract(NEW.config, '$.data_sourcing.longitude') END, CASE WHEN "
+    "json_type(NEW.config, '$.training_params.epochs') IN ('integer', 'real') THEN "
+    "json_extract(NEW.config, '$.training_params.epochs') END, CASE WHEN json_type(NEW.config, "
+    "'$.training_params.lr') IN ('integer', 'real') THEN json_extract(NEW.config, "
+    "'$.training_params.lr') END, CASE WHEN json_type(NEW.results, '$.final_loss') IN ('integer', "
+    "'real') THEN json_extract(NEW.results, '$.final_loss') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.r2_score') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.r2_score') "
+    "END, CASE WHEN json_type(NEW.results, '$.metrics.mae') IN ('integer', 'real') THEN "
+    "json_extract(NEW.results, '$.metrics.mae') END, CASE WHEN json_type(NEW.results, "
+    "'$.metrics.accuracy') IN ('integer', 'real') THEN json_extract(NEW.results, '$.metrics.accuracy') "
+    "END, json_extract(NEW.config, '$.config_fingerprint'), CURRENT_TIMESTAMP; END",
+]
+
+BACKFILL = {
+    "postgresql": f"UPDATE {SUMMARY_TABLE} s SET config_fingerprint = e.config #>> '{{config_fingerprint}}' FROM experiments e WHERE e.id = s.experiment_id",
+    "sqlite": f"UPDATE {SUMMARY_TABLE} SET config_fingerprint = (SELECT json_extract(e.config, '$.config_fingerprint') FROM experiments e WHERE e.id = {SUMMARY_TABLE}.experiment_id)",
+}
+
+
+def _previous():
+    # Alembic revizyonları paket olarak değil dosyadan yüklenir; önceki revizyonun sabitleri de öyle okunur.
+    spec = importlib.util.spec_from_file_location("_azuraforge_api_5a1e3c7d9b20", os.path.join(os.path.dirname(__file__), "5a1e3c7d9b20_experiment_summaries.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _replace_triggers(postgresql: list, sqlite: list) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        statements = postgresql
+    else:
+        # SQLite'ta CREATE OR REPLACE TRIGGER yok.
+        statements = [f"DROP TRIGGER IF EXISTS {name}" for name in SQLITE_TRIGGERS] + sqlite
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    op.add_column(SUMMARY_TABLE, sa.Column("config_fingerprint", sa.String()))
+    op.create_index(FINGERPRINT_INDEX, SUMMARY_TABLE, ["config_fingerprint"])
+    _replace_triggers(POSTGRESQL_UPGRADE, SQLITE_UPGRADE)
+    op.execute(BACKFILL["postgresql" if op.get_bind().dialect.name == "postgresql" else "sqlite"])
+
+
+def downgrade() -> None:
+    previous = _previous()
+    # Önceki revizyonun özet fonksiyonu ve sürüm yorumu (ilk ve son ifadeler dışındakiler değişmedi).
+    _replace_triggers([previous.POSTGRESQL_UPGRADE[1], previous.POSTGRESQL_UPGRADE[-1]], previous.SQLITE_UPGRADE)
+    op.drop_index(FINGERPRINT_INDEX, table_name=SUMMARY_TABLE)
+    op.drop_column(SUMMARY_TABLE, "config_fingerprint")
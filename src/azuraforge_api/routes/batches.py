@@ -0,0 +1,63 @@
+# api/src/azuraforge_api/routes/batches.py
+
+import itertools
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Optional, Literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..services import experiment_service, artifact_archive, batch_service
+from ..core import security
+from ..database import get_db
+from azuraforge_dbmodels import User
+
+router = APIRouter(prefix="/batches", tags=["Batches"])
+
+@router.get("/{batch_id}/dispatch", response_model=Dict[str, Any])
+def get_batch_dispatch(batch_id: str, current_user: User = Depends(security.get_current_user)):
+    """Bir sweep'in worker kuyruğuna gönderim ilerlemesini döndürür."""
+    return experiment_service.get_batch_dispatch_status(batch_id)
+
+@router.get("/{batch_id}/status", response_model=Dict[str, Any])
+async def get_batch_task_statuses(batch_id: str, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    """Batch'teki tüm görevlerin durum haritası ve durum sayıları; UI'ın görev başına yoklaması yerine."""
+    return await experiment_service.get_task_statuses(db, batch_id=batch_id)
+
+@router.get("/{batch_id}/leaderboard", response_model=Dict[str, Any])
+async def get_batch_leaderboard(
+    batch_id: str,
+    metric: str = Query("r2_score", description="Sıralama metriği: final_loss, r2_score, mae veya accuracy."),
+    k: int = Query(batch_service.LEADERBOARD_DEFAULT_K, ge=1, le=batch_service.LEADERBOARD_MAX_K),
+    order: Optional[Literal["min", "max"]] = Query(None, description="Boş bırakılırsa metriğin doğal yönü kullanılır."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Batch'teki deneyleri bir metriğe göre sıralayıp ilk k tanesini döndürür."""
+    return await batch_service.get_batch_leaderboard(db, batch_id, metric=metric, k=k, order=order)
+
+@router.get("/{batch_id}/summary", response_model=Dict[str, Any])
+async def get_batch_summary(
+    batch_id: str,
+    top_k: int = Query(3, ge=1, le=batch_service.LEADERBOARD_MAX_K),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Batch'in durum sayılarını ve metrik istatistiklerini (min/max/ortalama/kantiller, en iyi k) döndürür."""
+    return await batch_service.get_batch_summary(db, batch_id, top_k=top_k)
+
+@router.get("/{batch_id}/artifacts.zip")
+async def download_batch_artifacts(
+    batch_id: str,
+    include: Optional[str] = Query(None, description="Virgülle ayrılmış glob desenleri; her deneyin dizinine göre uygulanır."),
+    exclude: Optional[str] = Query(None, description="Virgülle ayrılmış glob desenleri; eşleşen dosyalar atlanır."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Batch'teki tüm deneylerin artefaktlarını, her deney kendi klasöründe olacak şekilde tek bir zip olarak akıtır."""
+    experiment_dirs = await experiment_service.get_batch_artifact_dirs(db, batch_id)
+    include_patterns, exclude_patterns = artifact_archive.parse_patterns(include), artifact_archive.parse_patterns(exclude)
+    entries = itertools.chain.from_iterable(
+        artifact_archive.iter_directory(experiment_dir, prefix=f"{experiment_id}/", include=include_patterns, exclude=exclude_patterns)
+        for experiment_id, experiment_dir in experiment_dirs
+    )
+    return StreamingResponse(artifact_archive.stream_zip(entries), media_type="application/zip", headers={"Content-Disposition": f'attachment; filename="batch-{batch_id}.zip"'})
@@ -1,67 +1,161 @@
 # api/src/azuraforge_api/routes/experiments.py
 import os
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import FileResponse, Response
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from datetime import datetime
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import List, Dict, Any, Optional, Literal
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..services import experiment_service
-from ..schemas import PredictionRequest, PredictionResponse # PredictionResponse import edildi
+from ..services import experiment_service, artifact_archive, curve_service
+from ..schemas import PredictionRequest, PredictionResponse, TaskStatusRequest # PredictionResponse import edildi
 from ..core.exceptions import AzuraForgeException
-from ..core import security
+from ..core import security, http_cache, negotiation
+from ..database import get_db
 from azuraforge_dbmodels import User
 
 router = APIRouter(tags=["Experiments"])
 
 @router.get("/experiments", response_model=List[Dict[str, Any]])
-def get_all_experiments(current_user: User = Depends(security.get_current_user)):
-    return experiment_service.list_experiments()
+async def get_all_experiments(
+    request: Request,
+    limit: int = Query(experiment_service.EXPERIMENT_LIST_DEFAULT_LIMIT, ge=1, le=experiment_service.EXPERIMENT_LIST_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="Önceki sayfanın `X-Next-Cursor` başlığındaki değer."),
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış alan listesi. `config`/`results` sadece burada istenirse döner."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """
+    Deneyleri sayfalı olarak listeler. Bir sonraki sayfa varsa imleci `X-Next-Cursor` başlığında döner.
+    `Accept` ile JSON (varsayılan), MessagePack veya Arrow IPC istenebilir.
+    """
+    media_type = negotiation.negotiate(request.headers.get("accept"), tabular=True)
+    page = await experiment_service.list_experiments(db, limit=limit, cursor=cursor, fields=fields)
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else None
+    return negotiation.render(page["items"], media_type, to_table=lambda rows: negotiation.rows_to_table(rows, json_columns=experiment_service.EXPERIMENT_BLOB_FIELDS), headers=headers)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/experiments/export")
+def export_all_experiments(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış alan listesi. Boş bırakılırsa config/results dahil tüm alanlar döner."),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Tüm deney geçmişini NDJSON (varsayılan) veya CSV olarak akış halinde dışa aktarır."""
+    rows = experiment_service.export_experiments(export_format=format, fields=fields)
+    filename = f"experiments-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+    return StreamingResponse(rows, media_type=EXPORT_MEDIA_TYPES[format], headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.get("/experiments/compare", response_model=Dict[str, Any])
+async def compare_experiments(
+    request: Request,
+    ids: str = Query(..., description="Virgülle ayrılmış deney id'leri."),
+    points: int = Query(curve_service.COMPARE_DEFAULT_POINTS, ge=curve_service.COMPARE_MIN_POINTS, le=curve_service.COMPARE_MAX_POINTS, description="Seri başına en fazla nokta sayısı."),
+    series: Optional[str] = Query(None, description="Virgülle ayrılmış seri adları (varsayılan: loss,val_loss)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Birden fazla deneyin eğitim eğrilerini, sunucuda LTTB ile küçültülmüş olarak karşılaştırır."""
+    experiment_ids = [i.strip() for i in ids.split(",") if i.strip()]
+    if not experiment_ids or len(experiment_ids) > curve_service.COMPARE_MAX_EXPERIMENTS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {curve_service.COMPARE_MAX_EXPERIMENTS} experiment ids.")
+    series_names = [s.strip() for s in series.split(",") if s.strip()] if series else list(curve_service.COMPARE_DEFAULT_SERIES)
+    media_type = negotiation.negotiate(request.headers.get("accept"))
+    return negotiation.render(await curve_service.compare_experiment_curves(db, experiment_ids, points=points, series=series_names), media_type)
 
 @router.post("/experiments", status_code=202, response_model=Dict[str, Any])
-def create_new_experiment(config: Dict[str, Any], current_user: User = Depends(security.get_current_user)):
-    return experiment_service.start_experiment(config)
+async def create_new_experiment(
+    config: Dict[str, Any],
+    force: bool = Query(False, description="Özdeş bir deney zaten varsa bile yeniden çalıştır."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    return await experiment_service.start_experiment(db, config, force=force)
+
+@router.post("/experiments/status", response_model=Dict[str, Any])
+async def get_experiment_task_statuses(request: TaskStatusRequest, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    """Birden çok görevin (ve/veya bir batch'in tüm görevlerinin) durumunu tek istekte, sayılarıyla birlikte döndürür."""
+    if not request.task_ids and not request.batch_id:
+        raise HTTPException(status_code=400, detail="Provide task_ids, batch_id or both.")
+    return await experiment_service.get_task_statuses(db, task_ids=request.task_ids, batch_id=request.batch_id)
 
 @router.get("/experiments/{experiment_id}/details", response_model=Dict[str, Any])
-def read_experiment_details(experiment_id: str, current_user: User = Depends(security.get_current_user)):
+async def read_experiment_details(experiment_id: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    media_type = negotiation.negotiate(request.headers.get("accept"))
     try:
-        return experiment_service.get_experiment_details(experiment_id)
+        return negotiation.render(await experiment_service.get_experiment_details(db, experiment_id), media_type)
     except AzuraForgeException as e:
         raise e
 
 @router.get("/experiments/{experiment_id}/report/content")
-def get_experiment_report_content(experiment_id: str, current_user: User = Depends(security.get_current_user)):
-    """Bir deneyin Markdown rapor dosyasının içeriğini döndürür."""
+async def get_experiment_report_content(experiment_id: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    """
+    Bir deneyin Markdown rapor dosyasının içeriğini döndürür.
+    ETag/Last-Modified ile koşullu isteklere 304 döner; istemci destekliyorsa brotli/gzip ile sıkıştırır.
+    """
+    report_dir, finished = await experiment_service.get_experiment_report_location(db, experiment_id)
+    report_file_path = os.path.join(report_dir, "report.md")
     try:
-        report_dir = experiment_service.get_experiment_report_path(experiment_id)
-        report_file_path = os.path.join(report_dir, "report.md")
-        if not os.path.exists(report_file_path):
-            raise AzuraForgeException(status_code=404, detail="Markdown report file not found.", error_code="REPORT_FILE_NOT_FOUND")
-        
-        with open(report_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return Response(content=content, media_type="text/markdown")
-    except AzuraForgeException as e:
-        raise e
+        stat = os.stat(report_file_path)
+    except FileNotFoundError:
+        raise AzuraForgeException(status_code=404, detail="Markdown report file not found.", error_code="REPORT_FILE_NOT_FOUND")
+
+    encoding = http_cache.choose_encoding(request.headers.get("accept-encoding"), stat.st_size)
+    etag = http_cache.encoded_etag(http_cache.file_etag(stat), encoding)
+    headers = {**http_cache.cache_headers(etag, stat.st_mtime, immutable=finished), "Vary": "Accept-Encoding"}
+    if http_cache.is_not_modified(request.headers, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    content = await experiment_service.read_report_file(report_file_path, etag, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="text/markdown", headers=headers)
 
 @router.get("/experiments/{experiment_id}/report/images/{image_name}")
-def get_experiment_report_image(experiment_id: str, image_name: str, current_user: User = Depends(security.get_current_user)):
-    """Bir deney raporuna ait bir görseli döndürür."""
+async def get_experiment_report_image(experiment_id: str, image_name: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    """
+    Bir deney raporuna ait bir görseli döndürür.
+    Rapor dizini önbellekten gelir; ETag/Last-Modified ile koşullu isteklere 304 döner.
+    """
+    report_dir, finished = await experiment_service.get_experiment_report_location(db, experiment_id)
+    image_path = os.path.join(report_dir, "images", os.path.basename(image_name))
     try:
-        report_dir = experiment_service.get_experiment_report_path(experiment_id)
-        image_path = os.path.join(report_dir, "images", image_name)
+        stat = os.stat(image_path)
+    except FileNotFoundError:
+        stat = None
+    if stat is None or not os.path.isfile(image_path):
+        raise AzuraForgeException(status_code=404, detail=f"Image '{image_name}' not found.", error_code="REPORT_IMAGE_NOT_FOUND")
 
-        if not os.path.exists(image_path):
-            raise AzuraForgeException(status_code=404, detail=f"Image '{image_name}' not found.", error_code="REPORT_IMAGE_NOT_FOUND")
-        
-        return FileResponse(image_path)
-    except AzuraForgeException as e:
-        raise e
+    etag = http_cache.file_etag(stat)
+    headers = http_cache.cache_headers(etag, stat.st_mtime, immutable=finished)
+    if http_cache.is_not_modified(request.headers, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(image_path, headers=headers, stat_result=stat)
+
+@router.get("/experiments/{experiment_id}/artifacts.zip")
+async def download_experiment_artifacts(
+    experiment_id: str,
+    include: Optional[str] = Query(None, description="Virgülle ayrılmış glob desenleri (örn. `report.md,images/*`). Sadece eşleşen dosyalar eklenir."),
+    exclude: Optional[str] = Query(None, description="Virgülle ayrılmış glob desenleri (örn. `*.pt`). Eşleşen dosyalar atlanır."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(security.get_current_user)
+):
+    """Deneyin tüm artefakt dizinini (rapor, görseller, model dosyaları) zip olarak akış halinde indirir."""
+    report_dir = await experiment_service.get_experiment_report_path(db, experiment_id)
+    entries = artifact_archive.iter_directory(report_dir, include=artifact_archive.parse_patterns(include), exclude=artifact_archive.parse_patterns(exclude))
+    return StreamingResponse(artifact_archive.stream_zip(entries), media_type="application/zip", headers={"Content-Disposition": f'attachment; filename="experiment-{experiment_id}.zip"'})
 
 # === DEĞİŞİKLİK BURADA: response_model genişletildi ve prediction_steps iletiliyor ===
 @router.post("/experiments/{experiment_id}/predict", response_model=PredictionResponse) # PredictionResponse kullanıldı
-async def predict_from_experiment(experiment_id: str, request: PredictionRequest, current_user: User = Depends(security.get_current_user)):
+async def predict_from_experiment(experiment_id: str, request: PredictionRequest, http_request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(security.get_current_user)):
+    # Temsil, tahmin görevi başlamadan seçilir; desteklenmeyen bir Accept için iş yapılmadan 406 döner.
+    media_type = negotiation.negotiate(http_request.headers.get("accept"), tabular=True)
     try:
         # Servis katmanına prediction_steps'i ilet
-        return await experiment_service.predict_with_model(experiment_id, request.data, request.prediction_steps)
+        result = await experiment_service.predict_with_model(db, experiment_id, request.data, request.prediction_steps)
+        # response_model ile aynı doğrulama/süzme; ardından seçilen formatta kodlanır.
+        payload = PredictionResponse.model_validate(result).model_dump()
+        return negotiation.render(payload, media_type, to_table=negotiation.prediction_to_table)
     except AzuraForgeException as e:
         raise e
     except Exception as e:
@@ -0,0 +1,92 @@
+# api/src/azuraforge_api/routes/metrics.py
+
+import logging
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from ..core.config import settings
+from ..core.redis_pool import redis_pools
+from ..database import TimedQueuePool, get_engine
+from ..services.experiment_service import result_waiter
+from ..services.model_server import model_server
+from ..services.prediction_cache import prediction_cache
+from ..services.progress_hub import progress_hub
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+def _counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+class RuntimeCollector:
+    """
+    Havuz, hub, önbellek ve kuyruk durumlarını sadece /metrics okunurken, bileşenlerin
+    mevcut `stats()` çıktılarından toplar; istek yoluna hiçbir maliyet eklemez.
+    """
+
+    def describe(self):
+        # Kayıt sırasında collect() çağrılmasın (import anında Redis'e gidilmesin).
+        return []
+
+    def collect(self):
+        pool = get_engine().sync_engine.pool
+        if isinstance(pool, TimedQueuePool):
+            connections = GaugeMetricFamily("azuraforge_db_pool_connections", "Database pool connections by state.", labels=["state"])
+            connections.add_metric(["checked_out"], pool.checkedout())
+            connections.add_metric(["idle"], pool.checkedin())
+            yield connections
+            capacity = settings.DB_POOL_SIZE + max(settings.DB_MAX_OVERFLOW, 0)
+            yield _gauge("azuraforge_db_pool_saturation_ratio", "Checked-out connections divided by pool size plus overflow.", pool.checkedout() / capacity if capacity else 0.0)
+
+        redis_connections = GaugeMetricFamily("azuraforge_redis_pool_connections", "Shared Redis pool connections by state.", labels=["pool", "state"])
+        for name, stats in redis_pools.stats().items():
+            redis_connections.add_metric([name, "in_use"], stats["in_use"])
+            redis_connections.add_metric([name, "idle"], stats["idle"])
+            redis_connections.add_metric([name, "max"], stats["max_connections"])
+        yield redis_connections
+
+        queue_depth = GaugeMetricFamily("azuraforge_celery_queue_depth", "Messages waiting in the Celery broker queue.", labels=["queue"])
+        client = redis_pools.sync_client()
+        for queue in [q.strip() for q in settings.METRICS_CELERY_QUEUES.split(",") if q.strip()]:
+            try:
+                queue_depth.add_metric([queue], client.llen(queue))
+            except Exception as e:
+                logger.warning(f"Could not read depth of Celery queue '{queue}': {e}")
+        yield queue_depth
+
+        hub = progress_hub.stats()
+        yield _gauge("azuraforge_progress_subscribers", "WebSocket subscribers attached to the progress hub.", hub["subscribers"])
+        yield _gauge("azuraforge_progress_watched_tasks", "Tasks with at least one progress subscriber.", hub["watched_tasks"])
+        yield _counter("azuraforge_progress_messages_received", "Progress messages received from Redis pub/sub.", hub["messages_received"])
+        yield _counter("azuraforge_progress_messages_delivered", "Progress messages fanned out to subscribers.", hub["messages_delivered"])
+        yield _counter("azuraforge_progress_messages_dropped", "Progress messages dropped for slow subscribers.", hub["messages_dropped"])
+
+        yield _gauge("azuraforge_prediction_pending", "Prediction tasks awaiting a result from the worker.", result_waiter.pending_count)
+        cache = prediction_cache.stats()
+        yield _gauge("azuraforge_prediction_cache_entries", "Entries in the in-process prediction cache.", cache["entries"])
+        yield _counter("azuraforge_prediction_cache_hits", "Prediction cache hits.", cache["hits"])
+        yield _counter("azuraforge_prediction_cache_misses", "Prediction cache misses.", cache["misses"])
+        yield _counter("azuraforge_prediction_coalesced", "Prediction requests that joined an in-flight identical request.", cache["coalesced"])
+
+        serving = model_server.stats()
+        yield _gauge("azuraforge_model_serving_hot_models", "Models loaded in the in-process serving pool.", serving["hot_models"])
+        yield _counter("azuraforge_model_serving_served", "Predictions served in-process.", serving["served"])
+        yield _counter("azuraforge_model_serving_fallbacks", "Predictions that fell back to the worker.", serving["fallbacks"])
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus metin biçiminde metrikler. Senkron: kuyruk derinliği okuması olay döngüsünü bloklamasın."""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,66 +1,119 @@
 import asyncio
 import logging
-import json
-import os
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-import redis.asyncio as redis
+from typing import Optional, AsyncGenerator
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Header, Query, status
+from fastapi.responses import StreamingResponse
 
-logger = logging.getLogger(__name__) # <--- Yeni satır
+from ..core.config import settings
+from ..core.exceptions import InvalidEventIdException
+from ..services.progress_hub import progress_hub, parse_event_id, ProgressSubscription
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-async def redis_listener(websocket: WebSocket, task_id: str):
-    """Redis Pub/Sub kanalını dinler ve gelen mesajları WebSocket'e iletir."""
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-    r = await redis.from_url(redis_url)
-    pubsub = r.pubsub()
-    channel = f"task-progress:{task_id}"
-    await pubsub.subscribe(channel)
-    
+async def _subscribe_with_replay(task_id: str, last_event_id: Optional[str]):
+    """
+    Hub'a abone olur ve `last_event_id` verilmişse kaçırılan kayıtları stream'den okur.
+    Abonelik tekrar oynatmadan *önce* açılır; arada gelen canlı mesajlar kuyrukta
+    bekler ve zaten gönderilmiş olanlar `skip_through` ile atlanır.
+    """
+    subscription = progress_hub.subscribe(task_id)
+    try:
+        missed = await progress_hub.replay(task_id, last_event_id) if last_event_id else []
+    except Exception:
+        progress_hub.unsubscribe(subscription)
+        raise
+    if missed:
+        subscription.skip_through(missed[-1][0])
+    return subscription, missed
+
+async def progress_forwarder(websocket: WebSocket, subscription: ProgressSubscription):
+    """Hub'dan bu istemcinin kuyruğuna düşen ilerleme mesajlarını WebSocket'e iletir."""
+    task_id = subscription.task_id
     try:
         while True:
-            # `listen` bir coroutine'dir, bu yüzden `await` edilmelidir.
-            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if message and message.get("type") == "message":
-                # Gelen veri bytes, string'e çevirip JSON olarak parse et.
-                data_str = message['data'].decode('utf-8')
-                progress_data = json.loads(data_str)
-                # UI'ın beklediği formatla gönder
-                await websocket.send_json({
-                    "state": "PROGRESS",
-                    "details": progress_data
-                })
-            # WebSocket bağlantısı hala açık mı kontrol et
-            # Bu, istemci bağlantıyı kapattığında döngüden çıkmayı sağlar.
-            await asyncio.sleep(0.1) # CPU'yu yormamak için kısa bir bekleme
+            # Mesajlar hub tarafından UI'ın beklediği formatta ({"state": "PROGRESS", ...})
+            # bir kez serileştirilmiş olarak gelir.
+            _event_id, payload = await subscription.get()
+            await websocket.send_text(payload)
     except asyncio.CancelledError:
-        logger.info(f"Redis listener for task {task_id} cancelled.") # <--- logging.info -> logger.info
+        logger.info(f"Progress forwarder for task {task_id} cancelled.")
     except Exception as e:
-        logger.error(f"Redis listener error for task {task_id}: {e}") # <--- logging.error -> logger.error
-    finally:
-        await pubsub.unsubscribe(channel)
-        await r.close()
-        logger.info(f"Redis listener for task {task_id} cleaned up.") # <--- logging.info -> logger.info
+        logger.error(f"Progress forwarder error for task {task_id}: {e}")
 
 @router.websocket("/ws/task_status/{task_id}")
-async def websocket_task_status(websocket: WebSocket, task_id: str):
+async def websocket_task_status(websocket: WebSocket, task_id: str, last_event_id: Optional[str] = None):
     await websocket.accept()
-    logger.info(f"WebSocket connection accepted for task: {task_id}") # <--- logging.info -> logger.info
+    logger.info(f"WebSocket connection accepted for task: {task_id}")
+
+    if last_event_id:
+        try:
+            parse_event_id(last_event_id)
+        except ValueError:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid last_event_id")
+            return
     
-    # Redis dinleyicisini bir arka plan görevi olarak başlat
-    listener_task = asyncio.create_task(redis_listener(websocket, task_id))
+    # Redis'e ayrı bir bağlantı açmak yerine süreç genelindeki hub'a abone ol;
+    # yeniden bağlanan istemciye önce kaçırdığı mesajları gönder.
+    subscription, missed = await _subscribe_with_replay(task_id, last_event_id)
+    forwarder_task = None
     
     try:
+        for _event_id, payload in missed:
+            await websocket.send_text(payload)
+        forwarder_task = asyncio.create_task(progress_forwarder(websocket, subscription))
         # İstemcinin bağlantıyı kapatmasını bekle
         # Bu döngü, bağlantı açık olduğu sürece çalışır.
         while True:
             await websocket.receive_text() # Bu satır aslında istemciden mesaj beklemez,
                                            # sadece bağlantının kopup kopmadığını kontrol eder.
     except WebSocketDisconnect:
-        logger.warning(f"WebSocket disconnected by client for task: {task_id}") # <--- logging.warning -> logger.warning
+        logger.warning(f"WebSocket disconnected by client for task: {task_id}")
     finally:
-        # İstemci bağlantıyı kapattığında, arka plandaki Redis dinleyicisini iptal et
-        listener_task.cancel()
-        # Görevin bitmesini bekle (kaynakların temizlenmesi için)
-        await listener_task
-        logger.info(f"Closing WebSocket connection for task {task_id}") # <--- logging.info -> logger.info
\ No newline at end of file
+        # İstemci bağlantıyı kapattığında aboneliği bırak ve iletici görevi iptal et
+        progress_hub.unsubscribe(subscription)
+        if forwarder_task:
+            forwarder_task.cancel()
+            await forwarder_task
+        logger.info(f"Closing WebSocket connection for task {task_id}")
+
+@router.get("/sse/task_status/{task_id}")
+async def sse_task_status(
+    task_id: str,
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Görev ilerlemesini Server-Sent Events olarak akıtır. Tarayıcının otomatik
+    yeniden bağlanmada gönderdiği `Last-Event-ID` başlığı (veya `last_event_id`
+    parametresi) ile kaçırılan mesajlar önce tekrar oynatılır.
+    """
+    resume_from = last_event_id or last_event_id_header
+    if resume_from:
+        try:
+            parse_event_id(resume_from)
+        except ValueError:
+            raise InvalidEventIdException(event_id=resume_from)
+
+    subscription, missed = await _subscribe_with_replay(task_id, resume_from)
+
+    def format_event(event_id: Optional[str], payload: str) -> str:
+        return (f"id: {event_id}\n" if event_id else "") + f"event: progress\ndata: {payload}\n\n"
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        try:
+            for event_id, payload in missed:
+                yield format_event(event_id, payload)
+            while True:
+                try:
+                    event_id, payload = await asyncio.wait_for(subscription.get(), timeout=settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Proxy'lerin boşta bağlantıyı kapatmaması için yorum satırı gönder.
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event_id, payload)
+        finally:
+            progress_hub.unsubscribe(subscription)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
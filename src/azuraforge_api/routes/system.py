@@ -0,0 +1,37 @@
+# api/src/azuraforge_api/routes/system.py
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, List
+
+from ..core import security
+from ..core.exceptions import ProfileNotFoundException
+from ..core.profiling import profile_store
+from ..core.redis_pool import redis_pools
+from ..services.model_server import model_server
+from azuraforge_dbmodels import User
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+@router.get("/redis", response_model=Dict[str, Any])
+def get_redis_pool_stats(current_user: User = Depends(security.get_current_user)):
+    """Süreç içindeki paylaşılan Redis havuzlarının kullanım istatistiklerini döndürür."""
+    return {"pools": redis_pools.stats()}
+
+@router.get("/model-serving", response_model=Dict[str, Any])
+def get_model_serving_stats(current_user: User = Depends(security.get_current_user)):
+    """Süreç içi model sunum modunun durumunu (sıcak modeller, sunulan / worker'a düşen tahminler) döndürür."""
+    return model_server.stats()
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+def list_profiles(current_user: User = Depends(security.get_current_admin_user)):
+    """Bu API sürecinde alınmış son istek profillerinin özetleri (en yeniden eskiye)."""
+    return profile_store.list()
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str, current_user: User = Depends(security.get_current_admin_user)):
+    """Profili 'folded stacks' biçiminde döndürür; flamegraph.pl, inferno veya speedscope ile açılabilir."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise ProfileNotFoundException(profile_id=profile_id)
+    return PlainTextResponse(profile["folded"], headers={"Content-Disposition": f'inline; filename="profile-{profile_id}.folded"'})
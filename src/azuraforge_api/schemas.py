@@ -48,4 +48,13 @@ class PredictionResponse(BaseModel):
     # Genel yanıtı kapsayacak şekilde Any kullanabiliriz, ancak belirli alanlar daha iyidir.
     # Mevcut yapıda worker tam bir sözlük döndürdüğü için Dict[str, Any] daha uygun.
     # Ancak pydantic burada bu esnekliği zaten sağlıyor.
-    # Bu tanım artık PredictionModal'ın beklentisiyle eşleşiyor.
\ No newline at end of file
+    # Bu tanım artık PredictionModal'ın beklentisiyle eşleşiyor.
+
+# Bir sweep en fazla bu kadar görev üretebildiğinden toplu durum sorgusunun üst sınırı da budur.
+TASK_STATUS_MAX_IDS = 5000
+
+
+class TaskStatusRequest(BaseModel):
+    """Toplu görev durumu isteği: task id listesi ve/veya bir batch id'si."""
+    task_ids: List[str] = Field(default_factory=list, max_length=TASK_STATUS_MAX_IDS)
+    batch_id: Optional[str] = None
@@ -0,0 +1,100 @@
+# api/src/azuraforge_api/services/artifact_archive.py
+
+import fnmatch
+import io
+import os
+import zipfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Dosyalar bu boyutta parçalar halinde okunur; bellekte en fazla birkaç parça tutulur.
+ARCHIVE_CHUNK_SIZE = 256 * 1024
+# Zaten sıkıştırılmış biçimler tekrar sıkıştırılmaz (CPU harcar, kazanç sağlamaz).
+STORED_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".zip", ".gz", ".pt", ".pth", ".pkl", ".joblib", ".h5", ".npz"})
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    ZipFile'ın yazdığı baytları biriktiren, geri sarılamayan (unseekable) hedef.
+    ZipFile bu durumda yerel başlıkları geriye dönüp düzeltmek yerine veri tanımlayıcıları yazar;
+    böylece arşiv diskte veya bellekte bütünüyle oluşturulmadan akıtılabilir.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        if self._chunks:
+            chunk = b"".join(self._chunks)
+            self._chunks.clear()
+            yield chunk
+
+
+def parse_patterns(patterns: Optional[str]) -> List[str]:
+    """Virgülle ayrılmış glob desenlerini (örn. `report.md,images/*`) listeye çevirir."""
+    return [p.strip() for p in (patterns or "").split(",") if p.strip()]
+
+
+def _matches(relative_path: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatch(relative_path, p) or fnmatch.fnmatch(os.path.basename(relative_path), p) for p in patterns)
+
+
+def iter_directory(root: str, prefix: str = "", include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Dizindeki dosyaları (mutlak yol, arşivdeki ad) olarak, deterministik sırayla üretir.
+    Desenler dizine göre göreli yola veya dosya adına uygulanır. Sembolik bağlar izlenmez.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+            if include and not _matches(relative_path, include):
+                continue
+            if exclude and _matches(relative_path, exclude):
+                continue
+            yield path, f"{prefix}{relative_path}"
+
+
+def stream_zip(entries: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """
+    (mutlak yol, arşivdeki ad) çiftlerinden bir zip arşivini parça parça üretir.
+    Senkron bir generator'dır; StreamingResponse onu thread pool'da tüketir.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for path, arcname in entries:
+            try:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                source = open(path, "rb")
+            except OSError:
+                # Dosya listelendikten sonra silinmiş olabilir (örn. süren bir deney); atla.
+                continue
+            info.compress_type = zipfile.ZIP_STORED if os.path.splitext(path)[1].lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            with source, archive.open(info, mode="w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as target:
+                while True:
+                    chunk = source.read(ARCHIVE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    # Merkezi dizin arşiv kapanırken yazılır.
+    yield from sink.drain()
@@ -0,0 +1,121 @@
+# api/src/azuraforge_api/services/batch_service.py
+
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from azuraforge_dbmodels import Experiment
+from .experiment_service import _experiment_field_columns, _format_experiment_row
+from .summary_service import experiment_summaries, experiments_with_summary, is_ready as summary_ready, summary_from_blob
+from ..core.exceptions import BatchNotFoundException, InvalidMetricException
+
+# Her metrik için "daha iyi" yönü: min -> küçük olan iyi, max -> büyük olan iyi.
+METRIC_DIRECTIONS = {"final_loss": "min", "mae": "min", "r2_score": "max", "accuracy": "max"}
+SUMMARY_QUANTILES = (0.25, 0.5, 0.75)
+LEADERBOARD_DEFAULT_K = 10
+LEADERBOARD_MAX_K = 100
+LEADERBOARD_FIELDS = ["experiment_id", "task_id", "status", "created_at", "config_summary", "results_summary"]
+
+
+def _metric_column(metric: str):
+    """Metriğin özet tablosundaki (indeksli, tipli) sütunu."""
+    if metric not in METRIC_DIRECTIONS: raise InvalidMetricException(metric=metric, allowed=METRIC_DIRECTIONS)
+    return experiment_summaries.c[metric]
+
+
+def _quantile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Doğrusal enterpolasyonlu kantil (PostgreSQL percentile_cont ile aynı tanım)."""
+    if not sorted_values: return None
+    position = q * (len(sorted_values) - 1)
+    lower = int(position); upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+async def _status_counts(db: AsyncSession, batch_id: str) -> Dict[str, int]:
+    rows = await db.execute(select(Experiment.status, func.count()).where(Experiment.batch_id == batch_id).group_by(Experiment.status))
+    counts = {status or "UNKNOWN": count for status, count in rows}
+    if not counts: raise BatchNotFoundException(batch_id=batch_id)
+    return counts
+
+
+async def _batch_metric_rows(db: AsyncSession, batch_id: str, columns: list) -> List[Tuple[Dict[str, Any], Any]]:
+    """Özet şeması yokken: batch'in satırlarını sonuç blob'uyla okur ve metrikleri JSON'dan hesaplar."""
+    rows = (await db.execute(select(*columns, Experiment.results.label("metric_blob")).where(Experiment.batch_id == batch_id))).all()
+    return [(summary_from_blob("results", row.metric_blob), row) for row in rows]
+
+
+async def get_batch_leaderboard(db: AsyncSession, batch_id: str, metric: str = "r2_score", k: int = LEADERBOARD_DEFAULT_K, order: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Batch'teki deneyleri bir metriğe göre sıralar ve ilk k tanesini döndürür.
+    Sıralama ve kesme veritabanında yapılır; sadece k satır okunur. Özet şeması hazır değilse
+    batch'in satırları okunup burada sıralanır.
+    """
+    column = _metric_column(metric)
+    order = order or METRIC_DIRECTIONS[metric]
+    k = max(1, min(k, LEADERBOARD_MAX_K))
+    field_columns = _experiment_field_columns()
+    if not summary_ready():
+        columns = [Experiment.id, Experiment.created_at] + [col for f in LEADERBOARD_FIELDS for col in field_columns[f]]
+        scored = [(values[metric], row) for values, row in await _batch_metric_rows(db, batch_id, columns) if values[metric] is not None]
+        if not scored: await _status_counts(db, batch_id)  # batch hiç yoksa 404
+        scored.sort(key=lambda item: (item[0] if order == "min" else -item[0], item[1].id))
+        items = [{"rank": rank, "value": value, **_format_experiment_row(row, LEADERBOARD_FIELDS)} for rank, (value, row) in enumerate(scored[:k], start=1)]
+        return {"batch_id": batch_id, "metric": metric, "order": order, "items": items}
+    columns = [Experiment.id, Experiment.created_at, column.label("metric_value")] + [col for f in LEADERBOARD_FIELDS for col in field_columns[f]]
+    ranking = column.asc() if order == "min" else column.desc()
+    rows = (await db.execute(select(*columns).select_from(experiments_with_summary).where(Experiment.batch_id == batch_id, column.isnot(None)).order_by(ranking, Experiment.id).limit(k))).all()
+    if not rows: await _status_counts(db, batch_id)  # batch hiç yoksa 404
+    items = [{"rank": rank, "value": row.metric_value, **_format_experiment_row(row, LEADERBOARD_FIELDS)} for rank, row in enumerate(rows, start=1)]
+    return {"batch_id": batch_id, "metric": metric, "order": order, "items": items}
+
+
+async def get_batch_summary(db: AsyncSession, batch_id: str, top_k: int = 3) -> Dict[str, Any]:
+    """
+    Batch'in durum sayıları ve her metrik için count/min/max/mean/kantiller ile en iyi k deney.
+    Toplamalar tek bir SQL sorgusunda yapılır; PostgreSQL'de kantiller de (percentile_cont) veritabanında
+    hesaplanır, diğer veritabanlarında sadece metrik sütunları okunup kantiller burada hesaplanır.
+    Özet şeması hazır değilse tüm istatistikler batch'in sonuç blob'larından burada hesaplanır.
+    """
+    counts = await _status_counts(db, batch_id)
+    metric_columns = {metric: _metric_column(metric) for metric in METRIC_DIRECTIONS}
+    sql_aggregates = summary_ready()
+    sql_quantiles = sql_aggregates and db.get_bind().dialect.name == "postgresql"
+
+    if sql_aggregates:
+        aggregates = []
+        for column in metric_columns.values():
+            aggregates += [func.count(column), func.min(column), func.max(column), func.avg(column)]
+            if sql_quantiles: aggregates += [func.percentile_cont(q).within_group(column) for q in SUMMARY_QUANTILES]
+        row = (await db.execute(select(*aggregates).select_from(experiments_with_summary).where(Experiment.batch_id == batch_id))).one()
+
+    if not sql_quantiles:
+        values = {metric: [] for metric in metric_columns}
+        if sql_aggregates:
+            result = await db.execute(select(*metric_columns.values()).select_from(experiments_with_summary).where(Experiment.batch_id == batch_id))
+            metric_rows = [dict(zip(metric_columns, metric_row)) for metric_row in result]
+        else:
+            metric_rows = [row_values for row_values, _ in await _batch_metric_rows(db, batch_id, [Experiment.id])]
+        for metric_row in metric_rows:
+            for metric in metric_columns:
+                if metric_row[metric] is not None: values[metric].append(metric_row[metric])
+
+    metrics, width = {}, 4 + (len(SUMMARY_QUANTILES) if sql_quantiles else 0)
+    for i, metric in enumerate(metric_columns):
+        if sql_aggregates:
+            count, minimum, maximum, mean, *quantiles = row[i * width:(i + 1) * width]
+        else:
+            metric_values = values[metric]
+            count = len(metric_values)
+            minimum, maximum, mean = (min(metric_values), max(metric_values), sum(metric_values) / count) if count else (None, None, None)
+        if not count: continue
+        if not sql_quantiles:
+            ordered = sorted(values[metric]); quantiles = [_quantile(ordered, q) for q in SUMMARY_QUANTILES]
+        leaderboard = await get_batch_leaderboard(db, batch_id, metric=metric, k=top_k)
+        metrics[metric] = {
+            "count": count, "min": minimum, "max": maximum, "mean": mean,
+            "quantiles": {f"p{int(q * 100)}": value for q, value in zip(SUMMARY_QUANTILES, quantiles)},
+            "order": METRIC_DIRECTIONS[metric],
+            "top": [{"experiment_id": item["experiment_id"], "value": item["value"]} for item in leaderboard["items"]],
+        }
+    return {"batch_id": batch_id, "total": sum(counts.values()), "status_counts": counts, "metrics": metrics}
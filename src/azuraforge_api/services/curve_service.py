@@ -0,0 +1,106 @@
+# api/src/azuraforge_api/services/curve_service.py
+
+import math
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from azuraforge_dbmodels import Experiment
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.exceptions import ExperimentNotFoundException
+
+COMPARE_MAX_EXPERIMENTS = 20
+COMPARE_DEFAULT_POINTS = 200
+COMPARE_MIN_POINTS = 3
+COMPARE_MAX_POINTS = 5000
+COMPARE_DEFAULT_SERIES = ("loss", "val_loss")
+
+def _curve_points(curve: Dict[str, Any]) -> int:
+    return sum(len(s["x"]) for s in curve["series"].values())
+
+
+# (experiment id, nokta sayısı) -> durum ve küçültülmüş tüm seriler. Sadece bitmiş deneyler
+# önbelleğe alınır; geçmişleri artık değişmez. Bellek, toplam nokta sayısıyla sınırlanır.
+_curve_cache = TTLCache(
+    maxsize=4096, ttl=settings.CURVE_CACHE_TTL_SECONDS,
+    weigher=_curve_points, maxweight=settings.CURVE_CACHE_MAX_POINTS,
+)
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> Tuple[List[float], List[float]]:
+    """
+    Largest-Triangle-Three-Buckets ile seriyi `threshold` noktaya indirir.
+    İlk ve son nokta korunur; her kovadan, bir önceki seçilen nokta ve sonraki kovanın
+    ortalamasıyla en büyük üçgeni oluşturan nokta seçilir. Tepe ve çukurlar böylece kaybolmaz.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    out_x, out_y = [xs[0]], [ys[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Sonraki kovanın ortalaması (üçgenin üçüncü köşesi).
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+        start, end = int(i * bucket_size) + 1, int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out_x.append(xs[best]); out_y.append(ys[best])
+        a = best
+    out_x.append(xs[-1]); out_y.append(ys[-1])
+    return out_x, out_y
+
+
+def _downsample_series(values: Any, points: int) -> Optional[Dict[str, Any]]:
+    """Epoch başına değer listesini (1'den başlayan epoch ekseniyle) küçültür; sayısal olmayan değerler atlanır."""
+    if not isinstance(values, list):
+        return None
+    xs, ys = [], []
+    for epoch, value in enumerate(values, start=1):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            xs.append(epoch); ys.append(float(value))
+    x, y = lttb(xs, ys, points)
+    return {"x": x, "y": y, "original_length": len(values)}
+
+
+async def compare_experiment_curves(db: AsyncSession, experiment_ids: List[str], points: int = COMPARE_DEFAULT_POINTS, series: Sequence[str] = COMPARE_DEFAULT_SERIES) -> Dict[str, Any]:
+    """
+    Deneylerin eğitim geçmişindeki serileri (örn. loss/val_loss) aynı epoch ekseninde, en fazla
+    `points` noktaya küçültülmüş olarak döndürür. Yanıt boyutu eğitimin uzunluğundan bağımsızdır.
+    """
+    experiment_ids = list(dict.fromkeys(experiment_ids))
+    curves: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for experiment_id in experiment_ids:
+        cached = _curve_cache.get((experiment_id, points))
+        if cached is not None: curves[experiment_id] = cached
+        else: missing.append(experiment_id)
+
+    if missing:
+        # Sadece geçmiş okunur; results'ın geri kalanı (metrikler vb.) veritabanından gelmez.
+        history = Experiment.results["history"]
+        rows = (await db.execute(select(Experiment.id, Experiment.status, Experiment.completed_at, Experiment.failed_at, history.label("history")).where(Experiment.id.in_(missing)))).all()
+        found = {row.id: row for row in rows}
+        for experiment_id in missing:
+            row = found.get(experiment_id)
+            if row is None: raise ExperimentNotFoundException(experiment_id=experiment_id)
+            history_data = row.history if isinstance(row.history, dict) else {}
+            downsampled = {name: _downsample_series(values, points) for name, values in history_data.items()}
+            curves[experiment_id] = {"status": row.status, "series": {name: curve for name, curve in downsampled.items() if curve}}
+            if row.completed_at is not None or row.failed_at is not None:
+                _curve_cache.set((experiment_id, points), curves[experiment_id])
+
+    return {
+        "points": points, "series": list(series),
+        "experiments": [{"experiment_id": experiment_id, "status": curves[experiment_id]["status"], "series": {name: curves[experiment_id]["series"][name] for name in series if name in curves[experiment_id]["series"]}} for experiment_id in experiment_ids],
+    }
@@ -1,46 +1,81 @@
 # api/src/azuraforge_api/services/experiment_service.py
 
+import base64
+import csv
+import io
 import json
 import itertools
 import uuid
 import os
-import redis
-import copy
+import math
+import re
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Generator, Union, Optional
+from typing import List, Dict, Any, Generator, Union, Optional, Tuple, Iterable, AsyncIterator, TYPE_CHECKING
 from fastapi import HTTPException
-from sqlalchemy import desc
-from celery import Celery
-from celery.result import AsyncResult
-from importlib import resources
-import pandas as pd
-import numpy as np
+from sqlalchemy import desc, or_, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import asyncio
 
-from azuraforge_dbmodels import Experiment, sa_create_engine, get_session_local
-from ..core.exceptions import AzuraForgeException, ExperimentNotFoundException, PipelineNotFoundException, ConfigNotFoundException
+from azuraforge_dbmodels import Experiment
+from . import pipeline_catalog, sweep_service, fingerprint_service
+from .fingerprint_service import FINGERPRINT_FIELD
+from .result_waiter import ResultWaiter
+from .prediction_cache import prediction_cache, prediction_cache_key
+from .model_server import model_server
+from .summary_service import experiment_summaries, experiments_source, is_ready as summary_ready, summary_from_blob
+from ..core.cache import TTLCache
+from ..core import http_cache
+from ..core.metrics import PREDICTION_WAIT, instrument_celery
+from ..core.config import settings
+from ..database import SessionLocal
+from ..core.redis_pool import redis_pools
+from ..core.exceptions import AzuraForgeException, ExperimentNotFoundException, PipelineNotFoundException, ConfigNotFoundException, InvalidCursorException, InvalidFieldsException, SweepTooLargeException, BatchNotFoundException
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL: raise ValueError("API: DATABASE_URL ortam değişkeni ayarlanmamış!")
-engine = sa_create_engine(DATABASE_URL)
-SessionLocal = get_session_local(engine)
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-celery_app = Celery("azuraforge_tasks", broker=REDIS_URL, backend=REDIS_URL)
+if TYPE_CHECKING:
+    from celery import Celery
+    from celery.result import AsyncResult
 
-REDIS_PIPELINES_KEY = "azuraforge:pipelines_catalog"
+REDIS_URL = settings.REDIS_URL
+_celery_app: Optional["Celery"] = None
+_celery_app_lock = threading.Lock()
+
+def get_celery_app() -> "Celery":
+    """Süreç başına tek Celery uygulaması; ilk görev yayınında/sonuç okumasında kurulur, import anında celery/kombu yüklenmez."""
+    global _celery_app
+    if _celery_app is None:
+        with _celery_app_lock:
+            if _celery_app is None:
+                from celery import Celery
+                app = Celery("azuraforge_tasks", broker=REDIS_URL, backend=REDIS_URL)
+                # Celery/kombu kendi havuzlarını kullanır; paylaşılan Redis havuzlarıyla aynı sınırlara tabi tutuyoruz.
+                app.conf.update(
+                    broker_pool_limit=settings.CELERY_BROKER_POOL_LIMIT,
+                    redis_max_connections=settings.REDIS_MAX_CONNECTIONS,
+                    broker_transport_options={"max_connections": settings.REDIS_MAX_CONNECTIONS},
+                    redis_socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                    redis_socket_keepalive=True,
+                    result_expires=settings.CELERY_RESULT_EXPIRES_SECONDS,
+                )
+                # Yayın (send_task) süresi Celery sinyalleriyle ölçülür.
+                instrument_celery()
+                _celery_app = app
+    return _celery_app
+
+def _async_result(task_id: str) -> "AsyncResult":
+    from celery.result import AsyncResult
+    return AsyncResult(task_id, app=get_celery_app())
+
+class _LazyCeleryApp:
+    """`get_celery_app()`e yönlendiren vekil: uygulamayı import anında alan bileşenler Celery'yi erkenden kurmasın."""
+    def __getattr__(self, name: str) -> Any: return getattr(get_celery_app(), name)
+celery_app = _LazyCeleryApp()
+# Tahmin sonuçlarını thread'lerde yoklamak yerine tek bir backend dinleyicisiyle bekleriz.
+result_waiter = ResultWaiter(celery_app)
 
-# ... (list_experiments, get_default_pipeline_config vb. fonksiyonlar yukarıdaki gibi aynı kalıyor) ...
-def get_pipelines_from_redis() -> List[Dict[str, Any]]:
-    try:
-        r = redis.from_url(REDIS_URL, decode_responses=True)
-        official_apps_data = []
-        try:
-            with resources.open_text("azuraforge_applications", "official_apps.json") as f: official_apps_data = json.load(f)
-        except Exception: official_apps_data = []
-        official_apps_map = {app['id']: app for app in official_apps_data}; pipeline_catalog_raw = r.hgetall(REDIS_PIPELINES_KEY)
-        if not pipeline_catalog_raw: return []
-        pipelines = [json.loads(data_str) for name, data_str in pipeline_catalog_raw.items()]; [p.update(official_apps_map.get(p['id'], {})) for p in pipelines]; return sorted(pipelines, key=lambda p: p.get('name', p['id']))
-    except Exception as e: print(f"API Error fetching pipelines from Redis: {e}"); return []
 def _parse_value(value: Union[str, list, int, float]) -> list:
     if isinstance(value, list): return value
     if isinstance(value, str):
@@ -50,102 +85,505 @@ def _parse_value(value: Union[str, list, int, float]) -> list:
             except (ValueError, TypeError): processed_items.append(item)
         return processed_items
     return [value]
-def _generate_config_combinations(config: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
-    static_params, varying_params = {}, {};
+def _find_varying_params(config: Dict[str, Any]) -> Dict[str, list]:
+    varying_params = {}
     def find_varying_params(d, path=""):
         for key, value in d.items():
             current_path = f"{path}.{key}" if path else key
             if isinstance(value, dict): find_varying_params(value, current_path)
             elif (isinstance(value, str) and ',' in value) or (isinstance(value, list) and len(value) > 1): varying_params[current_path] = _parse_value(value)
     find_varying_params(config)
+    return varying_params
+def _count_combinations(varying_params: Dict[str, list]) -> int:
+    return math.prod(len(values) for values in varying_params.values())
+def _apply_param_values(config: Dict[str, Any], param_paths: List[List[str]], values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Yapısal paylaşımla yeni bir config üretir: sadece değişen parametrelerin yolu üzerindeki
+    sözlükler kopyalanır, geri kalan alt ağaçlar tüm kombinasyonlar arasında paylaşılır.
+    Üretilen config'ler salt okunur kabul edilmelidir (kök sözlük her zaman kopyalandığından
+    kök seviyesinde güncelleme güvenlidir).
+    """
+    new_config = dict(config); copied = {(): new_config}
+    for keys, value in zip(param_paths, values):
+        d, prefix = new_config, ()
+        for k in keys[:-1]:
+            prefix += (k,)
+            if prefix not in copied: copied[prefix] = d[k] = dict(d.get(k, {}))
+            d = copied[prefix]
+        d[keys[-1]] = value
+    return new_config
+def _generate_config_combinations(config: Dict[str, Any], varying_params: Optional[Dict[str, list]] = None, sweep: Optional[sweep_service.SweepSpec] = None) -> Generator[Dict[str, Any], None, None]:
+    """Kombinasyonları tembel (lazy) olarak üretir: tam ızgara veya sweep stratejisinin örneklediği alt küme."""
+    if varying_params is None: varying_params = _find_varying_params(config)
     if not varying_params: yield config; return
-    param_names, param_values = list(varying_params.keys()), list(varying_params.values())
-    for combo_values in itertools.product(*param_values):
-        new_config = copy.deepcopy(config)
-        for i, key_path in enumerate(param_names):
-            keys = key_path.split('.'); d = new_config
-            for k in keys[:-1]: d = d.setdefault(k, {})
-            d[keys[-1]] = combo_values[i]
-        yield new_config
-def start_experiment(config: Dict[str, Any]) -> Dict[str, Any]:
-    task_ids, batch_name = [], config.pop("batch_name", f"Batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
-    combinations = list(_generate_config_combinations(config)); num_combinations = len(combinations)
+    param_paths = [key_path.split('.') for key_path in varying_params]; param_values = list(varying_params.values())
+    value_tuples = itertools.product(*param_values) if sweep is None or sweep.strategy == "grid" else sweep_service.sample_values(sweep, param_values)
+    for combo_values in value_tuples: yield _apply_param_values(config, param_paths, combo_values)
+
+# --- Sweep gönderimi: parti halinde ve gerektiğinde arka planda ---
+BATCH_DISPATCH_KEY_PREFIX = "azuraforge:batch_dispatch:"
+# Batch'in tüm task id'leri (yeniden kullanılanlar dahil, gönderim sırasıyla); toplu durum sorgusu için.
+BATCH_TASKS_KEY_PREFIX = "azuraforge:batch_tasks:"
+BATCH_DISPATCH_TTL_SECONDS = 60 * 60 * 24 * 7
+# Bu durumdaki deneyler parmak izi eşleşse bile yeniden kullanılmaz.
+NON_REUSABLE_EXPERIMENT_STATUSES = ("FAILURE", "REVOKED")
+_dispatch_executor = ThreadPoolExecutor(max_workers=settings.SWEEP_DISPATCH_WORKERS, thread_name_prefix="sweep-dispatch")
+
+def _record_dispatch_state(batch_id: Optional[str], task_ids: Optional[List[str]] = None, **fields: Any) -> None:
+    if not batch_id: return
+    try:
+        r = redis_pools.sync_client(decode_responses=True); key = f"{BATCH_DISPATCH_KEY_PREFIX}{batch_id}"
+        pipe = r.pipeline(transaction=False); pipe.hset(key, mapping={k: str(v) for k, v in fields.items()}); pipe.expire(key, BATCH_DISPATCH_TTL_SECONDS)
+        if task_ids:
+            tasks_key = f"{BATCH_TASKS_KEY_PREFIX}{batch_id}"; pipe.delete(tasks_key)
+            for start in range(0, len(task_ids), 1000): pipe.rpush(tasks_key, *task_ids[start:start + 1000])
+            pipe.expire(tasks_key, BATCH_DISPATCH_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e: print(f"API Error recording dispatch state for batch {batch_id}: {e}")
+
+def _dispatch_training_tasks(pending: Iterable[Tuple[Dict[str, Any], str]], batch_id: Optional[str], batch_name: Optional[str]) -> None:
+    """
+    (config, önceden atanmış task id) çiftlerini SWEEP_DISPATCH_BATCH_SIZE'lık parçalar halinde gönderir.
+    Her parça tek bir broker producer'ı (ve bağlantısı) üzerinden yayınlanır.
+    """
+    pending, dispatched, chunk = iter(pending), 0, []
+    try:
+        while True:
+            chunk = list(itertools.islice(pending, settings.SWEEP_DISPATCH_BATCH_SIZE))
+            if not chunk: break
+            indexed = {}
+            celery_app = get_celery_app()
+            with celery_app.producer_or_acquire() as producer:
+                for single_config, task_id in chunk:
+                    single_config.update({'batch_id': batch_id, 'batch_name': batch_name})
+                    if FINGERPRINT_FIELD not in single_config: single_config[FINGERPRINT_FIELD] = fingerprint_service.config_fingerprint(single_config)
+                    celery_app.send_task("start_training_pipeline", args=[single_config], task_id=task_id, producer=producer)
+                    indexed[single_config[FINGERPRINT_FIELD]] = task_id
+            fingerprint_service.index(indexed)
+            dispatched += len(chunk); _record_dispatch_state(batch_id, dispatched=dispatched)
+        _record_dispatch_state(batch_id, status="completed")
+    except Exception as e:
+        print(f"API Error dispatching batch {batch_id}: {e}"); _record_dispatch_state(batch_id, status="failed", error=str(e))
+        # Bu ve kalan parçaların sahiplenilmiş parmak izleri hiç gönderilmemiş task id'lerine işaret eder; bırakılmazsa
+        # özdeş gönderimler asla çalışmayacak bu görevlere bağlanır. Sadece hâlâ bu görevlere işaret eden kayıtlar silinir.
+        unsent = {c.get(FINGERPRINT_FIELD) or fingerprint_service.config_fingerprint(c): task_id for c, task_id in itertools.chain(chunk, pending)}
+        try: fingerprint_service.release(unsent)
+        except Exception as release_error: print(f"API Error releasing fingerprints for batch {batch_id}: {release_error}")
+        raise
+
+def _find_indexed_tasks(fingerprints: List[str]) -> Dict[str, str]:
+    """
+    Redis indeksindeki, hâlâ yeniden kullanılabilir durumdaki görevler; bayat kayıtlar silinir.
+    PENDING bir göreve sadece yayınlandığı biliniyorsa (yayın işareti) güvenilir. İşaretsiz ama taze bir PENDING
+    kayıt başka bir isteğin henüz göndermekte olduğu bir sahiplenmedir: silinmez, `claim` onu kazanana bağlar.
+    """
+    indexed = fingerprint_service.lookup_indexed(fingerprints)
+    states = {fp: _async_result(task_id).state for fp, task_id in indexed.items()}
+    unconfirmed = [fp for fp, state in states.items() if state == "PENDING"]
+    published = fingerprint_service.dispatched([indexed[fp] for fp in unconfirmed])
+    claims = fingerprint_service.open_claims([fp for fp in unconfirmed if indexed[fp] not in published])
+    reusable, stale = {}, {}
+    for fp, state in states.items():
+        task_id = indexed[fp]
+        if state in fingerprint_service.REUSABLE_TASK_STATES or (state == "PENDING" and task_id in published): reusable[fp] = task_id
+        elif fp not in claims: stale[fp] = task_id
+    fingerprint_service.release(stale)
+    return reusable
+
+async def _find_reusable_tasks(db: AsyncSession, fingerprints: List[str]) -> Dict[str, str]:
+    """
+    Parmak izlerini, yeniden kullanılabilecek (tamamlanmış veya süren) görevlerin id'lerine eşler.
+    Önce Redis indeksine (henüz Experiment satırı oluşmamış kuyruktaki görevler dahil), bulunamayanlar için
+    özet tablosunun indeksli parmak izi sütununa bakılır. Özet şeması hazır değilse veritabanına hiç gidilmez:
+    JSON yolu üzerinden arama tüm tabloyu tarar.
+    """
+    reusable = await asyncio.to_thread(_find_indexed_tasks, fingerprints)
+    missing = [fp for fp in fingerprints if fp not in reusable]
+    if not missing or not summary_ready(): return reusable
+    fingerprint_column = experiment_summaries.c[FINGERPRINT_FIELD]
+    for start in range(0, len(missing), 500):
+        rows = await db.execute(select(fingerprint_column.label("fingerprint"), Experiment.task_id).select_from(experiments_source()).where(fingerprint_column.in_(missing[start:start + 500]), Experiment.status.notin_(NON_REUSABLE_EXPERIMENT_STATUSES)).order_by(desc(Experiment.created_at)))
+        for row in rows: reusable.setdefault(row.fingerprint, row.task_id)
+    return reusable
+
+async def _plan_dispatch(db: AsyncSession, combinations: List[Dict[str, Any]]) -> Tuple[List[str], List[Tuple[Dict[str, Any], str]], List[str]]:
+    """
+    Her kombinasyon için bir task id belirler: özdeş bir deney zaten varsa onunkini, yoksa yenisini.
+    (tüm task id'ler, gönderilecek (config, task id) çiftleri, yeniden kullanılan task id'ler) döner.
+    """
+    fingerprints = [fingerprint_service.config_fingerprint(c) for c in combinations]
+    unique_fingerprints = list(dict.fromkeys(fingerprints))
+    existing = await _find_reusable_tasks(db, unique_fingerprints)
+    new_ids = {fp: str(uuid.uuid4()) for fp in unique_fingerprints if fp not in existing}
+    # Eşzamanlı özdeş gönderimler: indeksi ilk sahiplenen kazanır, diğeri onun görevine bağlanır.
+    assigned = {**await asyncio.to_thread(fingerprint_service.claim, new_ids), **existing}
+    task_ids, pending, reused, scheduled_fps = [], [], [], set()
+    for single_config, fp in zip(combinations, fingerprints):
+        task_id = assigned[fp]; task_ids.append(task_id)
+        single_config[FINGERPRINT_FIELD] = fp
+        if task_id != new_ids.get(fp):
+            if task_id not in reused: reused.append(task_id)
+        elif fp not in scheduled_fps:
+            scheduled_fps.add(fp); pending.append((single_config, task_id))
+    return task_ids, pending, reused
+
+def _revoke_trial(batch_id: str, task_id: str) -> None:
+    get_celery_app().control.revoke(task_id, terminate=True)
+    try: redis_pools.sync_client().hincrby(f"{BATCH_DISPATCH_KEY_PREFIX}{batch_id}", "early_stopped", 1)
+    except Exception as e: print(f"API Error recording early stop for batch {batch_id}: {e}")
+
+def _finished_trials(task_ids: List[str]) -> List[str]:
+    return [task_id for task_id in task_ids if _async_result(task_id).ready()]
+
+async def start_experiment(db: AsyncSession, config: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+    """
+    Bir deneyi veya sweep'i worker'a gönderir. `force` verilmedikçe, normalleştirilmiş config'i
+    aynı olan tamamlanmış veya süren bir deney yeniden kullanılır ve tekrar çalıştırılmaz.
+    Broker/Redis'e yapılan senkron çağrılar olay döngüsünü bloklamamak için thread'de yapılır.
+    """
+    batch_name = config.pop("batch_name", f"Batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    sweep = sweep_service.parse_sweep_spec(config.pop("sweep", None))
+    config.pop(FINGERPRINT_FIELD, None)  # istemcinin gönderdiği (örn. kopyalanmış) eski bir parmak izine güvenme
+    varying_params = _find_varying_params(config)
+    num_combinations = sweep_service.num_trials(sweep, _count_combinations(varying_params)) if varying_params else 1
+    if num_combinations > settings.SWEEP_MAX_COMBINATIONS: raise SweepTooLargeException(num_combinations=num_combinations, limit=settings.SWEEP_MAX_COMBINATIONS)
     batch_id, batch_name = (str(uuid.uuid4()) if num_combinations > 1 else None), (batch_name if num_combinations > 1 else None)
-    for single_config in combinations:
-        single_config.update({'batch_id': batch_id, 'batch_name': batch_name})
-        task = celery_app.send_task("start_training_pipeline", args=[single_config]); task_ids.append(task.id)
-    if num_combinations > 1: return {"message": f"{num_combinations} experiments submitted as batch '{batch_name}'.", "batch_id": batch_id, "task_ids": task_ids}
-    else: return {"message": "Experiment submitted to worker.", "task_id": task_ids[0]}
+    combinations = _generate_config_combinations(config, varying_params, sweep)
+    if force:
+        # Task id'leri önceden atanır; böylece arka planda gönderilen sweep'lerde de yanıt hemen tüm id'leri içerir.
+        task_ids = [str(uuid.uuid4()) for _ in range(num_combinations)]
+        pending, reused = zip(combinations, task_ids), []
+        scheduled = list(task_ids)
+    else:
+        task_ids, pending, reused = await _plan_dispatch(db, list(combinations))
+        scheduled = [task_id for _, task_id in pending]
+    if num_combinations <= 1:
+        if reused: return {"message": "An identical experiment already exists; reusing it.", "task_id": task_ids[0], "reused": True}
+        await asyncio.to_thread(_dispatch_training_tasks, pending, batch_id, batch_name)
+        return {"message": "Experiment submitted to worker.", "task_id": task_ids[0], "reused": False}
+    await asyncio.to_thread(_record_dispatch_state, batch_id, task_ids, batch_name=batch_name, strategy=sweep.strategy, total=len(scheduled), dispatched=0, status="dispatching", reused=len(reused))
+    if sweep.is_adaptive and scheduled:
+        # İzleyici, ilk ilerleme mesajları gelmeden önce başlatılır.
+        stopper = sweep_service.EarlyStopper(sweep, scheduled)
+        sweep_service.sweep_scheduler.start_monitor(batch_id, stopper, stop_trial=lambda task_id: _revoke_trial(batch_id, task_id), finished_trials=_finished_trials, poll_seconds=settings.SWEEP_MONITOR_POLL_SECONDS)
+    response = {"batch_id": batch_id, "task_ids": task_ids, "scheduled_task_ids": scheduled, "reused_task_ids": reused, "strategy": sweep.strategy}
+    summary = f"{num_combinations} experiments in batch '{batch_name}' ({len(scheduled)} scheduled, {len(reused)} reused)"
+    if len(scheduled) <= settings.SWEEP_SYNC_DISPATCH_LIMIT:
+        await asyncio.to_thread(_dispatch_training_tasks, pending, batch_id, batch_name)
+        return {"message": f"{summary} submitted.", **response, "dispatch": "completed"}
+    _dispatch_executor.submit(_dispatch_training_tasks, pending, batch_id, batch_name)
+    return {"message": f"{summary} are being submitted.", **response, "dispatch": "background"}
+
+def get_batch_dispatch_status(batch_id: str) -> Dict[str, Any]:
+    """Bir sweep'in broker'a gönderim durumunu (toplam/gönderilen/durum) döndürür."""
+    state = redis_pools.sync_client(decode_responses=True).hgetall(f"{BATCH_DISPATCH_KEY_PREFIX}{batch_id}")
+    if not state: raise BatchNotFoundException(batch_id=batch_id)
+    return {"batch_id": batch_id, "batch_name": state.get("batch_name"), "strategy": state.get("strategy", "grid"), "status": state.get("status"), "total": int(state.get("total", 0)), "dispatched": int(state.get("dispatched", 0)), "reused": int(state.get("reused", 0)), "early_stopped": int(state.get("early_stopped", 0)), "error": state.get("error")}
 def get_available_pipelines() -> List[Dict[str, Any]]:
-    pipelines = get_pipelines_from_redis()
-    for p in pipelines: p.pop('default_config', None); p.pop('form_schema', None)
-    return pipelines
+    return pipeline_catalog.catalog_cache.list_pipelines()
 def get_default_pipeline_config(pipeline_id: str) -> Dict[str, Any]:
-    pipelines = get_pipelines_from_redis(); pipeline_info = next((p for p in pipelines if p['id'] == pipeline_id), None)
+    pipeline_info = pipeline_catalog.catalog_cache.get_pipeline(pipeline_id)
     if not pipeline_info: raise ConfigNotFoundException(pipeline_id=pipeline_id)
     return pipeline_info
-def list_experiments() -> List[Dict[str, Any]]:
-    db = SessionLocal()
-    try:
-        experiments_from_db = db.query(Experiment).order_by(desc(Experiment.created_at)).all(); all_experiments_data = []
-        for exp in experiments_from_db:
-            def safe_get(d, keys, default=None):
-                if not isinstance(d, dict): return default
-                for key in keys:
-                    if not isinstance(d, dict) or key not in d: return default
-                    d = d[key]
-                return d
-            config_summary = {"ticker": safe_get(exp.config, ["data_sourcing", "ticker"]),"location": f"{safe_get(exp.config, ['data_sourcing', 'latitude'])}, {safe_get(exp.config, ['data_sourcing', 'longitude'])}" if safe_get(exp.config, ['data_sourcing', 'latitude']) else None,"epochs": safe_get(exp.config, ["training_params", "epochs"]),"lr": safe_get(exp.config, ["training_params", "lr"])}
-            config_summary = {k: v for k, v in config_summary.items() if v is not None}
-            summary = {"experiment_id": exp.id,"task_id": exp.task_id,"pipeline_name": exp.pipeline_name,"status": exp.status,"created_at": exp.created_at.isoformat() if exp.created_at else None,"completed_at": exp.completed_at.isoformat() if exp.completed_at else None,"failed_at": exp.failed_at.isoformat() if exp.failed_at else None,"batch_id": exp.batch_id,"batch_name": exp.batch_name,"model_path": exp.model_path,"config_summary": config_summary,"results_summary": {"final_loss": safe_get(exp.results, ["final_loss"]),"r2_score": safe_get(exp.results, ["metrics", "r2_score"]),"mae": safe_get(exp.results, ["metrics", "mae"]),"accuracy": safe_get(exp.results, ["metrics", "accuracy"])},"config": exp.config,"results": exp.results,"error": exp.error}
-            all_experiments_data.append(summary)
-        return all_experiments_data
-    finally: db.close()
-def get_experiment_details(experiment_id: str) -> Dict[str, Any]:
-    db = SessionLocal()
+
+# --- Deney listeleme: keyset sayfalama ve sütun projeksiyonu ---
+EXPERIMENT_LIST_DEFAULT_LIMIT = 100
+EXPERIMENT_LIST_MAX_LIMIT = 1000
+# Varsayılan olarak sadece özet alanları döner; büyük JSON blob'ları (config/results)
+# ancak `fields=` ile açıkça istendiğinde veritabanından okunur.
+EXPERIMENT_SUMMARY_FIELDS = ("experiment_id", "task_id", "pipeline_name", "status", "created_at", "completed_at", "failed_at", "batch_id", "batch_name", "model_path", "config_summary", "results_summary", "error")
+EXPERIMENT_BLOB_FIELDS = ("config", "results")
+# Özet alanları JSON'dan değil, `experiment_summaries` tablosunun düz ve tipli sütunlarından okunur.
+# Özet şeması bu süreçte hazır değilse blob'lar okunur ve aynı alanlar Python'da hesaplanır.
+CONFIG_SUMMARY_COLUMNS = ("ticker", "latitude", "longitude", "epochs", "lr")
+RESULTS_SUMMARY_COLUMNS = ("final_loss", "r2_score", "mae", "accuracy")
+
+def _experiment_field_columns() -> Dict[str, list]:
+    """Her çıktı alanını, onu üretmek için gereken SQL ifadelerine eşler (sorgu `experiments_source()` üzerinden yapılır)."""
+    def summary_columns(prefix, names):
+        if not summary_ready(): return [(Experiment.config if prefix == "cs_" else Experiment.results).label(f"{prefix}blob")]
+        return [experiment_summaries.c[name].label(f"{prefix}{name}") for name in names]
+    return {
+        "experiment_id": [], "created_at": [],  # keyset için her zaman seçilirler
+        "task_id": [Experiment.task_id], "pipeline_name": [Experiment.pipeline_name], "status": [Experiment.status],
+        "completed_at": [Experiment.completed_at], "failed_at": [Experiment.failed_at],
+        "batch_id": [Experiment.batch_id], "batch_name": [Experiment.batch_name], "model_path": [Experiment.model_path],
+        "error": [Experiment.error],
+        "config_summary": summary_columns("cs_", CONFIG_SUMMARY_COLUMNS),
+        "results_summary": summary_columns("rs_", RESULTS_SUMMARY_COLUMNS),
+        "config": [Experiment.config], "results": [Experiment.results],
+    }
+
+def _parse_experiment_fields(fields: Optional[str]) -> List[str]:
+    if not fields: return list(EXPERIMENT_SUMMARY_FIELDS)
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = set(requested) - set(EXPERIMENT_SUMMARY_FIELDS) - set(EXPERIMENT_BLOB_FIELDS)
+    if unknown: raise InvalidFieldsException(fields=unknown)
+    return list(dict.fromkeys(requested))
+
+def encode_experiment_cursor(created_at: Optional[datetime], experiment_id: str) -> str:
+    """`created_at`'i NULL olan satırlar da sayfalanabilsin diye NULL, imleçte `null` olarak saklanır."""
+    raw = json.dumps([_iso(created_at), experiment_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_experiment_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
     try:
-        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        if not exp: raise ExperimentNotFoundException(experiment_id=experiment_id)
-        return { "experiment_id": exp.id, "task_id": exp.task_id, "pipeline_name": exp.pipeline_name, "status": exp.status, "config": exp.config, "results": exp.results, "error": exp.error, "created_at": exp.created_at.isoformat() if exp.created_at else None, "completed_at": exp.completed_at.isoformat() if exp.completed_at else None, "failed_at": exp.failed_at.isoformat() if exp.failed_at else None, "batch_id": exp.batch_id, "batch_name": exp.batch_name, }
-    finally: db.close()
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, experiment_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), str(experiment_id)
+    except Exception: raise InvalidCursorException(cursor=cursor)
+
+def _experiment_cursor_predicate(created_at: Optional[datetime], experiment_id: str):
+    """`created_at DESC NULLS LAST, id DESC` sıralamasında imleçten sonra gelen satırlar."""
+    if created_at is None: return and_(Experiment.created_at.is_(None), Experiment.id < experiment_id)
+    return or_(Experiment.created_at < created_at, and_(Experiment.created_at == created_at, Experiment.id < experiment_id), Experiment.created_at.is_(None))
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _summary_values(m: Any, prefix: str, source: str, names: Tuple[str, ...]) -> Dict[str, Any]:
+    if f"{prefix}blob" in m: values = summary_from_blob(source, m[f"{prefix}blob"]); return {name: values[name] for name in names}
+    return {name: m[f"{prefix}{name}"] for name in names}
+
+def _format_experiment_row(row: Any, fields: List[str]) -> Dict[str, Any]:
+    """Projeksiyonla okunmuş bir satırı API'nin deney özet formatına çevirir."""
+    m = row._mapping; out = {}
+    for field in fields:
+        if field == "experiment_id": out[field] = m["id"]
+        elif field in ("created_at", "completed_at", "failed_at"): out[field] = _iso(m[field])
+        elif field == "config_summary":
+            cs = _summary_values(m, "cs_", "config", CONFIG_SUMMARY_COLUMNS)
+            latitude, longitude, epochs = cs.pop("latitude"), cs.pop("longitude"), cs["epochs"]
+            if isinstance(epochs, float) and epochs.is_integer(): epochs = int(epochs)
+            summary = {"ticker": cs["ticker"], "location": f"{latitude}, {longitude}" if latitude else None, "epochs": epochs, "lr": cs["lr"]}
+            out[field] = {k: v for k, v in summary.items() if v is not None}
+        elif field == "results_summary": out[field] = _summary_values(m, "rs_", "results", RESULTS_SUMMARY_COLUMNS)
+        else: out[field] = m[field]
+    return out
+
+async def list_experiments(db: AsyncSession, limit: int = EXPERIMENT_LIST_DEFAULT_LIMIT, cursor: Optional[str] = None, fields: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Deneyleri `created_at`/`id` üzerinde keyset sayfalama ile, en yeniden eskiye listeler; `created_at`'i olmayanlar en sonda gelir.
+    Sadece istenen alanlar için gereken sütunlar okunur; maliyet tablo boyutuna değil sayfa boyutuna bağlıdır.
+    """
+    limit = max(1, min(limit, EXPERIMENT_LIST_MAX_LIMIT)); selected_fields = _parse_experiment_fields(fields)
+    field_columns = _experiment_field_columns()
+    columns = [Experiment.id, Experiment.created_at] + [col for f in selected_fields for col in field_columns[f]]
+    query = select(*columns).select_from(experiments_source())
+    if cursor:
+        query = query.where(_experiment_cursor_predicate(*decode_experiment_cursor(cursor)))
+    # NULL sıralaması veritabanına göre değişir (PostgreSQL DESC'te başta, SQLite sonda); imleçle tutarlı olsun diye açıkça verilir.
+    rows = (await db.execute(query.order_by(desc(Experiment.created_at).nulls_last(), desc(Experiment.id)).limit(limit + 1))).all()
+    has_more = len(rows) > limit; rows = rows[:limit]
+    next_cursor = encode_experiment_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return {"items": [_format_experiment_row(row, selected_fields) for row in rows], "next_cursor": next_cursor}
+# --- Akış (streaming) dışa aktarma ---
+EXPORT_BATCH_SIZE = 500
+
+def _encode_export_value(value: Any) -> Any:
+    return json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+
+def export_experiments(export_format: str = "ndjson", fields: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Tüm deney geçmişini NDJSON veya CSV olarak, satır satır üreten bir async iterator döndürür.
+    Sorgu sunucu taraflı imleçle (`stream` + `yield_per`) okunur; bellek kullanımı satır sayısından bağımsızdır.
+    Alanlar, akış başlamadan önce doğrulanır. Akış isteğin ömründen uzun sürebildiği için kendi session'ını açar.
+    """
+    selected_fields = _parse_experiment_fields(fields) if fields else list(EXPERIMENT_SUMMARY_FIELDS + EXPERIMENT_BLOB_FIELDS)
+    field_columns = _experiment_field_columns()
+    columns = [Experiment.id, Experiment.created_at] + [col for f in selected_fields for col in field_columns[f]]
+
+    def encode_csv(values: List[Any]) -> str:
+        buffer = io.StringIO(); csv.writer(buffer).writerow(values); return buffer.getvalue()
+
+    async def generate() -> AsyncIterator[str]:
+        async with SessionLocal() as db:
+            if export_format == "csv": yield encode_csv(selected_fields)
+            query = select(*columns).select_from(experiments_source()).order_by(desc(Experiment.created_at).nulls_last(), desc(Experiment.id)).execution_options(yield_per=EXPORT_BATCH_SIZE)
+            chunk, flushed_once = [], False
+            async for row in await db.stream(query):
+                item = _format_experiment_row(row, selected_fields)
+                if export_format == "csv": chunk.append(encode_csv([_encode_export_value(item[f]) for f in selected_fields]))
+                else: chunk.append(json.dumps(item, default=str) + "\n")
+                # İlk satır hemen gönderilir, sonrakiler parti halinde.
+                if not flushed_once or len(chunk) >= EXPORT_BATCH_SIZE:
+                    yield "".join(chunk); chunk.clear(); flushed_once = True
+            if chunk: yield "".join(chunk)
+    return generate()
+
+async def get_experiment_details(db: AsyncSession, experiment_id: str) -> Dict[str, Any]:
+    exp = await db.get(Experiment, experiment_id)
+    if not exp: raise ExperimentNotFoundException(experiment_id=experiment_id)
+    return { "experiment_id": exp.id, "task_id": exp.task_id, "pipeline_name": exp.pipeline_name, "status": exp.status, "config": exp.config, "results": exp.results, "error": exp.error, "created_at": exp.created_at.isoformat() if exp.created_at else None, "completed_at": exp.completed_at.isoformat() if exp.completed_at else None, "failed_at": exp.failed_at.isoformat() if exp.failed_at else None, "batch_id": exp.batch_id, "batch_name": exp.batch_name, }
 def get_task_status(task_id: str) -> Dict[str, Any]:
-    task_result = AsyncResult(task_id, app=celery_app); return {"status": task_result.state, "details": task_result.info}
-def get_experiment_report_path(experiment_id: str) -> str:
-    db = SessionLocal()
-    try:
-        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-        if not exp: raise ExperimentNotFoundException(experiment_id=experiment_id)
-        report_dir = exp.config.get('experiment_dir')
-        if not report_dir or not os.path.isdir(report_dir): raise AzuraForgeException(status_code=404, detail=f"Report directory for experiment '{experiment_id}' not found.", error_code="REPORT_NOT_FOUND")
-        return report_dir
-    finally: db.close()
+    task_result = _async_result(task_id); return {"status": task_result.state, "details": task_result.info}
+
+# --- Toplu görev durumu: tüm id'ler için tek bir pipeline'lı backend okuması ---
+FINAL_TASK_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+# Celery'nin JSON meta verisi "status" ile başlar; sonuçlar (eğitim geçmişi vb.) büyük olabileceğinden
+# önce sadece baştaki bu kadar bayt okunur. Durum orada bulunamazsa (farklı serializer) tam değer okunur.
+STATUS_PREFIX_BYTES = 64
+_STATUS_PATTERN = re.compile(rb'"status":\s*"([A-Za-z_]+)"')
 
-async def predict_with_model(experiment_id: str, request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Dict[str, Any]:
+async def _batch_task_ids(db: AsyncSession, batch_id: str) -> List[str]:
+    """Batch'in task id'leri: gönderimde kaydedilen liste ve (kaydı süresi dolmuş batch'ler için) veritabanındaki deneyler."""
+    task_ids = [t.decode("utf-8") for t in await redis_pools.async_client().lrange(f"{BATCH_TASKS_KEY_PREFIX}{batch_id}", 0, -1)]
+    task_ids += (await db.execute(select(Experiment.task_id).where(Experiment.batch_id == batch_id, Experiment.task_id.isnot(None)).order_by(Experiment.created_at))).scalars().all()
+    if not task_ids: raise BatchNotFoundException(batch_id=batch_id)
+    return list(dict.fromkeys(task_ids))
+
+async def _read_task_states(task_ids: List[str]) -> Dict[str, str]:
+    if not task_ids: return {}
+    backend = celery_app.backend; r = redis_pools.async_client()
+    keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+    pipe = r.pipeline(transaction=False)
+    for key in keys: pipe.getrange(key, 0, STATUS_PREFIX_BYTES - 1)
+    prefixes = await pipe.execute()
+    states, unparsed = {}, []
+    for task_id, key, prefix in zip(task_ids, keys, prefixes):
+        # Anahtar yoksa görev henüz bir sonuç/durum yazmamıştır (Celery'de PENDING).
+        if not prefix: states[task_id] = "PENDING"; continue
+        match = _STATUS_PATTERN.search(prefix)
+        if match: states[task_id] = match.group(1).decode("ascii")
+        else: unparsed.append((task_id, key))
+    if unparsed:
+        for (task_id, _), payload in zip(unparsed, await r.mget([key for _, key in unparsed])):
+            try: states[task_id] = backend.decode_result(payload).get("status", "PENDING") if payload is not None else "PENDING"
+            except Exception as e: print(f"API Error decoding status of task {task_id}: {e}"); states[task_id] = "UNKNOWN"
+    return {task_id: states[task_id] for task_id in task_ids}
+
+async def get_task_statuses(db: AsyncSession, task_ids: Optional[List[str]] = None, batch_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Birden çok görevin durumunu tek seferde döndürür: verilen id'ler ve/veya bir batch'in tüm görevleri.
+    Her görev için ayrı bir AsyncResult yerine tüm durumlar tek bir pipeline ile backend'den okunur.
+    """
+    ids = list(dict.fromkeys([*(await _batch_task_ids(db, batch_id) if batch_id else []), *(task_ids or [])]))
+    statuses = await _read_task_states(ids)
+    counts = Counter(statuses.values()); finished = sum(counts[state] for state in FINAL_TASK_STATES)
+    return {"batch_id": batch_id, "total": len(statuses), "finished": finished, "done": finished == len(statuses), "counts": dict(counts), "statuses": statuses}
+# Deney id -> (rapor dizini, deney bitti mi). Bitmiş deneylerin dizini değişmez ve süresiz
+# (LRU) tutulur; süren deneyler kısa süreliğine önbelleğe alınır.
+REPORT_DIR_PENDING_TTL_SECONDS = 10
+_report_dir_cache = TTLCache(maxsize=settings.REPORT_DIR_CACHE_SIZE, ttl=None)
+
+async def get_experiment_report_location(db: AsyncSession, experiment_id: str) -> Tuple[str, bool]:
+    """Deneyin rapor dizinini ve deneyin bitip bitmediğini (raporun artık değişmeyeceğini) döndürür."""
+    cached = _report_dir_cache.get(experiment_id)
+    if cached is not None: return cached
+    row = (await db.execute(select(Experiment.config, Experiment.completed_at, Experiment.failed_at).where(Experiment.id == experiment_id))).first()
+    if row is None: raise ExperimentNotFoundException(experiment_id=experiment_id)
+    report_dir = (row.config or {}).get('experiment_dir')
+    if not report_dir or not os.path.isdir(report_dir): raise AzuraForgeException(status_code=404, detail=f"Report directory for experiment '{experiment_id}' not found.", error_code="REPORT_NOT_FOUND")
+    finished = row.completed_at is not None or row.failed_at is not None
+    _report_dir_cache.set(experiment_id, (report_dir, finished), ttl=None if finished else REPORT_DIR_PENDING_TTL_SECONDS)
+    return report_dir, finished
+
+async def get_experiment_report_path(db: AsyncSession, experiment_id: str) -> str:
+    report_dir, _ = await get_experiment_report_location(db, experiment_id)
+    return report_dir
+
+async def get_batch_artifact_dirs(db: AsyncSession, batch_id: str) -> List[Tuple[str, str]]:
+    """Bir batch'teki deneylerin (experiment id, mevcut artefakt dizini) çiftleri, oluşturulma sırasıyla."""
+    experiment_dir = Experiment.config['experiment_dir'].as_string()
+    rows = (await db.execute(select(Experiment.id, experiment_dir.label("experiment_dir")).where(Experiment.batch_id == batch_id).order_by(Experiment.created_at, Experiment.id))).all()
+    if not rows: raise BatchNotFoundException(batch_id=batch_id)
+    return [(row.id, row.experiment_dir) for row in rows if row.experiment_dir and os.path.isdir(row.experiment_dir)]
+
+# (dosya yolu, ETag, kodlama) -> gönderilecek baytlar. ETag anahtarın parçası olduğu için
+# dosya değişince eski kayıt kendiliğinden kullanılmaz hale gelir.
+REPORT_CONTENT_CACHE_SIZE = 128
+_report_content_cache = TTLCache(maxsize=REPORT_CONTENT_CACHE_SIZE, ttl=None)
+
+async def read_report_file(path: str, etag: str, encoding: Optional[str]) -> bytes:
+    """Rapor dosyasını (gerekirse sıkıştırılmış olarak) okur; sonuç ETag'e bağlı olarak önbelleğe alınır."""
+    key = (path, etag, encoding)
+    content = _report_content_cache.get(key)
+    if content is None:
+        def load() -> bytes:
+            with open(path, 'rb') as f: return http_cache.compress(f.read(), encoding)
+        content = await asyncio.to_thread(load)
+        _report_content_cache.set(key, content)
+    return content
+
+async def _get_model_artifact(db: AsyncSession, experiment_id: str) -> Dict[str, Any]:
+    """
+    Deneyin model artefaktı ve sürümü: model dosyası API'den erişilebiliyorsa yolu ve
+    değişiklik zamanı, değilse tamamlanma zamanı. Model yeniden eğitilince sürüm (ve önbellek anahtarı) değişir.
+    """
+    row = (await db.execute(select(Experiment.model_path, Experiment.completed_at, Experiment.pipeline_name, Experiment.config).where(Experiment.id == experiment_id))).first()
+    if not row: raise ExperimentNotFoundException(experiment_id=experiment_id)
+    model_path, completed_at, pipeline_name, config = row
+    version = f"{model_path}@{completed_at.isoformat() if completed_at else 'none'}"
+    if model_path:
+        try: version = f"{model_path}@{os.stat(model_path).st_mtime_ns}"
+        except OSError: pass
+    return {"model_path": model_path, "pipeline_name": pipeline_name, "config": config or {}, "version": version}
+
+async def _run_prediction_task(cache_key: str, experiment_id: str, request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Dict[str, Any]:
     """
     Worker'a bir tahmin görevi gönderir ve sonucunu bekler.
-    prediction_steps ek parametresi iletilir.
+    Paylaşılan önbellek katmanı açıksa başka bir API sürecinin aynı anahtar için başlattığı göreve bağlanılır.
+    Sonuç, paylaşılan backend dinleyicisi üzerinden asenkron beklenir; bekleme sırasında hiçbir thread meşgul edilmez.
     """
-    task = None
+    task_id = str(uuid.uuid4())
+    owner = False
     try:
-        task = celery_app.send_task(
-            "predict_from_model_task",
-            args=[experiment_id, request_data, prediction_steps] # prediction_steps eklendi
-        )
-        result = await asyncio.to_thread(task.get, timeout=60)
-        return result
-
+        owner_task_id = await prediction_cache.claim_inflight(cache_key, task_id, timeout=settings.PREDICTION_TIMEOUT_SECONDS)
+        owner = owner_task_id == task_id
+        if owner:
+            # Broker'a yayın kısa sürer; olay döngüsünü bloklamamak için thread'de yapılır.
+            await asyncio.to_thread(get_celery_app().send_task, "predict_from_model_task", args=[experiment_id, request_data, prediction_steps], task_id=task_id)
+        task_id = owner_task_id
+        meta = await result_waiter.wait(task_id, timeout=settings.PREDICTION_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"API Error during prediction task: timed out after {settings.PREDICTION_TIMEOUT_SECONDS}s (task {task_id})")
+        raise AzuraForgeException(status_code=504, detail=f"Prediction task did not finish within {settings.PREDICTION_TIMEOUT_SECONDS} seconds.", error_code="PREDICTION_TIMEOUT")
     except Exception as e:
-        error_message = f"Prediction task failed: {str(e)}"
-        if task and task.failed():
-             original_exception = task.result
-             error_message = f"Prediction task failed: {str(original_exception)}"
-
-        print(f"API Error during prediction task: {error_message}")
-        if task and task.traceback:
-            print(f"Worker Traceback:\n{task.traceback}")
-
-        raise AzuraForgeException(
-            status_code=500,
-            detail=error_message,
-            error_code="PREDICTION_TASK_FAILED"
-        )
\ No newline at end of file
+        print(f"API Error during prediction task: {e}")
+        raise AzuraForgeException(status_code=500, detail=f"Prediction task failed: {str(e)}", error_code="PREDICTION_TASK_FAILED")
+    finally:
+        # Sonuç (veya hata) belli oldu; sonraki istekler bitmiş göreve bağlanmak yerine yeniden denesin.
+        if owner:
+            await prediction_cache.release_inflight(cache_key, task_id)
+
+    if meta.get("status") == "SUCCESS":
+        return meta.get("result")
+
+    original_exception = get_celery_app().backend.exception_to_python(meta.get("result")) if meta.get("result") else meta.get("status")
+    error_message = f"Prediction task failed: {str(original_exception)}"
+    print(f"API Error during prediction task: {error_message}")
+    if meta.get("traceback"):
+        print(f"Worker Traceback:\n{meta['traceback']}")
+
+    raise AzuraForgeException(
+        status_code=500,
+        detail=error_message,
+        error_code="PREDICTION_TASK_FAILED"
+    )
+
+async def predict_with_model(db: AsyncSession, experiment_id: str, request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Dict[str, Any]:
+    """
+    Tahmin sonucunu önbellekten döndürür; yoksa worker'a tek bir görev gönderir.
+    Anahtar deney id'si, model artefakt sürümü ve istek gövdesinden türetilir; aynı anda gelen
+    özdeş istekler tek bir görevin sonucunu paylaşır. Başarısız tahminler önbelleğe alınmaz.
+    """
+    artifact = await _get_model_artifact(db, experiment_id)
+    cache_key = prediction_cache_key(experiment_id, artifact["version"], request_data, prediction_steps)
+    return await prediction_cache.get_or_compute(cache_key, lambda: _run_prediction(cache_key, experiment_id, artifact, request_data, prediction_steps))
+
+async def _run_prediction(cache_key: str, experiment_id: str, artifact: Dict[str, Any], request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Dict[str, Any]:
+    """Sunum modu açık ve model sıcaksa tahmini süreç içinde yapar; değilse Celery görevine düşer."""
+    start = time.perf_counter()
+    if model_server.enabled:
+        try:
+            result = await asyncio.wait_for(model_server.predict(f"{experiment_id}:{artifact['version']}", artifact["pipeline_name"], artifact["config"], artifact["model_path"], request_data, prediction_steps), settings.PREDICTION_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise AzuraForgeException(status_code=504, detail=f"Prediction did not finish within {settings.PREDICTION_TIMEOUT_SECONDS} seconds.", error_code="PREDICTION_TIMEOUT")
+        except Exception as e:
+            print(f"API Error during in-process prediction: {e}")
+            raise AzuraForgeException(status_code=500, detail=f"Prediction failed: {str(e)}", error_code="PREDICTION_TASK_FAILED")
+        if result is not None:
+            PREDICTION_WAIT.labels("model_server").observe(time.perf_counter() - start); return result
+    result = await _run_prediction_task(cache_key, experiment_id, request_data, prediction_steps)
+    PREDICTION_WAIT.labels("worker").observe(time.perf_counter() - start)
+    return result
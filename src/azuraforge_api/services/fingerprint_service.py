@@ -0,0 +1,137 @@
+# api/src/azuraforge_api/services/fingerprint_service.py
+
+import hashlib
+import json
+import logging
+from typing import Dict, Any, List, Set
+
+from redis.exceptions import WatchError
+
+from ..core.config import settings
+from ..core.redis_pool import redis_pools
+
+logger = logging.getLogger(__name__)
+
+# Parmak izi deney config'inin içine yazılır; worker config'i Experiment satırında sakladığı için
+# özet tablosu tetikleyicileri onu indeksli `experiment_summaries.config_fingerprint` sütununa kopyalar.
+FINGERPRINT_FIELD = "config_fingerprint"
+# Eğitimin sonucunu etkilemeyen, sadece gruplama amaçlı üst seviye anahtarlar.
+FINGERPRINT_EXCLUDED_KEYS = frozenset({"batch_id", "batch_name", FINGERPRINT_FIELD})
+FINGERPRINT_INDEX_PREFIX = "azuraforge:config_fingerprint:"
+# Görev broker'a yayınlandıktan sonra yazılan işaret; PENDING bir görevin gerçekten kuyrukta olduğunun tek kanıtı.
+DISPATCHED_MARKER_PREFIX = "azuraforge:task_dispatched:"
+# İndeks sonuçlardan uzun yaşamamalı; daha eski deneyler veritabanından bulunur.
+FINGERPRINT_INDEX_TTL_SECONDS = min(60 * 60 * 24 * 30, settings.CELERY_RESULT_EXPIRES_SECONDS)
+# Sahiplenilmiş ama henüz yayınlanmamış kayıtlar kısa yaşar; gönderemeden çöken bir süreç indeksi kalıcı bozmasın.
+FINGERPRINT_CLAIM_TTL_SECONDS = 60 * 10
+# Bu durumlardaki bir görev yeniden kullanılabilir: tamamlanmış veya hâlâ sürüyor. PENDING burada yok:
+# Celery bilinmeyen ve sonucu süresi dolmuş görevler için de PENDING döndürür (bkz. `is_dispatched`).
+REUSABLE_TASK_STATES = frozenset({"RECEIVED", "STARTED", "PROGRESS", "RETRY", "SUCCESS"})
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    # Sweep'ler virgüllü değerleri float'a çevirir ("10" -> 10.0); 10 ile 10.0 aynı config'tir.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Normalleştirilmiş config'in kanonik JSON temsilinin SHA-256 özeti."""
+    normalised = _normalise({k: v for k, v in config.items() if k not in FINGERPRINT_EXCLUDED_KEYS})
+    canonical = json.dumps(normalised, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _index_key(fingerprint: str) -> str:
+    return f"{FINGERPRINT_INDEX_PREFIX}{fingerprint}"
+
+
+def lookup_indexed(fingerprints: List[str]) -> Dict[str, str]:
+    """Redis indeksinde kayıtlı parmak izlerini tek bir MGET ile task id'lerine eşler."""
+    if not fingerprints:
+        return {}
+    values = redis_pools.sync_client(decode_responses=True).mget([_index_key(fp) for fp in fingerprints])
+    return {fp: task_id for fp, task_id in zip(fingerprints, values) if task_id}
+
+
+def claim(candidates: Dict[str, str]) -> Dict[str, str]:
+    """
+    Parmak izlerini verilen task id'leri için atomik olarak (SET NX) sahiplenir.
+    Aynı anda gelen başka bir istek önce davranmışsa onun task id'si döner; böylece
+    eşzamanlı iki özdeş gönderim tek bir göreve bağlanır.
+    """
+    if not candidates:
+        return {}
+    r = redis_pools.sync_client(decode_responses=True)
+    fingerprints = list(candidates)
+    pipe = r.pipeline(transaction=False)
+    for fp in fingerprints:
+        pipe.set(_index_key(fp), candidates[fp], nx=True, ex=FINGERPRINT_CLAIM_TTL_SECONDS)
+    claimed = pipe.execute()
+    lost = [fp for fp, ok in zip(fingerprints, claimed) if not ok]
+    winners = dict(candidates)
+    if lost:
+        winners.update({fp: task_id for fp, task_id in zip(lost, r.mget([_index_key(fp) for fp in lost])) if task_id})
+    return winners
+
+
+def index(entries: Dict[str, str]) -> None:
+    """
+    Broker'a yayınlanmış görevleri indekse yazar (force ile yeniden çalıştırılanlar dahil, en yenisi kazanır)
+    ve her biri için yayın işaretini bırakır.
+    """
+    if not entries:
+        return
+    pipe = redis_pools.sync_client(decode_responses=True).pipeline(transaction=False)
+    for fp, task_id in entries.items():
+        pipe.set(_index_key(fp), task_id, ex=FINGERPRINT_INDEX_TTL_SECONDS)
+        pipe.set(f"{DISPATCHED_MARKER_PREFIX}{task_id}", 1, ex=FINGERPRINT_INDEX_TTL_SECONDS)
+    pipe.execute()
+
+
+def dispatched(task_ids: List[str]) -> Set[str]:
+    """Verilen görevlerden yayın işareti olanlar (tek bir MGET)."""
+    if not task_ids:
+        return set()
+    values = redis_pools.sync_client(decode_responses=True).mget([f"{DISPATCHED_MARKER_PREFIX}{t}" for t in task_ids])
+    return {task_id for task_id, value in zip(task_ids, values) if value}
+
+
+def open_claims(fingerprints: List[str]) -> Set[str]:
+    """Henüz yayınlanmamış, süresi sahiplenme penceresi içindeki (başka bir istekçe gönderilmekte olan) kayıtlar."""
+    if not fingerprints:
+        return set()
+    pipe = redis_pools.sync_client(decode_responses=True).pipeline(transaction=False)
+    for fp in fingerprints:
+        pipe.ttl(_index_key(fp))
+    return {fp for fp, ttl in zip(fingerprints, pipe.execute()) if 0 < ttl <= FINGERPRINT_CLAIM_TTL_SECONDS}
+
+
+def release(entries: Dict[str, str]) -> None:
+    """
+    Başarısız / iptal edilmiş görevlere işaret eden indeks kayıtlarını siler. Karşılaştır-ve-sil: kayıt bu arada
+    başka bir görev tarafından sahiplenildiyse (değeri verilen task id değilse) ona dokunulmaz.
+    """
+    if not entries:
+        return
+    keys = {_index_key(fp): task_id for fp, task_id in entries.items()}
+    with redis_pools.sync_client(decode_responses=True).pipeline(transaction=True) as pipe:
+        for _ in range(3):
+            try:
+                pipe.watch(*keys)
+                owned = [key for key, value in zip(keys, pipe.mget(list(keys))) if value == keys[key]]
+                if not owned:
+                    return
+                pipe.multi()
+                pipe.delete(*owned)
+                pipe.execute()
+                return
+            except WatchError:
+                # İzlenen kayıtlardan biri değişti; yeniden okuyup kalanları tekrar dene.
+                continue
+    logger.warning(f"Could not release {len(keys)} fingerprint index entries after concurrent updates.")
@@ -0,0 +1,202 @@
+# api/src/azuraforge_api/services/model_server.py
+
+import asyncio
+import logging
+import os
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.metadata import entry_points
+from typing import Dict, Any, Optional, List
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Worker'ın pipeline'ları keşfettiği entry point grubu.
+PIPELINE_ENTRY_POINT_GROUP = "azuraforge.pipelines"
+# Sunulamayan modellerin hatırlandığı sınırlı liste; TTL sonrası (ör. pipeline kurulduysa) tekrar denenir.
+UNSERVABLE_CACHE_SIZE = 1024
+UNSERVABLE_TTL_SECONDS = 600
+
+
+class ModelNotServableError(Exception):
+    """Model bu süreçte yüklenemiyor/sunulamıyor; tahmin Celery görevine bırakılmalı."""
+
+
+# --- Alt süreç (process pool) tarafı ---
+# Her sunum süreci kendi sınırlı LRU'sunda yüklenmiş pipeline'ları tutar.
+_hot_models: "OrderedDict[str, Any]" = OrderedDict()
+_max_hot_models = 1
+
+
+def _init_serving_process(max_hot_models: int) -> None:
+    global _max_hot_models
+    _max_hot_models = max_hot_models
+
+
+def _resolve_pipeline_class(pipeline_name: str) -> Any:
+    for ep in entry_points(group=PIPELINE_ENTRY_POINT_GROUP):
+        if ep.name == pipeline_name:
+            return ep.load()
+    raise ModelNotServableError(f"Pipeline '{pipeline_name}' is not installed in the API image.")
+
+
+def _load_model(model_key: str, pipeline_name: str, config: Dict[str, Any], model_path: str) -> Any:
+    pipeline_class = _resolve_pipeline_class(pipeline_name)
+    # Sadece yükleme ve tahmin kancalarını sunan pipeline'lar süreç içinde çalıştırılabilir.
+    if not (hasattr(pipeline_class, "load_model") and hasattr(pipeline_class, "predict")):
+        raise ModelNotServableError(f"Pipeline '{pipeline_name}' does not support in-process serving.")
+    try:
+        pipeline = pipeline_class(config)
+        pipeline.load_model(model_path)
+    except Exception as e:
+        raise ModelNotServableError(f"Model '{model_path}' could not be loaded: {e}")
+    _hot_models[model_key] = pipeline
+    while len(_hot_models) > _max_hot_models:
+        _hot_models.popitem(last=False)
+    return pipeline
+
+
+def _warm_in_process(model_key: str, pipeline_name: str, config: Dict[str, Any], model_path: str) -> None:
+    if model_key in _hot_models:
+        _hot_models.move_to_end(model_key)
+    else:
+        _load_model(model_key, pipeline_name, config, model_path)
+
+
+def _predict_in_process(model_key: str, pipeline_name: str, config: Dict[str, Any], model_path: str, request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Dict[str, Any]:
+    pipeline = _hot_models.get(model_key)
+    if pipeline is None:
+        pipeline = _load_model(model_key, pipeline_name, config, model_path)
+    else:
+        _hot_models.move_to_end(model_key)
+    return pipeline.predict(request_data, prediction_steps=prediction_steps)
+
+
+# --- API süreci tarafı ---
+class ModelServer:
+    """
+    Opsiyonel düşük gecikmeli tahmin modu. Sıcak modeller tek süreçli sunum havuzlarında
+    sınırlı bir LRU'da tutulur ve tahmin broker'a uğramadan çalıştırılır. Her model anahtarı
+    sabit bir sürece yönlendirilir; böylece API tarafındaki LRU o sürecin durumunun birebir
+    aynasıdır ve "sıcak" bir model hiçbir zaman soğuk bir süreçte çalışmaz.
+    Soğuk (henüz yüklenmemiş) veya çok büyük modeller için `None` döner; çağıran
+    `predict_from_model_task`'e düşer. Soğuk model ilk istekte arka planda ısıtılır.
+    """
+
+    def __init__(self, enabled: bool, workers: int, max_models: int, max_model_bytes: int):
+        self.enabled = enabled
+        self._workers = workers = max(workers, 1)
+        self._max_models = max_models
+        self._max_model_bytes = max_model_bytes
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * workers
+        # Her süreçte yüklü olduğu bilinen modeller (o sürecin LRU'sunun API tarafındaki aynası).
+        self._hot: List["OrderedDict[str, None]"] = [OrderedDict() for _ in range(workers)]
+        self._warming: Dict[str, asyncio.Future] = {}
+        self._unservable = TTLCache(maxsize=UNSERVABLE_CACHE_SIZE, ttl=UNSERVABLE_TTL_SECONDS)
+        self.served = 0
+        self.fallbacks = 0
+
+    def _shard(self, model_key: str) -> int:
+        # Süreçler arası kararlı olması için hash() yerine crc32.
+        return zlib.crc32(model_key.encode("utf-8")) % self._workers
+
+    def _get_executor(self, shard: int) -> ProcessPoolExecutor:
+        if self._executors[shard] is None:
+            self._executors[shard] = ProcessPoolExecutor(max_workers=1, initializer=_init_serving_process, initargs=(self._max_models,))
+        return self._executors[shard]
+
+    def _reset_executor(self, shard: int) -> None:
+        if self._executors[shard] is not None:
+            self._executors[shard].shutdown(wait=False, cancel_futures=True)
+        self._executors[shard] = None
+        self._hot[shard].clear()
+
+    def _mark_hot(self, model_key: str) -> None:
+        hot = self._hot[self._shard(model_key)]
+        hot[model_key] = None
+        hot.move_to_end(model_key)
+        while len(hot) > self._max_models:
+            hot.popitem(last=False)
+
+    def _is_small_enough(self, model_path: Optional[str]) -> bool:
+        if not model_path:
+            return False
+        try:
+            return os.path.getsize(model_path) <= self._max_model_bytes
+        except OSError:
+            return False
+
+    def _warm(self, model_key: str, pipeline_name: str, config: Dict[str, Any], model_path: str) -> None:
+        if model_key in self._warming:
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(self._shard(model_key)), _warm_in_process, model_key, pipeline_name, config, model_path)
+        self._warming[model_key] = future
+
+        def on_done(f: asyncio.Future) -> None:
+            self._warming.pop(model_key, None)
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is None:
+                self._mark_hot(model_key)
+            elif isinstance(error, ModelNotServableError):
+                logger.info(f"Model {model_key} will be served by the worker: {error}")
+                self._unservable.set(model_key, True)
+            else:
+                logger.error(f"Warming model {model_key} failed: {error}")
+
+        future.add_done_callback(on_done)
+
+    async def predict(self, model_key: str, pipeline_name: str, config: Dict[str, Any], model_path: Optional[str], request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Model sıcaksa tahmini yerel havuzda çalıştırır ve sonucu döndürür.
+        Model sunulamıyorsa `None` döner; tahmin hataları olduğu gibi fırlatılır.
+        """
+        if not self.enabled or self._unservable.get(model_key) or not self._is_small_enough(model_path):
+            self.fallbacks += 1
+            return None
+        shard = self._shard(model_key)
+        hot = self._hot[shard]
+        if model_key not in hot:
+            self._warm(model_key, pipeline_name, config, model_path)
+            self.fallbacks += 1
+            return None
+        hot.move_to_end(model_key)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(shard), _predict_in_process, model_key, pipeline_name, config, model_path, request_data, prediction_steps)
+        except ModelNotServableError as e:
+            logger.info(f"Model {model_key} will be served by the worker: {e}")
+            self._unservable.set(model_key, True)
+            hot.pop(model_key, None)
+            self.fallbacks += 1
+            return None
+        except BrokenProcessPool:
+            logger.error(f"Model serving process {shard} crashed, recreating it.")
+            self._reset_executor(shard)
+            self.fallbacks += 1
+            return None
+        self.served += 1
+        return result
+
+    def shutdown(self) -> None:
+        for shard, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executors[shard] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "hot_models": sum(len(hot) for hot in self._hot), "warming": len(self._warming), "unservable": len(self._unservable), "served": self.served, "fallbacks": self.fallbacks}
+
+
+model_server = ModelServer(
+    enabled=settings.MODEL_SERVING_ENABLED,
+    workers=settings.MODEL_SERVING_WORKERS,
+    max_models=settings.MODEL_SERVING_MAX_MODELS,
+    max_model_bytes=settings.MODEL_SERVING_MAX_MODEL_BYTES,
+)
@@ -0,0 +1,156 @@
+# api/src/azuraforge_api/services/pipeline_catalog.py
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import resources
+from typing import List, Dict, Any, Optional
+
+import redis
+
+from ..core.config import settings
+from ..core.redis_pool import redis_pools
+
+logger = logging.getLogger(__name__)
+
+REDIS_PIPELINES_KEY = "azuraforge:pipelines_catalog"
+# Kataloğu yazan taraf (worker) bu anahtarı INCR ederek veya aşağıdaki kanala
+# PUBLISH ederek API süreçlerindeki önbelleği geçersiz kılabilir.
+REDIS_PIPELINES_VERSION_KEY = f"{REDIS_PIPELINES_KEY}:version"
+REDIS_PIPELINES_CHANGED_CHANNEL = f"{REDIS_PIPELINES_KEY}:changed"
+# Keyspace bildirimleri Redis'te `notify-keyspace-events` ile açıksa hem hash'i
+# hem de sürüm anahtarını yakalar.
+KEYSPACE_PATTERN = f"__keyspace@*__:{REDIS_PIPELINES_KEY}*"
+
+# Liste görünümünde gönderilmeyen ağır alanlar.
+_DETAIL_ONLY_KEYS = ("default_config", "form_schema")
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Kataloğun belirli bir andaki, önceden hesaplanmış görünümleri."""
+    version: Optional[str]
+    pipelines: List[Dict[str, Any]]
+    summaries: List[Dict[str, Any]]
+    by_id: Dict[str, Dict[str, Any]]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+@lru_cache(maxsize=1)
+def _official_apps_map() -> Dict[str, Dict[str, Any]]:
+    """Paketle gelen official_apps.json süreç ömrü boyunca değişmez; bir kez okunur."""
+    try:
+        with resources.open_text("azuraforge_applications", "official_apps.json") as f:
+            return {app['id']: app for app in json.load(f)}
+    except Exception:
+        return {}
+
+
+def _build_snapshot(version: Optional[str], catalog_raw: Dict[str, str]) -> CatalogSnapshot:
+    official_apps_map = _official_apps_map()
+    pipelines = []
+    for data_str in catalog_raw.values():
+        pipeline = json.loads(data_str)
+        pipeline.update(official_apps_map.get(pipeline['id'], {}))
+        pipelines.append(pipeline)
+    pipelines.sort(key=lambda p: p.get('name', p['id']))
+    summaries = [{k: v for k, v in p.items() if k not in _DETAIL_ONLY_KEYS} for p in pipelines]
+    return CatalogSnapshot(version=version, pipelines=pipelines, summaries=summaries, by_id={p['id']: p for p in pipelines})
+
+
+class PipelineCatalogCache:
+    """
+    Pipeline kataloğunun süreç içi önbelleği.
+    Okumalar tamamen bellekten yapılır; Redis'e sadece katalog değiştiğinde
+    (bildirim geldiğinde) veya emniyet süresi dolduğunda gidilir.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self._refresh_seconds = refresh_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self._client: Optional[redis.Redis] = None
+
+    def _redis(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis_pools.sync_client(decode_responses=True)
+        return self._client
+
+    def invalidate(self) -> None:
+        """Bir sonraki okumada kataloğun yeniden yüklenmesini sağlar."""
+        self._stale = True
+
+    def _needs_refresh(self) -> bool:
+        snapshot = self._snapshot
+        return snapshot is None or self._stale or time.monotonic() - snapshot.loaded_at > self._refresh_seconds
+
+    def _refresh(self) -> None:
+        r = self._redis()
+        # Açık bir geçersiz kılma (hash değişikliği bildirimi) sürüm anahtarı artırılmamış olsa da
+        # her zaman yeniden okur; sürüm kısayolu sadece TTL kaynaklı yenilemeler içindir.
+        invalidated, self._stale = self._stale, False
+        version = r.get(REDIS_PIPELINES_VERSION_KEY)
+        current = self._snapshot
+        if not invalidated and current is not None and version is not None and version == current.version:
+            # Sürüm değişmemiş: sadece zaman damgasını yenile, yeniden ayrıştırma yapma.
+            self._snapshot = CatalogSnapshot(current.version, current.pipelines, current.summaries, current.by_id)
+            return
+        catalog_raw = r.hgetall(REDIS_PIPELINES_KEY)
+        if not catalog_raw:
+            # Worker henüz kataloğu yayınlamamış olabilir; boş sonucu önbelleğe almıyoruz.
+            self._stale = True
+            self._snapshot = None
+            return
+        self._snapshot = _build_snapshot(version, catalog_raw)
+
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        if self._needs_refresh():
+            with self._lock:
+                if self._needs_refresh():
+                    try:
+                        self._refresh()
+                    except Exception as e:
+                        # Redis erişilemezse eldeki (varsa) eski görünümle devam et.
+                        self._stale = True
+                        logger.error(f"Error fetching pipelines from Redis: {e}")
+        return self._snapshot
+
+    def list_pipelines(self) -> List[Dict[str, Any]]:
+        snapshot = self.snapshot()
+        return list(snapshot.summaries) if snapshot else []
+
+    def get_pipeline(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = self.snapshot()
+        return snapshot.by_id.get(pipeline_id) if snapshot else None
+
+    async def watch(self) -> None:
+        """
+        Katalog değişikliklerini dinler ve önbelleği geçersiz kılar.
+        Uygulamanın lifespan'i boyunca bir arka plan görevi olarak çalışır.
+        """
+        while True:
+            pubsub = redis_pools.async_client().pubsub()
+            try:
+                await pubsub.psubscribe(KEYSPACE_PATTERN)
+                await pubsub.subscribe(REDIS_PIPELINES_CHANGED_CHANNEL)
+                # Abone olmadan önce kaçırılmış olabilecek değişiklikleri de yakala.
+                self.invalidate()
+                async for message in pubsub.listen():
+                    if message.get("type") in ("message", "pmessage"):
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pipeline catalog watcher error: {e}")
+                self.invalidate()
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
+
+
+catalog_cache = PipelineCatalogCache(refresh_seconds=settings.PIPELINE_CATALOG_REFRESH_SECONDS)
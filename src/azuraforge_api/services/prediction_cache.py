@@ -0,0 +1,118 @@
+# api/src/azuraforge_api/services/prediction_cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.redis_pool import redis_pools
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_CACHE_PREFIX = "azuraforge:prediction_cache:"
+PREDICTION_INFLIGHT_PREFIX = "azuraforge:prediction_inflight:"
+
+
+def prediction_cache_key(experiment_id: str, model_version: str, request_data: Optional[List[Dict[str, Any]]], prediction_steps: Optional[int]) -> str:
+    """Deney id'si, model artefakt sürümü ve istek gövdesinin özeti."""
+    payload = json.dumps({"data": request_data, "prediction_steps": prediction_steps}, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{experiment_id}:{model_version}:{digest}"
+
+
+class PredictionCache:
+    """
+    Tahmin sonuçları için iki katmanlı önbellek (süreç içi LRU/TTL + opsiyonel paylaşılan Redis)
+    ve tek uçuş (single-flight) birleştirme: aynı anahtar için eşzamanlı N istek tek bir
+    hesaplamayı bekler.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shared: bool):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+        self.shared = shared
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await redis_pools.async_client().get(f"{PREDICTION_CACHE_PREFIX}{key}")
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"Prediction cache read error: {e}")
+            return None
+
+    async def _set_shared(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            await redis_pools.async_client().set(f"{PREDICTION_CACHE_PREFIX}{key}", json.dumps(value, default=str), ex=int(self._ttl))
+        except Exception as e:
+            logger.error(f"Prediction cache write error: {e}")
+
+    async def claim_inflight(self, key: str, task_id: str, timeout: float) -> str:
+        """
+        Süreçler arası tek uçuş: anahtarı bu task id için sahiplenir. Başka bir API süreci
+        aynı tahmini zaten başlatmışsa onun task id'sini döndürür.
+        """
+        if not self.shared:
+            return task_id
+        r = redis_pools.async_client(decode_responses=True)
+        inflight_key = f"{PREDICTION_INFLIGHT_PREFIX}{key}"
+        if await r.set(inflight_key, task_id, nx=True, ex=int(timeout) + 1):
+            return task_id
+        return await r.get(inflight_key) or task_id
+
+    async def release_inflight(self, key: str, task_id: str) -> None:
+        """
+        Sahibin hesaplaması bittiğinde paylaşılan tek uçuş anahtarını siler. Karşılaştır-ve-sil:
+        anahtar bu arada süresi dolup başka bir görev tarafından sahiplenildiyse ona dokunulmaz.
+        """
+        if not self.shared:
+            return
+        inflight_key = f"{PREDICTION_INFLIGHT_PREFIX}{key}"
+        try:
+            async with redis_pools.async_client(decode_responses=True).pipeline(transaction=True) as pipe:
+                await pipe.watch(inflight_key)
+                if await pipe.get(inflight_key) != task_id:
+                    return
+                pipe.multi()
+                pipe.delete(inflight_key)
+                await pipe.execute()
+        except Exception as e:
+            # WatchError dahil: anahtar değiştiyse artık bizim değildir; en kötü ihtimalle TTL ile düşer.
+            logger.error(f"Prediction inflight release error: {e}")
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        if self.shared:
+            cached = await self._get_shared(key)
+            if cached is not None:
+                self._local.set(key, cached)
+                return cached
+        result = await compute()
+        self._local.set(key, result)
+        if self.shared:
+            await self._set_shared(key, result)
+        return result
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Önbellekte varsa döndürür; yoksa aynı anahtar için tek bir hesaplama başlatır ve bekler."""
+        cached = self._local.get(key)
+        if cached is not None:
+            return cached
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            inflight = asyncio.ensure_future(self._compute_and_store(key, compute))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: bir isteğin iptali (istemci bağlantıyı kapattı) diğer bekleyenlerin hesaplamasını iptal etmesin.
+        return await asyncio.shield(inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._local), "hits": self._local.hits, "misses": self._local.misses, "inflight": len(self._inflight), "coalesced": self.coalesced}
+
+
+prediction_cache = PredictionCache(maxsize=settings.PREDICTION_CACHE_SIZE, ttl=settings.PREDICTION_CACHE_TTL_SECONDS, shared=settings.PREDICTION_CACHE_SHARED)
@@ -0,0 +1,231 @@
+# api/src/azuraforge_api/services/progress_hub.py
+
+import asyncio
+import json
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Set, Optional, Any, List, Tuple, Callable, Iterable
+
+import redis
+
+from ..core.config import settings
+from ..core.redis_pool import redis_pools
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_CHANNEL_PREFIX = "task-progress:"
+PROGRESS_STREAM_PREFIX = "task-progress-stream:"
+# Yayıncı, canlı mesaja stream kaydının kimliğini bu alanla ekler; hub bu alanı
+# ayıklayıp zarfın `event_id` alanına taşır.
+EVENT_ID_FIELD = "_event_id"
+_EVENT_ID_RE = re.compile(r"^\d+(-\d+)?$")
+
+# (event_id, serileştirilmiş zarf) çifti. event_id, stream kullanmayan eski
+# yayıncılardan gelen mesajlarda None olabilir.
+ProgressEvent = Tuple[Optional[str], str]
+
+
+def progress_stream_key(task_id: str) -> str:
+    return f"{PROGRESS_STREAM_PREFIX}{task_id}"
+
+
+def parse_event_id(event_id: str) -> Tuple[int, int]:
+    """Redis Stream kimliğini ('<ms>-<seq>') karşılaştırılabilir bir çifte çevirir."""
+    if not _EVENT_ID_RE.match(event_id):
+        raise ValueError(f"Invalid event id: {event_id}")
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _envelope(progress_data: Any, event_id: Optional[str]) -> str:
+    envelope = {"state": "PROGRESS", "details": progress_data}
+    if event_id:
+        envelope["event_id"] = event_id
+    return json.dumps(envelope)
+
+
+def publish_progress(r: redis.Redis, task_id: str, progress_data: Dict[str, Any]) -> str:
+    """
+    Yayıncı (worker) tarafı için: ilerlemeyi görev başına sınırlı stream'e yazar ve
+    stream kimliğiyle birlikte canlı kanala yayınlar. Stream kimliğini döndürür.
+    """
+    data = json.dumps(progress_data)
+    event_id = r.xadd(progress_stream_key(task_id), {"data": data}, maxlen=settings.PROGRESS_STREAM_MAXLEN, approximate=True)
+    event_id = event_id.decode("utf-8") if isinstance(event_id, bytes) else event_id
+    pipe = r.pipeline(transaction=False)
+    pipe.expire(progress_stream_key(task_id), settings.PROGRESS_STREAM_TTL_SECONDS)
+    pipe.publish(f"{PROGRESS_CHANNEL_PREFIX}{task_id}", json.dumps({**progress_data, EVENT_ID_FIELD: event_id}))
+    pipe.execute()
+    return event_id
+
+
+class ProgressSubscription:
+    """
+    Tek bir WebSocket/SSE istemcisinin ilerleme mesajı kuyruğu.
+    Kuyruk sınırlıdır; dolduğunda en eski mesaj atılır (drop-oldest), böylece
+    yavaş bir istemci ne hub'ı ne de diğer istemcileri yavaşlatır.
+    """
+
+    def __init__(self, task_id: str, maxsize: int):
+        self.task_id = task_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._floor: Optional[Tuple[int, int]] = None
+
+    def offer(self, event: ProgressEvent) -> int:
+        """Mesajı kuyruğa ekler ve yer açmak için atılan mesaj sayısını döndürür."""
+        dropped = 0
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                self.dropped += dropped
+                return dropped
+            except asyncio.QueueFull:
+                try:
+                    self.queue.get_nowait()
+                    dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+    def skip_through(self, event_id: str) -> None:
+        """Bu kimliğe kadar (dahil) olan, tekrar oynatmayla zaten gönderilmiş mesajları atlar."""
+        self._floor = parse_event_id(event_id)
+
+    async def get(self) -> ProgressEvent:
+        while True:
+            event_id, payload = await self.queue.get()
+            if event_id and self._floor and parse_event_id(event_id) <= self._floor:
+                continue
+            return event_id, payload
+
+
+class ProgressHub:
+    """
+    Süreç başına tek bir `PSUBSCRIBE task-progress:*` bağlantısı tutar ve gelen
+    mesajları ilgili görevin bellekteki abonelerine dağıtır. Binlerce izleyici
+    tek bir Redis bağlantısına mal olur ve teslimat yoklama (polling) yerine
+    push tabanlıdır.
+    """
+
+    def __init__(self, queue_size: int):
+        self._queue_size = queue_size
+        self._subscribers: Dict[str, Set[ProgressSubscription]] = defaultdict(set)
+        # Ayrıştırılmış ilerleme verisini doğrudan işleyen süreç içi gözlemciler (örn. sweep izleyicisi).
+        self._observers: Dict[str, Callable[[str, Any], None]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self.messages_received = 0
+        self.messages_delivered = 0
+        self.messages_dropped = 0
+
+    def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def subscribe(self, task_id: str) -> ProgressSubscription:
+        self.start()
+        subscription = ProgressSubscription(task_id, self._queue_size)
+        self._subscribers[task_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.task_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.task_id]
+
+    def observe(self, task_ids: Iterable[str], callback: Callable[[str, Any], None]) -> None:
+        """
+        Verilen görevlerin ilerleme mesajları için bir geri çağırım kaydeder.
+        Geri çağırım hub'ın dinleyici görevinde çalışır; hızlı olmalı ve veriyi değiştirmemelidir.
+        """
+        self.start()
+        for task_id in task_ids:
+            self._observers[task_id] = callback
+
+    def unobserve(self, task_ids: Iterable[str]) -> None:
+        for task_id in task_ids:
+            self._observers.pop(task_id, None)
+
+    async def replay(self, task_id: str, last_event_id: str) -> List[ProgressEvent]:
+        """
+        Görevin stream'inden `last_event_id`'den sonraki (hariç) kayıtları döndürür.
+        Canlı teslimatla çakışmamak için çağırmadan önce abone olunmalı ve ardından
+        son kimlik `skip_through` ile aboneliğe bildirilmelidir.
+        """
+        parse_event_id(last_event_id)
+        r = redis_pools.async_client()
+        response = await r.xread({progress_stream_key(task_id): last_event_id}, count=settings.PROGRESS_STREAM_MAXLEN)
+        events = []
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                event_id = entry_id.decode("utf-8")
+                events.append((event_id, _envelope(json.loads(fields[b"data"]), event_id)))
+        return events
+
+    def publish_local(self, task_id: str, progress_data: Any, event_id: Optional[str] = None) -> None:
+        """Bir ilerleme mesajını bu süreçteki tüm abonelere dağıtır."""
+        subscribers = self._subscribers.get(task_id)
+        if not subscribers:
+            return
+        # Mesaj her abone için tekrar değil, bir kez serileştirilir.
+        event = (event_id, _envelope(progress_data, event_id))
+        for subscription in list(subscribers):
+            self.messages_dropped += subscription.offer(event)
+        self.messages_delivered += len(subscribers)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "watched_tasks": len(self._subscribers),
+            "observed_tasks": len(self._observers),
+            "messages_received": self.messages_received,
+            "messages_delivered": self.messages_delivered,
+            "messages_dropped": self.messages_dropped,
+        }
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis_pools.async_client().pubsub()
+            try:
+                await pubsub.psubscribe(f"{PROGRESS_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    self.messages_received += 1
+                    task_id = message["channel"].decode("utf-8")[len(PROGRESS_CHANNEL_PREFIX):]
+                    if task_id not in self._subscribers and task_id not in self._observers:
+                        continue
+                    try:
+                        progress_data = json.loads(message["data"])
+                    except (ValueError, TypeError) as e:
+                        logger.error(f"Invalid progress message for task {task_id}: {e}")
+                        continue
+                    event_id = progress_data.pop(EVENT_ID_FIELD, None) if isinstance(progress_data, dict) else None
+                    observer = self._observers.get(task_id)
+                    if observer is not None:
+                        try:
+                            observer(task_id, progress_data)
+                        except Exception as e:
+                            logger.error(f"Progress observer error for task {task_id}: {e}")
+                    self.publish_local(task_id, progress_data, event_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Progress hub listener error, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+progress_hub = ProgressHub(queue_size=settings.PROGRESS_QUEUE_SIZE)
@@ -0,0 +1,133 @@
+# api/src/azuraforge_api/services/result_waiter.py
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from ..core.redis_pool import redis_pools
+
+logger = logging.getLogger(__name__)
+
+
+class ResultWaiter:
+    """
+    Celery Redis sonuç backend'i için tamamen asenkron sonuç bekleyici.
+    Backend bir sonucu kaydederken anahtarla aynı isimli kanala da PUBLISH eder;
+    süreç başına tek bir `PSUBSCRIBE <prefix>*` bağlantısı bu yayınları dinler ve
+    bekleyen isteklerin future'larını çözer. Bekleyen her tahmin bir thread değil,
+    sadece bir coroutine'e mal olur.
+    """
+
+    def __init__(self, celery_app: Any):
+        self._celery_app = celery_app
+        # task_id -> (future, bekleyen sayısı). Aynı göreve birden fazla istek bağlanabilir.
+        self._pending: Dict[str, Tuple[asyncio.Future, int]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    @property
+    def _backend(self) -> Any:
+        # Backend ilk kullanımda oluşturulur; modül import edilirken Celery'ye dokunulmaz.
+        return self._celery_app.backend
+
+    @property
+    def _key_prefix(self) -> str:
+        prefix = self._backend.task_keyprefix
+        return prefix.decode("utf-8") if isinstance(prefix, bytes) else prefix
+
+    def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _resolve(self, task_id: str, payload: Any) -> None:
+        entry = self._pending.get(task_id)
+        if entry is None or entry[0].done():
+            return
+        try:
+            meta = self._backend.decode_result(payload)
+        except Exception as e:
+            logger.error(f"Could not decode result for task {task_id}: {e}")
+            return
+        # Ara durumlar (STARTED, PROGRESS...) da yayınlanır; sadece nihai sonuçta çöz.
+        if meta.get("status") in ("SUCCESS", "FAILURE", "REVOKED"):
+            entry[0].set_result(meta)
+
+    async def _check_stored(self, task_ids) -> None:
+        """Abonelikten önce kaydedilmiş (yayını kaçırılmış) sonuçları doğrudan okur."""
+        task_ids = [t for t in task_ids if t in self._pending]
+        if not task_ids:
+            return
+        r = redis_pools.async_client()
+        payloads = await r.mget([self._backend.get_key_for_task(t) for t in task_ids])
+        for task_id, payload in zip(task_ids, payloads):
+            if payload is not None:
+                self._resolve(task_id, payload)
+
+    async def wait(self, task_id: str, timeout: float) -> Dict[str, Any]:
+        """
+        Görevin nihai sonuç meta verisini ({"status", "result", "traceback", ...}) bekler.
+        Süre dolarsa asyncio.TimeoutError fırlatır.
+        """
+        self.start()
+        future, waiters = self._pending.get(task_id, (None, 0))
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+        self._pending[task_id] = (future, waiters + 1)
+
+        async def wait_for_meta() -> Dict[str, Any]:
+            await self._subscribed.wait()
+            await self._check_stored([task_id])
+            # shield: bir bekleyenin zaman aşımı aynı görevi bekleyen diğerlerini iptal etmesin.
+            return await asyncio.shield(future)
+
+        try:
+            return await asyncio.wait_for(wait_for_meta(), timeout)
+        finally:
+            future, waiters = self._pending.get(task_id, (future, 1))
+            if waiters <= 1:
+                self._pending.pop(task_id, None)
+            else:
+                self._pending[task_id] = (future, waiters - 1)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis_pools.async_client().pubsub()
+            prefix = self._key_prefix
+            try:
+                await pubsub.psubscribe(f"{prefix}*")
+                self._subscribed.set()
+                # Yeniden bağlanma sırasında kaçırılmış olabilecek sonuçları yakala.
+                await self._check_stored(list(self._pending))
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    channel = channel.decode("utf-8") if isinstance(channel, bytes) else channel
+                    task_id = channel[len(prefix):]
+                    if task_id in self._pending:
+                        self._resolve(task_id, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Result waiter listener error, reconnecting: {e}")
+                self._subscribed.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
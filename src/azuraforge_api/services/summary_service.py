@@ -0,0 +1,257 @@
+# api/src/azuraforge_api/services/summary_service.py
+
+import argparse
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Float, Index, MetaData, String, Table, func, inspect, outerjoin, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from azuraforge_dbmodels import Experiment
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Deney satırlarının listeleme/sıralamada kullanılan alanlarının düz, tipli ve indeksli kopyası.
+# Deneyleri worker yazdığı için tablo veritabanı tetikleyicileriyle güncel tutulur; yazan süreçten bağımsızdır.
+# Tablo ve tetikleyiciler `azuraforge_api/migrations` altındaki alembic revizyonlarıyla kurulur (entrypoint.sh,
+# dbmodels migration'larından sonra). API başlarken sadece kontrol edilir; şema hazır değilse listeleme ve
+# sıralama özet tablosuna join yapmadan, alanları JSON blob'larından hesaplayarak çalışır.
+SUMMARY_TABLE = "experiment_summaries"
+summary_metadata = MetaData()
+
+# sütun -> (kaynak JSON sütunu, JSON yolu, tip)
+SUMMARY_FIELDS: Dict[str, Tuple[str, Tuple[str, ...], str]] = {
+    "ticker": ("config", ("data_sourcing", "ticker"), "text"),
+    "latitude": ("config", ("data_sourcing", "latitude"), "float"),
+    "longitude": ("config", ("data_sourcing", "longitude"), "float"),
+    "epochs": ("config", ("training_params", "epochs"), "float"),
+    "lr": ("config", ("training_params", "lr"), "float"),
+    "final_loss": ("results", ("final_loss",), "float"),
+    "r2_score": ("results", ("metrics", "r2_score"), "float"),
+    "mae": ("results", ("metrics", "mae"), "float"),
+    "accuracy": ("results", ("metrics", "accuracy"), "float"),
+    # Yeniden kullanılabilir deney araması (fingerprint_service) için; JSON yolu taramasının yerine.
+    "config_fingerprint": ("config", ("config_fingerprint",), "text"),
+}
+SORTABLE_METRICS = ("final_loss", "r2_score", "mae", "accuracy")
+
+experiment_summaries = Table(
+    SUMMARY_TABLE, summary_metadata,
+    Column("experiment_id", String, primary_key=True),
+    *[Column(name, String if kind == "text" else Float) for name, (_, _, kind) in SUMMARY_FIELDS.items()],
+    Column("updated_at", DateTime, server_default=func.current_timestamp()),
+    *[Index(f"ix_{SUMMARY_TABLE}_{name}", name) for name in (*SORTABLE_METRICS, "config_fingerprint")],
+)
+# Listeleme/sıralama sorgularının FROM'u. Özeti henüz doldurulmamış deneyler de listelenir (alanları boş).
+experiments_with_summary = outerjoin(Experiment, experiment_summaries, experiment_summaries.c.experiment_id == Experiment.id)
+
+_COLUMNS = ", ".join(["experiment_id", *SUMMARY_FIELDS, "updated_at"])
+_UPSERT_SET = ", ".join(f"{name} = excluded.{name}" for name in [*SUMMARY_FIELDS, "updated_at"])
+# Aynı anda kurulum yapan süreçlerin DDL'i çakışmasın diye (PostgreSQL advisory lock anahtarı).
+_DDL_LOCK_KEY = 712_004_020
+_SQLITE_TRIGGERS = ("azuraforge_experiment_summary_insert", "azuraforge_experiment_summary_update")
+_MIGRATE_COMMAND = "python -m azuraforge_api.migrations upgrade head"
+# Bu süreçte özet şemasının kullanılabilir olduğu doğrulandı mı (başlangıç kontrolü belirler).
+_schema_ready = False
+
+
+def is_ready() -> bool:
+    return _schema_ready
+
+
+def experiments_source():
+    """Listeleme/sıralama sorgularının FROM'u: şema hazırsa özet tablosuyla join, değilse sadece `experiments`."""
+    return experiments_with_summary if _schema_ready else Experiment.__table__
+
+
+def summary_from_blob(source: str, blob: Any) -> Dict[str, Any]:
+    """
+    Özet tablosu yokken kullanılan Python karşılığı: `source` ("config" veya "results") blob'undan türeyen
+    özet alanları. Tetikleyiciler gibi sayısal alanlarda sadece sayıları kabul eder.
+    """
+    values = {}
+    for name, (field_source, path, kind) in SUMMARY_FIELDS.items():
+        if field_source != source:
+            continue
+        value = blob
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if kind == "text":
+            values[name] = value if value is None or isinstance(value, str) else str(value)
+        else:
+            values[name] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+    return values
+
+
+def _pg_expression(row: str, source: str, path: Tuple[str, ...], kind: str) -> str:
+    extracted = f"{row}.{source} #>> '{{{','.join(path)}}}'"
+    return extracted if kind == "text" else f"azuraforge_try_float({extracted})"
+
+
+def _sqlite_expression(row: str, source: str, path: Tuple[str, ...], kind: str) -> str:
+    json_path = "$." + ".".join(path)
+    extracted = f"json_extract({row}.{source}, '{json_path}')"
+    if kind == "text":
+        return extracted
+    return f"CASE WHEN json_type({row}.{source}, '{json_path}') IN ('integer', 'real') THEN {extracted} END"
+
+
+def _select_values(dialect: str, row: str) -> str:
+    expression = _pg_expression if dialect == "postgresql" else _sqlite_expression
+    values = [f"{row}.id"] + [expression(row, source, path, kind) for source, path, kind in SUMMARY_FIELDS.values()]
+    return ", ".join(values + ["CURRENT_TIMESTAMP"])
+
+
+def _trigger_ddl(dialect: str):
+    """Deney eklendiğinde veya config/results değiştiğinde özet satırını güncelleyen tetikleyiciler."""
+    if dialect == "postgresql":
+        return [
+            "CREATE OR REPLACE FUNCTION azuraforge_try_float(value text) RETURNS double precision AS $$ "
+            "BEGIN RETURN value::double precision; EXCEPTION WHEN others THEN RETURN NULL; END; "
+            "$$ LANGUAGE plpgsql IMMUTABLE",
+            # Özet güncellenemese bile worker'ın yazması asla başarısız olmamalı.
+            "CREATE OR REPLACE FUNCTION azuraforge_refresh_experiment_summary() RETURNS trigger AS $$ "
+            f"BEGIN INSERT INTO {SUMMARY_TABLE} ({_COLUMNS}) SELECT {_select_values(dialect, 'NEW')} "
+            f"ON CONFLICT (experiment_id) DO UPDATE SET {_UPSERT_SET}; RETURN NEW; "
+            "EXCEPTION WHEN others THEN RAISE WARNING 'experiment summary refresh failed: %', SQLERRM; RETURN NEW; END; "
+            "$$ LANGUAGE plpgsql",
+            "DROP TRIGGER IF EXISTS azuraforge_experiment_summary ON experiments",
+            "CREATE TRIGGER azuraforge_experiment_summary AFTER INSERT OR UPDATE OF config, results ON experiments "
+            "FOR EACH ROW EXECUTE FUNCTION azuraforge_refresh_experiment_summary()",
+        ]
+    # SQLite'ta CREATE OR REPLACE yok; kurulum önce DROP eder. Metinler sqlite_master'daki kayıtla karşılaştırılır.
+    statement = f"INSERT OR REPLACE INTO {SUMMARY_TABLE} ({_COLUMNS}) SELECT {_select_values(dialect, 'NEW')};"
+    insert_trigger, update_trigger = _SQLITE_TRIGGERS
+    return [
+        f"CREATE TRIGGER {insert_trigger} AFTER INSERT ON experiments BEGIN {statement} END",
+        f"CREATE TRIGGER {update_trigger} AFTER UPDATE OF config, results ON experiments BEGIN {statement} END",
+    ]
+
+
+def _schema_version(statements) -> str:
+    return "azuraforge-summary:" + hashlib.sha1("\n".join(statements).encode("utf-8")).hexdigest()[:16]
+
+
+async def _pg_schema_is_current(conn, version: str) -> bool:
+    """Tetikleyici, bu sürümün fonksiyonuyla zaten kuruluysa True (fonksiyon yorumunda sürüm tutulur)."""
+    current = await conn.scalar(text(
+        "SELECT obj_description(p.oid, 'pg_proc') FROM pg_trigger t JOIN pg_proc p ON p.oid = t.tgfoid "
+        "WHERE t.tgname = 'azuraforge_experiment_summary' AND NOT t.tgisinternal"
+    ))
+    return current == version
+
+
+async def _schema_problem(conn) -> Optional[str]:
+    """Özet şeması eksik veya eskiyse nedenini, güncelse None döndürür. Sadece okur."""
+    if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(SUMMARY_TABLE)):
+        return f"missing table '{SUMMARY_TABLE}'"
+    statements = _trigger_ddl(conn.dialect.name)
+    if conn.dialect.name == "postgresql":
+        current = await _pg_schema_is_current(conn, _schema_version(statements))
+    else:
+        rows = await conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN (:insert, :update)"),
+                                  {"insert": _SQLITE_TRIGGERS[0], "update": _SQLITE_TRIGGERS[1]})
+        current = sorted(row.sql for row in rows) == sorted(statements)
+    return None if current else "missing or outdated triggers"
+
+
+async def check_summary_schema(engine: AsyncEngine) -> bool:
+    """
+    API başlangıcında çağrılır: DDL çalıştırmaz, sadece tablo ve tetikleyicilerin güncel olduğunu doğrular.
+    Değilse (veya doğrulanamazsa) uyarı loglar ve False döner; bu süreçte sorgular özet tablosunu kullanmaz.
+    """
+    global _schema_ready
+    try:
+        async with engine.connect() as conn:
+            problem = await _schema_problem(conn)
+    except Exception as e:
+        logger.warning(f"Could not verify the experiment summary schema, summaries are computed from JSON: {e}")
+        problem = "unverifiable"
+    else:
+        if problem:
+            logger.warning(f"Experiment summary schema is not installed ({problem}), summaries are computed from JSON; run `{_MIGRATE_COMMAND}`.")
+    _schema_ready = problem is None
+    return _schema_ready
+
+
+async def install_summary_schema(engine: AsyncEngine) -> bool:
+    """
+    Alembic kullanılmayan yerel kurulumlar, testler ve benchmark'lar için: özet tablosunu, indekslerini ve
+    tetikleyicilerini güncel kod tanımından kurar; değişmiş tetikleyici gövdelerini yeniler. Üretimde şema
+    `azuraforge_api/migrations` revizyonlarıyla kurulur. Şema zaten güncelse DDL çalıştırılmaz; kurulum yapıldıysa True döner.
+    """
+    global _schema_ready
+    async with engine.begin() as conn:
+        dialect = conn.dialect.name
+        statements = _trigger_ddl(dialect)
+        if dialect == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _DDL_LOCK_KEY})
+        if await _schema_problem(conn) is None:
+            _schema_ready = True
+            return False
+        if dialect == "postgresql":
+            statements = statements + [f"COMMENT ON FUNCTION azuraforge_refresh_experiment_summary() IS '{_schema_version(statements)}'"]
+        else:
+            statements = [f"DROP TRIGGER IF EXISTS {name}" for name in _SQLITE_TRIGGERS] + statements
+        await conn.run_sync(summary_metadata.create_all, checkfirst=True)
+        for statement in statements:
+            await conn.execute(text(statement))
+    _schema_ready = True
+    return True
+
+
+async def backfill_experiment_summaries(db: AsyncSession, batch_size: int = 1000, only_missing: bool = True) -> int:
+    """
+    Mevcut deneylerin özet satırlarını id üzerinde keyset ile, parça parça doldurur.
+    `only_missing=False` ile tüm satırlar yeniden hesaplanır. İşlenen satır sayısını döndürür.
+    """
+    dialect = db.get_bind().dialect.name
+    missing = f"AND NOT EXISTS (SELECT 1 FROM {SUMMARY_TABLE} s WHERE s.experiment_id = e.id)" if only_missing else ""
+    select_ids = text(f"SELECT e.id FROM experiments e WHERE e.id > :last_id {missing} ORDER BY e.id LIMIT :limit")
+    upsert = text(
+        f"INSERT INTO {SUMMARY_TABLE} ({_COLUMNS}) SELECT {_select_values(dialect, 'e')} FROM experiments e "
+        f"WHERE e.id >= :first_id AND e.id <= :last_id {missing} "
+        f"ON CONFLICT (experiment_id) DO UPDATE SET {_UPSERT_SET}"
+    )
+    processed, last_id = 0, ""
+    while True:
+        ids = (await db.execute(select_ids, {"last_id": last_id, "limit": batch_size})).scalars().all()
+        if not ids:
+            return processed
+        await db.execute(upsert, {"first_id": ids[0], "last_id": ids[-1]})
+        await db.commit()
+        processed += len(ids); last_id = ids[-1]
+
+
+async def run_startup_backfill(session_factory) -> None:
+    """Uygulama başlarken özeti eksik deneyleri arka planda doldurur."""
+    try:
+        async with session_factory() as db:
+            processed = await backfill_experiment_summaries(db, batch_size=settings.EXPERIMENT_SUMMARY_BACKFILL_BATCH_SIZE)
+        if processed:
+            logger.info(f"Backfilled {processed} experiment summaries.")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Experiment summary backfill failed: {e}")
+
+
+if __name__ == "__main__":
+    # Eksik özetleri doldurur (--rebuild ile tümünü yeniden hesaplar). Şemayı migration'lar kurar.
+    from ..database import SessionLocal, dispose_engine, get_engine
+
+    parser = argparse.ArgumentParser(prog="python -m azuraforge_api.services.summary_service", description="Backfill experiment summaries.")
+    parser.add_argument("--rebuild", action="store_true", help="Sadece eksikleri değil tüm özetleri yeniden hesapla")
+    args = parser.parse_args()
+
+    async def main() -> None:
+        if not await check_summary_schema(get_engine()):
+            raise SystemExit(f"Experiment summary schema is not installed; run `{_MIGRATE_COMMAND}` first.")
+        async with SessionLocal() as db:
+            print(f"Backfilled {await backfill_experiment_summaries(db, batch_size=settings.EXPERIMENT_SUMMARY_BACKFILL_BATCH_SIZE, only_missing=not args.rebuild)} experiment summaries.")
+        await dispose_engine()
+
+    asyncio.run(main())
@@ -0,0 +1,220 @@
+# api/src/azuraforge_api/services/sweep_service.py
+
+import asyncio
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable, Set
+
+from ..core.exceptions import InvalidSweepException
+from .progress_hub import progress_hub
+
+logger = logging.getLogger(__name__)
+
+SWEEP_STRATEGIES = ("grid", "random", "lhs", "halving", "hyperband")
+# Karşılaştırmalardan önce tip kontrolü yapılan alanlar; None sadece opsiyonel alanlarda kabul edilir.
+_INT_FIELDS = ("budget", "seed", "eta", "min_epochs", "max_epochs")
+_STR_FIELDS = ("strategy", "metric", "mode")
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    """
+    Bir batch için seçilen sweep stratejisi. Deney config'indeki `sweep` anahtarından okunur:
+    {"strategy": "halving", "budget": 40, "metric": "loss", "mode": "min", "eta": 3, "min_epochs": 2}
+    """
+    strategy: str = "grid"
+    budget: Optional[int] = None
+    seed: Optional[int] = None
+    metric: str = "loss"
+    mode: str = "min"
+    eta: int = 3
+    min_epochs: int = 1
+    max_epochs: Optional[int] = None
+
+    @property
+    def is_adaptive(self) -> bool:
+        return self.strategy in ("halving", "hyperband")
+
+
+def parse_sweep_spec(raw: Optional[Dict[str, Any]]) -> SweepSpec:
+    if not raw:
+        return SweepSpec()
+    if not isinstance(raw, dict):
+        raise InvalidSweepException("'sweep' must be an object.")
+    unknown = set(raw) - set(SweepSpec.__dataclass_fields__)
+    if unknown:
+        raise InvalidSweepException(f"Unknown sweep option(s): {', '.join(sorted(unknown))}.")
+    try:
+        spec = SweepSpec(**raw)
+    except TypeError as e:
+        raise InvalidSweepException(str(e))
+    for name in _INT_FIELDS:
+        value = getattr(spec, name)
+        # bool, int'in alt sınıfıdır; True/False bütçe veya eta olarak kabul edilmemeli.
+        if not (value is None and SweepSpec.__dataclass_fields__[name].default is None) and (not isinstance(value, int) or isinstance(value, bool)):
+            raise InvalidSweepException(f"Sweep '{name}' must be an integer.")
+    for name in _STR_FIELDS:
+        if not isinstance(getattr(spec, name), str):
+            raise InvalidSweepException(f"Sweep '{name}' must be a string.")
+    if spec.strategy not in SWEEP_STRATEGIES:
+        raise InvalidSweepException(f"Unknown sweep strategy '{spec.strategy}'. Expected one of: {', '.join(SWEEP_STRATEGIES)}.")
+    if spec.strategy != "grid" and (spec.budget is None or spec.budget < 1):
+        raise InvalidSweepException(f"Sweep strategy '{spec.strategy}' requires a positive integer 'budget'.")
+    if spec.mode not in ("min", "max"):
+        raise InvalidSweepException("Sweep 'mode' must be 'min' or 'max'.")
+    if spec.eta < 2 or spec.min_epochs < 1:
+        raise InvalidSweepException("Sweep 'eta' must be >= 2 and 'min_epochs' >= 1.")
+    return spec
+
+
+def num_trials(spec: SweepSpec, total_combinations: int) -> int:
+    """Stratejinin başlatacağı deneme sayısı. Rastgele ve LHS örnekleme tekrarsızdır, bu yüzden ızgarayla sınırlıdır."""
+    if spec.strategy == "grid":
+        return total_combinations
+    return min(spec.budget, total_combinations)
+
+
+def _decode_index(index: int, sizes: List[int]) -> Tuple[int, ...]:
+    """Kartezyen çarpımdaki sıra numarasını, her parametre için değer indeksine çevirir."""
+    digits = []
+    for size in reversed(sizes):
+        index, digit = divmod(index, size)
+        digits.append(digit)
+    return tuple(reversed(digits))
+
+
+def sample_values(spec: SweepSpec, param_values: List[list]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Rastgele / LHS stratejileri için parametre değer demetlerini tembel olarak üretir.
+    Izgara hiçbir zaman bellekte oluşturulmaz.
+    """
+    rng = random.Random(spec.seed)
+    sizes = [len(values) for values in param_values]
+    n = num_trials(spec, math.prod(sizes))
+    if spec.strategy == "lhs":
+        # Her parametre için n tabaka; tabakalar parametreler arasında bağımsız karıştırılır.
+        # Değer sayısı n'den az olan parametrelerde tabakalar çakışabilir; tekrar eden demet yerine
+        # henüz seçilmemiş rastgele bir kombinasyon alınır (n ızgarayla sınırlı olduğundan her zaman vardır).
+        strata = []
+        for size in sizes:
+            column = [min(size - 1, int((i + rng.random()) / n * size)) for i in range(n)]
+            rng.shuffle(column)
+            strata.append(column)
+        seen: Set[Tuple[int, ...]] = set()
+        for i in range(n):
+            digits = tuple(strata[p][i] for p in range(len(sizes)))
+            while digits in seen:
+                digits = _decode_index(rng.randrange(math.prod(sizes)), sizes)
+            seen.add(digits)
+            yield tuple(values[digit] for values, digit in zip(param_values, digits))
+        return
+    # random / halving / hyperband: çarpım uzayından tekrarsız örnekleme (range üzerinde, O(n) bellek).
+    for index in rng.sample(range(math.prod(sizes)), n):
+        yield tuple(values[digit] for values, digit in zip(param_values, _decode_index(index, sizes)))
+
+
+class EarlyStopper:
+    """
+    Asenkron successive halving (ASHA) ile zayıf denemeleri erken durdurur.
+    Bir deneme bir basamağa (min_epochs * eta^k) ulaştığında metriği o basamakta
+    kaydedilenlerle karşılaştırılır; en iyi 1/eta içinde değilse durdurulur.
+    Hyperband modunda denemeler farklı başlangıç basamaklarına sahip parantezlere dağıtılır.
+    """
+
+    def __init__(self, spec: SweepSpec, task_ids: List[str]):
+        self.spec = spec
+        self.live: Set[str] = set(task_ids)
+        self.stopped: Set[str] = set()
+        brackets = 1
+        if spec.strategy == "hyperband" and spec.max_epochs:
+            brackets = max(1, int(math.log(max(spec.max_epochs / spec.min_epochs, 1), spec.eta)) + 1)
+        self._bracket = {task_id: i % brackets for i, task_id in enumerate(task_ids)}
+        self._next_rung: Dict[str, int] = {task_id: spec.min_epochs * spec.eta ** self._bracket[task_id] for task_id in task_ids}
+        self._rung_results: Dict[Tuple[int, int], List[float]] = {}
+
+    def _better(self, a: float, b: float) -> bool:
+        return a < b if self.spec.mode == "min" else a > b
+
+    def observe(self, task_id: str, progress: Any) -> bool:
+        """Bir ilerleme mesajını işler. Deneme durdurulmalıysa True döner."""
+        if task_id not in self.live or not isinstance(progress, dict):
+            return False
+        epoch, value = progress.get("epoch"), progress.get(self.spec.metric)
+        if not isinstance(epoch, (int, float)) or not isinstance(value, (int, float)) or math.isnan(value):
+            return False
+        rung = self._next_rung[task_id]
+        if epoch < rung:
+            return False
+        key = (self._bracket[task_id], rung)
+        results = self._rung_results.setdefault(key, [])
+        results.append(value)
+        self._next_rung[task_id] = rung * self.spec.eta
+        if len(results) < self.spec.eta:
+            return False
+        keep = max(1, len(results) // self.spec.eta)
+        cutoff = sorted(results, reverse=self.spec.mode == "max")[keep - 1]
+        if self._better(cutoff, value):
+            self.live.discard(task_id)
+            self.stopped.add(task_id)
+            return True
+        return False
+
+    def finished(self, task_ids: List[str]) -> None:
+        self.live.difference_update(task_ids)
+
+
+class SweepScheduler:
+    """
+    Adaptif sweep'lerin izleyicilerini API'nin olay döngüsünde çalıştırır.
+    İzleyiciler bu süreçte kalır; sweep'i gönderen API süreci erken durdurma kararlarını verir.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._monitors: Dict[str, asyncio.Future] = {}
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def start_monitor(self, batch_id: str, stopper: EarlyStopper, stop_trial: Callable[[str], None], finished_trials: Callable[[List[str]], List[str]], poll_seconds: float) -> bool:
+        """
+        İzleyiciyi `bind_loop` ile bağlanan olay döngüsünde başlatır; çağıran o döngüde veya başka bir thread'de
+        olabilir. Bağlı (açık) bir döngü yoksa False döner.
+        """
+        if self._loop is None or self._loop.is_closed():
+            logger.warning(f"No event loop bound; sweep {batch_id} will run without early stopping.")
+            return False
+        self._monitors[batch_id] = asyncio.run_coroutine_threadsafe(self._monitor(batch_id, stopper, stop_trial, finished_trials, poll_seconds), self._loop)
+        return True
+
+    async def _monitor(self, batch_id: str, stopper: EarlyStopper, stop_trial: Callable[[str], None], finished_trials: Callable[[List[str]], List[str]], poll_seconds: float) -> None:
+        task_ids = list(stopper.live)
+        pending_stops: Set[asyncio.Task] = set()
+
+        def on_progress(task_id: str, progress: Any) -> None:
+            if stopper.observe(task_id, progress):
+                logger.info(f"Sweep {batch_id}: stopping trial {task_id} early.")
+                # Revoke çağrısı broker'a gider; olay döngüsünü bloklamaması için thread'de çalışır.
+                stop = asyncio.get_running_loop().create_task(asyncio.to_thread(stop_trial, task_id))
+                pending_stops.add(stop)
+                stop.add_done_callback(pending_stops.discard)
+
+        progress_hub.observe(task_ids, on_progress)
+        try:
+            while stopper.live:
+                await asyncio.sleep(poll_seconds)
+                stopper.finished(await asyncio.to_thread(finished_trials, list(stopper.live)))
+            logger.info(f"Sweep {batch_id} finished; {len(stopper.stopped)} trial(s) stopped early.")
+        finally:
+            progress_hub.unobserve(task_ids)
+            self._monitors.pop(batch_id, None)
+
+    async def stop(self) -> None:
+        for future in list(self._monitors.values()):
+            future.cancel()
+        self._monitors.clear()
+
+
+sweep_scheduler = SweepScheduler()
@@ -1,43 +1,75 @@
 # api/src/azuraforge_api/services/user_service.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from azuraforge_dbmodels import User
 from ..schemas import UserCreate
-from ..core.password import get_password_hash, verify_password
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.password import get_password_hash_async, verify_password_async
 
 # --- DEĞİŞİKLİK: Kullanılmayan import kaldırıldı ---
 # from .config import settings 
 
-def get_user_by_username(db: Session, username: str) -> User | None:
+# Token doğrulamasında kullanılan kullanıcı önbelleği (username -> session'dan ayrılmış User).
+# Kullanıcı değiştiğinde invalidate_cached_user ile açıkça temizlenir; TTL diğer API
+# süreçlerindeki kopyaların ne kadar eski kalabileceğinin üst sınırıdır.
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
     """Verilen kullanıcı adına göre kullanıcıyı bulur."""
-    return db.query(User).filter(User.username == username).first()
+    return await db.scalar(select(User).where(User.username == username).limit(1))
+
+async def get_cached_user(db: AsyncSession, username: str) -> User | None:
+    """
+    Kullanıcıyı önbellekten döndürür; yoksa veritabanından okuyup önbelleğe alır.
+    Bulunamayan kullanıcılar önbelleğe alınmaz.
+    """
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+    user = await get_user_by_username(db, username)
+    if user is not None:
+        # Nesne istek session'ı kapandıktan sonra da okunabilsin diye ayrılır.
+        db.expunge(user)
+        _user_cache.set(username, user)
+    return user
+
+def invalidate_cached_user(username: str | None = None) -> None:
+    """Bir kullanıcının (veya username verilmezse tüm kullanıcıların) önbellek kaydını siler."""
+    if username is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(username)
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Yeni bir kullanıcı oluşturur."""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(username=user.username, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    invalidate_cached_user(db_user.username)
     return db_user
 
-def authenticate_user(db: Session, username: str, password: str) -> User | None:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> User | None:
     """Kullanıcıyı doğrular."""
-    user = get_user_by_username(db, username)
+    user = await get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
-def create_default_user_if_not_exists(db: Session):
+async def create_default_user_if_not_exists(db: AsyncSession):
     """
     Eğer sistemde hiç kullanıcı yoksa, varsayılan bir kullanıcı oluşturur.
     Bu, ilk kurulum için kullanışlıdır.
     """
     print("API: Varsayılan kullanıcı kontrol ediliyor...")
     # Bu fonksiyonda settings'e ihtiyaç yoktu, o yüzden import satırını tamamen kaldırdık.
-    if db.query(User).count() == 0:
+    # COUNT(*) yerine tek satırlık varlık kontrolü: tablo büyüdükçe başlangıcı yavaşlatmaz.
+    if await db.scalar(select(User.id).limit(1)) is None:
         default_username = "admin"
         default_password = "DefaultPassword123!" 
         
@@ -47,7 +79,7 @@ def create_default_user_if_not_exists(db: Session):
         print(f"API: Şifre: {default_password}")
 
         user_in = UserCreate(username=default_username, password=default_password)
-        create_user(db, user_in)
+        await create_user(db, user_in)
         print("API: Varsayılan kullanıcı başarıyla oluşturuldu.")
     else:
-        print("API: Mevcut kullanıcılar bulundu, yeni kullanıcı oluşturulmadı.")
\ No newline at end of file
+        print("API: Mevcut kullanıcılar bulundu, yeni kullanıcı oluşturulmadı.")
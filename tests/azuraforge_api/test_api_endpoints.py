@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient, ASGITransport
-from unittest.mock import patch
+from unittest.mock import patch, ANY
 
 # Test edilecek FastAPI uygulamasını import et
 from azuraforge_api.main import app
@@ -42,14 +42,774 @@ async def test_get_all_pipelines(mock_get_pipelines, async_client: AsyncClient):
     mock_get_pipelines.assert_called_once()
 
 
+# === Kimliği doğrulanmış endpoint testleri ===
+from datetime import datetime
+from azuraforge_api.core import security
+from azuraforge_api.services import experiment_service
+
+@pytest.fixture(autouse=True)
+def reset_summary_schema_state():
+    """Özet şemasının hazır olduğu bilgisi süreç geneli tutulur; testler arasında sızmasın."""
+    from azuraforge_api.services import summary_service
+    with patch.object(summary_service, "_schema_ready", False):
+        yield
+
+@pytest.fixture
+async def authed_client():
+    """get_current_user bağımlılığını sahte bir kullanıcıyla değiştirir."""
+    app.dependency_overrides[security.get_current_user] = lambda: {"username": "tester"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(security.get_current_user, None)
+
+@patch('azuraforge_api.services.experiment_service.list_experiments')
+async def test_list_experiments_paginated(mock_list, authed_client: AsyncClient):
+    """/experiments sayfayı liste olarak, sonraki imleci başlıkta döndürmelidir."""
+    mock_list.return_value = {"items": [{"experiment_id": "exp-1"}], "next_cursor": "abc"}
+
+    response = await authed_client.get("/api/v1/experiments", params={"limit": 1, "fields": "experiment_id"})
+
+    assert response.status_code == 200
+    assert response.json() == [{"experiment_id": "exp-1"}]
+    assert response.headers["X-Next-Cursor"] == "abc"
+    mock_list.assert_called_once_with(ANY, limit=1, cursor=None, fields="experiment_id")
+
+async def test_experiment_cursor_roundtrip():
+    """Keyset imleci kodlanıp çözüldüğünde aynı (created_at, id) çiftini vermelidir."""
+    created_at = datetime(2024, 5, 1, 12, 30, 15)
+    cursor = experiment_service.encode_experiment_cursor(created_at, "exp-42")
+    assert experiment_service.decode_experiment_cursor(cursor) == (created_at, "exp-42")
+
+@patch('azuraforge_api.services.experiment_service.export_experiments')
+async def test_export_experiments_ndjson(mock_export, authed_client: AsyncClient):
+    """/experiments/export yanıtı servisten gelen satırları NDJSON olarak akıtmalıdır."""
+    mock_export.return_value = iter(['{"experiment_id": "a"}\n', '{"experiment_id": "b"}\n'])
+
+    response = await authed_client.get("/api/v1/experiments/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.splitlines() == ['{"experiment_id": "a"}', '{"experiment_id": "b"}']
+    mock_export.assert_called_once_with(export_format="ndjson", fields=None)
+
+async def test_pipeline_catalog_cache_serves_from_memory():
+    """Katalog bir kez yüklendikten sonra geçersiz kılınana kadar Redis'e gidilmemelidir."""
+    import json
+    from unittest.mock import MagicMock
+    from azuraforge_api.services.pipeline_catalog import PipelineCatalogCache
+
+    fake_redis = MagicMock()
+    fake_redis.get.return_value = None
+    fake_redis.hgetall.return_value = {"p1": json.dumps({"id": "p1", "name": "P1", "default_config": {"a": 1}})}
+    cache = PipelineCatalogCache(refresh_seconds=300)
+    cache._client = fake_redis
+
+    assert cache.list_pipelines() == [{"id": "p1", "name": "P1"}]
+    assert cache.get_pipeline("p1")["default_config"] == {"a": 1}
+    assert fake_redis.hgetall.call_count == 1
+
+    cache.invalidate()
+    cache.list_pipelines()
+    assert fake_redis.hgetall.call_count == 2
+
+async def test_pipeline_catalog_invalidate_rereads_when_version_unchanged():
+    """Geçersiz kılma sürüm anahtarı değişmemiş olsa da kataloğu yeniden okumalı; TTL yenilemesi ise sürümle kısalır."""
+    import json
+    from unittest.mock import MagicMock
+    from azuraforge_api.services.pipeline_catalog import PipelineCatalogCache
+
+    fake_redis = MagicMock()
+    fake_redis.get.return_value = "v1"
+    fake_redis.hgetall.return_value = {"p1": json.dumps({"id": "p1", "name": "P1"})}
+    cache = PipelineCatalogCache(refresh_seconds=0)
+    cache._client = fake_redis
+    assert cache.list_pipelines() == [{"id": "p1", "name": "P1"}]
+
+    # TTL doldu, sürüm aynı: hash yeniden okunmaz.
+    cache.list_pipelines()
+    assert fake_redis.hgetall.call_count == 1
+
+    fake_redis.hgetall.return_value = {"p2": json.dumps({"id": "p2", "name": "P2"})}
+    cache.invalidate()
+    assert cache.list_pipelines() == [{"id": "p2", "name": "P2"}]
+    assert fake_redis.hgetall.call_count == 2
+
+@patch('azuraforge_api.core.redis_pool.redis_pools.stats')
+async def test_redis_pool_stats(mock_stats, authed_client: AsyncClient):
+    """/system/redis paylaşılan havuz istatistiklerini döndürmelidir."""
+    mock_stats.return_value = {"sync": {"max_connections": 50, "in_use": 1, "idle": 2, "created": 3}}
+
+    response = await authed_client.get("/api/v1/system/redis")
+
+    assert response.status_code == 200
+    assert response.json()["pools"]["sync"]["in_use"] == 1
+
+async def test_progress_subscription_drops_oldest():
+    """Kuyruk dolduğunda en eski ilerleme mesajı atılmalı, en yeniler korunmalıdır."""
+    from azuraforge_api.services.progress_hub import ProgressSubscription
+
+    subscription = ProgressSubscription("task-1", maxsize=2)
+    dropped = sum(subscription.offer((f"{i}-0", f"m{i}")) for i in range(4))
+
+    assert dropped == 2
+    assert [await subscription.get(), await subscription.get()] == [("2-0", "m2"), ("3-0", "m3")]
+
+async def test_progress_subscription_skips_replayed_events():
+    """Tekrar oynatmayla gönderilmiş mesajlar canlı kuyrukta tekrar teslim edilmemelidir."""
+    from azuraforge_api.services.progress_hub import ProgressSubscription
+
+    subscription = ProgressSubscription("task-1", maxsize=10)
+    for event in [("100-0", "a"), ("100-1", "b"), (None, "legacy"), ("101-0", "c")]:
+        subscription.offer(event)
+    subscription.skip_through("100-1")
+
+    assert await subscription.get() == (None, "legacy")
+    assert await subscription.get() == ("101-0", "c")
+
 @patch('azuraforge_api.services.experiment_service.start_experiment')
-async def test_create_experiment_success(mock_start_experiment, async_client: AsyncClient):
+async def test_create_experiment_success(mock_start_experiment, authed_client: AsyncClient):
     """Bir deney başarıyla gönderildiğinde 202 kodunu ve task_id'yi döndürdüğünü test eder."""
     test_config = {"pipeline_name": "stock_predictor", "data_sourcing": {"ticker": "GOOG"}}
     mock_start_experiment.return_value = {"message": "Experiment submitted", "task_id": "fake-task-id-123"}
 
-    response = await async_client.post("/api/v1/experiments", json=test_config)
+    response = await authed_client.post("/api/v1/experiments", json=test_config)
     
     assert response.status_code == 202 # Accepted
     assert response.json()["task_id"] == "fake-task-id-123"
-    mock_start_experiment.assert_called_once_with(test_config)
\ No newline at end of file
+    mock_start_experiment.assert_called_once_with(ANY, test_config, force=False)
+
+async def test_sweep_combinations_share_unchanged_subtrees():
+    """Sweep kombinasyonları değişmeyen alt ağaçları kopyalamadan paylaşmalı ve orijinal config'i bozmamalıdır."""
+    config = {"data_sourcing": {"ticker": "AAPL,MSFT"}, "training_params": {"epochs": "10,20", "lr": 0.01}, "model_params": {"hidden": 64}}
+    varying = experiment_service._find_varying_params(config)
+
+    combinations = list(experiment_service._generate_config_combinations(config, varying))
+
+    assert experiment_service._count_combinations(varying) == len(combinations) == 4
+    assert {(c["data_sourcing"]["ticker"], c["training_params"]["epochs"]) for c in combinations} == {("AAPL", 10.0), ("AAPL", 20.0), ("MSFT", 10.0), ("MSFT", 20.0)}
+    assert all(c["model_params"] is config["model_params"] for c in combinations)
+    assert config["training_params"]["epochs"] == "10,20"
+
+async def test_sweep_spec_rejects_wrongly_typed_options():
+    """Sayısal olmayan eta, bool bütçe veya metin olmayan mode 400 dönen InvalidSweepException üretmelidir."""
+    from azuraforge_api.core.exceptions import InvalidSweepException
+    from azuraforge_api.services import sweep_service
+
+    for raw in ({"strategy": "halving", "budget": 9, "eta": "3"}, {"strategy": "random", "budget": True},
+                {"strategy": "halving", "budget": 9, "min_epochs": 1.5}, {"mode": ["min"]}, {"strategy": None}):
+        with pytest.raises(InvalidSweepException) as exc_info:
+            sweep_service.parse_sweep_spec(raw)
+        assert exc_info.value.status_code == 400
+    assert sweep_service.parse_sweep_spec({"strategy": "grid", "seed": None}).budget is None
+
+async def test_random_sweep_samples_budget_without_replacement():
+    """Rastgele sweep, ızgaradan bütçe kadar farklı kombinasyon örneklemelidir."""
+    from azuraforge_api.services import sweep_service
+
+    spec = sweep_service.parse_sweep_spec({"strategy": "random", "budget": 6, "seed": 7})
+    samples = list(sweep_service.sample_values(spec, [[1, 2, 3], ["a", "b", "c", "d"]]))
+
+    assert len(samples) == 6
+    assert len(set(samples)) == 6
+
+async def test_lhs_sweep_is_capped_at_grid_and_has_no_duplicates():
+    """LHS, bütçe ızgaradan büyükse ızgarayla sınırlanmalı ve aynı kombinasyonu iki kez üretmemelidir."""
+    from azuraforge_api.services import sweep_service
+
+    grid = [[1, 2, 3], ["a", "b"]]
+    spec = sweep_service.parse_sweep_spec({"strategy": "lhs", "budget": 50, "seed": 3})
+    assert sweep_service.num_trials(spec, 6) == 6
+    assert sorted(sweep_service.sample_values(spec, grid)) == sorted((x, y) for x in grid[0] for y in grid[1])
+
+    for seed in range(20):
+        spec = sweep_service.parse_sweep_spec({"strategy": "lhs", "budget": 5, "seed": seed})
+        samples = list(sweep_service.sample_values(spec, [[1, 2], ["a", "b", "c"]]))
+        assert len(samples) == len(set(samples)) == 5
+
+async def test_early_stopper_stops_trials_outside_top_fraction():
+    """Successive halving, bir basamakta en iyi 1/eta dışında kalan denemeyi durdurmalıdır."""
+    from azuraforge_api.services import sweep_service
+
+    spec = sweep_service.parse_sweep_spec({"strategy": "halving", "budget": 3, "eta": 3, "min_epochs": 2})
+    stopper = sweep_service.EarlyStopper(spec, ["a", "b", "c"])
+
+    assert stopper.observe("a", {"epoch": 1, "loss": 0.1}) is False  # henüz basamağa ulaşmadı
+    assert stopper.observe("a", {"epoch": 2, "loss": 0.1}) is False
+    assert stopper.observe("b", {"epoch": 2, "loss": 0.2}) is False
+    assert stopper.observe("c", {"epoch": 2, "loss": 0.9}) is True
+    assert stopper.live == {"a", "b"}
+
+async def test_config_fingerprint_ignores_grouping_and_numeric_form():
+    """Parmak izi batch bilgisinden, anahtar sırasından ve 10/10.0 farkından etkilenmemelidir."""
+    from azuraforge_api.services.fingerprint_service import config_fingerprint
+
+    a = {"pipeline_name": "p", "training_params": {"epochs": 10, "lr": 0.01}, "batch_id": "b1", "batch_name": "x"}
+    b = {"training_params": {"lr": 0.01, "epochs": 10.0}, "pipeline_name": "p"}
+    c = {"pipeline_name": "p", "training_params": {"epochs": 20, "lr": 0.01}}
+
+    assert config_fingerprint(a) == config_fingerprint(b)
+    assert config_fingerprint(a) != config_fingerprint(c)
+
+@pytest.fixture
+def fake_redis():
+    """Paylaşılan Redis havuzlarını süreç içi bir fakeredis sunucusuyla değiştirir."""
+    import fakeredis
+    from azuraforge_api.core.redis_pool import redis_pools
+
+    server = fakeredis.FakeServer()
+    with patch.object(redis_pools, "sync_client", lambda decode_responses=False: fakeredis.FakeRedis(server=server, decode_responses=decode_responses)), \
+            patch.object(redis_pools, "async_client", lambda decode_responses=False: fakeredis.FakeAsyncRedis(server=server, decode_responses=decode_responses)):
+        yield fakeredis.FakeRedis(server=server, decode_responses=True)
+
+async def test_pending_index_entry_is_reused_only_when_dispatched(fake_redis):
+    """Celery bilinmeyen görevler için de PENDING der; indeksteki PENDING görev sadece yayın işareti varsa kullanılmalıdır."""
+    from types import SimpleNamespace
+    from azuraforge_api.services import fingerprint_service
+
+    fp = fingerprint_service.config_fingerprint({"pipeline_name": "p", "training_params": {"epochs": 10}})
+    key = f"{fingerprint_service.FINGERPRINT_INDEX_PREFIX}{fp}"
+    with patch.object(experiment_service, "_async_result", return_value=SimpleNamespace(state="PENDING")):
+        # Hiç yayınlanmamış (veya sonucu süresi dolmuş) bir göreve işaret eden kayıt silinir.
+        fake_redis.set(key, "ghost-task", ex=fingerprint_service.FINGERPRINT_INDEX_TTL_SECONDS)
+        assert experiment_service._find_indexed_tasks([fp]) == {}
+        assert fake_redis.get(key) is None
+        # Başka bir isteğin gönderdiği, henüz yayınlanmamış taze sahiplenme ne kullanılır ne silinir.
+        assert fingerprint_service.claim({fp: "claimed-task"}) == {fp: "claimed-task"}
+        assert experiment_service._find_indexed_tasks([fp]) == {}
+        assert fake_redis.get(key) == "claimed-task"
+        # Yayınlandıktan sonra kuyrukta bekleyen görev yeniden kullanılır.
+        fingerprint_service.index({fp: "claimed-task"})
+        assert experiment_service._find_indexed_tasks([fp]) == {fp: "claimed-task"}
+
+async def test_failed_dispatch_releases_claimed_fingerprints(fake_redis):
+    """Yayın yarıda kalırsa sahiplenilen parmak izi bırakılmalı; aynı config'in sonraki gönderimi yeni bir görev almalıdır."""
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=[])
+    celery_app = MagicMock()
+    celery_app.send_task.side_effect = ConnectionError("broker down")
+    config = {"pipeline_name": "p", "training_params": {"epochs": 10, "lr": 0.01}}
+
+    with patch.object(experiment_service, "get_celery_app", return_value=celery_app), \
+            patch.object(experiment_service, "_async_result", return_value=SimpleNamespace(state="PENDING")):
+        with pytest.raises(ConnectionError):
+            await experiment_service.start_experiment(db, dict(config))
+        failed_task_id = celery_app.send_task.call_args.kwargs["task_id"]
+
+        celery_app.send_task.side_effect = None
+        response = await experiment_service.start_experiment(db, dict(config))
+
+    assert response["reused"] is False
+    assert response["task_id"] != failed_task_id
+    assert celery_app.send_task.call_args.kwargs["task_id"] == response["task_id"]
+
+async def test_failed_prediction_releases_shared_inflight_key(fake_redis):
+    """Sahibin görevi başarısız olunca paylaşılan inflight anahtarı silinmeli; sonraki istek yeni bir görev başlatmalıdır."""
+    from unittest.mock import AsyncMock, MagicMock
+    from azuraforge_api.services.prediction_cache import PredictionCache, PREDICTION_INFLIGHT_PREFIX
+
+    cache = PredictionCache(maxsize=8, ttl=60, shared=True)
+    celery_app = MagicMock()
+    celery_app.backend.exception_to_python.return_value = RuntimeError("model exploded")
+    waiter = MagicMock()
+    waiter.wait = AsyncMock(return_value={"status": "FAILURE", "result": {"exc_message": "model exploded"}})
+
+    with patch.object(experiment_service, "prediction_cache", cache), \
+            patch.object(experiment_service, "result_waiter", waiter), \
+            patch.object(experiment_service, "get_celery_app", return_value=celery_app):
+        for _ in range(2):
+            with pytest.raises(experiment_service.AzuraForgeException):
+                await experiment_service._run_prediction_task("k1", "exp-1", None, 5)
+            assert fake_redis.get(f"{PREDICTION_INFLIGHT_PREFIX}k1") is None
+
+    first, second = [c.kwargs["task_id"] for c in celery_app.send_task.call_args_list]
+    assert first != second
+
+    # Karşılaştır-ve-sil: başka bir görevin sahiplendiği anahtar silinmez.
+    fake_redis.set(f"{PREDICTION_INFLIGHT_PREFIX}k2", "other-task")
+    await cache.release_inflight("k2", "my-task")
+    assert fake_redis.get(f"{PREDICTION_INFLIGHT_PREFIX}k2") == "other-task"
+
+async def test_fingerprint_release_only_deletes_entries_it_still_owns(fake_redis):
+    """Başarısız bir gönderim, indeksi bu arada sahiplenmiş başka bir batch'in kaydını silmemelidir."""
+    from azuraforge_api.services import fingerprint_service
+
+    key = f"{fingerprint_service.FINGERPRINT_INDEX_PREFIX}fp-1"
+    fake_redis.set(key, "other-batch-task")
+    fingerprint_service.release({"fp-1": "failed-task"})
+    assert fake_redis.get(key) == "other-batch-task"
+    fingerprint_service.release({"fp-1": "other-batch-task"})
+    assert fake_redis.get(key) is None
+
+async def test_reusable_task_lookup_uses_indexed_summary_column(fake_redis):
+    """Redis indeksinde olmayan parmak izleri özet tablosunun sütunundan bulunmalı; şema yoksa veritabanına gidilmemelidir."""
+    from unittest.mock import AsyncMock, MagicMock
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from azuraforge_dbmodels import Experiment
+    from azuraforge_api.services import summary_service
+
+    db = MagicMock()
+    db.execute = AsyncMock()
+    assert await experiment_service._find_reusable_tasks(db, ["fp-1"]) == {}
+    db.execute.assert_not_called()
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Experiment.metadata.create_all)
+    await summary_service.install_summary_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(Experiment.__table__.insert(), [
+            {"id": "e1", "task_id": "task-ok", "status": "SUCCESS", "config": {"config_fingerprint": "fp-1"}},
+            {"id": "e2", "task_id": "task-failed", "status": "FAILURE", "config": {"config_fingerprint": "fp-2"}},
+        ])
+    async with AsyncSession(engine) as session:
+        assert await experiment_service._find_reusable_tasks(session, ["fp-1", "fp-2"]) == {"fp-1": "task-ok"}
+    await engine.dispose()
+
+async def test_result_waiter_resolves_only_on_final_state():
+    """Ara durum yayınları (STARTED/PROGRESS) bekleyen tahmini çözmemeli, SUCCESS çözmelidir."""
+    import asyncio
+    import json
+    from unittest.mock import MagicMock
+    from azuraforge_api.services.result_waiter import ResultWaiter
+
+    fake_app = MagicMock()
+    fake_app.backend.decode_result.side_effect = json.loads
+    waiter = ResultWaiter(fake_app)
+    future = asyncio.get_running_loop().create_future()
+    waiter._pending["task-1"] = (future, 1)
+
+    waiter._resolve("task-1", json.dumps({"status": "STARTED"}))
+    assert not future.done()
+    waiter._resolve("task-1", json.dumps({"status": "SUCCESS", "result": {"prediction": 1.0}}))
+    assert future.result()["result"] == {"prediction": 1.0}
+
+async def test_prediction_cache_coalesces_identical_requests():
+    """Aynı anahtar için eşzamanlı istekler tek bir hesaplamayı paylaşmalı, sonraki istek önbellekten dönmelidir."""
+    import asyncio
+    from azuraforge_api.services.prediction_cache import PredictionCache, prediction_cache_key
+
+    cache = PredictionCache(maxsize=8, ttl=60, shared=False)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"prediction": 42.0}
+
+    key = prediction_cache_key("exp-1", "model.pt@1", None, 5)
+    results = await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(10)))
+    assert calls == 1
+    assert all(r == {"prediction": 42.0} for r in results)
+
+    assert await cache.get_or_compute(key, compute) == {"prediction": 42.0}
+    assert calls == 1
+    assert prediction_cache_key("exp-1", "model.pt@2", None, 5) != key
+
+async def test_model_server_falls_back_for_cold_and_large_models(tmp_path):
+    """Soğuk model Celery'ye düşmeli ve ısıtılmalı; sınırdan büyük model hiç ısıtılmamalıdır."""
+    from unittest.mock import patch
+    from azuraforge_api.services.model_server import ModelServer
+
+    small, large = tmp_path / "small.pt", tmp_path / "large.pt"
+    small.write_bytes(b"x" * 10)
+    large.write_bytes(b"x" * 100)
+    server = ModelServer(enabled=True, workers=1, max_models=2, max_model_bytes=50)
+
+    with patch.object(server, "_warm") as mock_warm:
+        assert await server.predict("exp:1", "p", {}, str(large), None, 5) is None
+        mock_warm.assert_not_called()
+        assert await server.predict("exp:2", "p", {}, str(small), None, 5) is None
+        mock_warm.assert_called_once_with("exp:2", "p", {}, str(small))
+    assert server.stats()["fallbacks"] == 2
+
+async def test_model_server_routes_each_model_to_the_process_that_warmed_it(tmp_path):
+    """Birden çok sunum sürecinde, ısıtılan model her tahminde aynı sürece gitmeli (soğuk sürece düşmemeli)."""
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest.mock import patch
+    from azuraforge_api.services import model_server as model_server_module
+    from azuraforge_api.services.model_server import ModelServer
+
+    model = tmp_path / "model.pt"
+    model.write_bytes(b"x" * 10)
+    server = ModelServer(enabled=True, workers=4, max_models=8, max_model_bytes=50)
+    server._executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"shard{i}") for i in range(4)]
+    warmed_on = {}
+
+    def fake_warm(model_key, *args):
+        warmed_on[model_key] = threading.current_thread().name
+
+    def fake_predict(model_key, *args):
+        return {"thread": threading.current_thread().name}
+
+    keys = [f"exp-{i}:model.pt@1" for i in range(8)]
+    with patch.object(model_server_module, "_warm_in_process", fake_warm), \
+            patch.object(model_server_module, "_predict_in_process", fake_predict):
+        for key in keys:
+            assert await server.predict(key, "p", {}, str(model), None, 5) is None
+        await asyncio.gather(*server._warming.values(), return_exceptions=True)
+        await asyncio.sleep(0)  # ısıtma tamamlanma callback'leri çalışsın
+        for key in keys:
+            result = await server.predict(key, "p", {}, str(model), None, 5)
+            assert result == {"thread": warmed_on[key]}
+    assert len({name.split("_")[0] for name in warmed_on.values()}) > 1
+    server.shutdown()
+
+async def test_cached_user_skips_database_until_invalidated():
+    """Token doğrulaması kullanıcıyı önbellekten almalı; invalidate sonrası tekrar okumalıdır."""
+    from unittest.mock import MagicMock, AsyncMock
+    from azuraforge_api.services import user_service
+
+    user = MagicMock(username="alice")
+    db = MagicMock()
+    db.scalar = AsyncMock(return_value=user)
+    user_service.invalidate_cached_user()
+
+    assert await user_service.get_cached_user(db, "alice") is user
+    assert await user_service.get_cached_user(db, "alice") is user
+    assert db.scalar.await_count == 1
+
+    user_service.invalidate_cached_user("alice")
+    await user_service.get_cached_user(db, "alice")
+    assert db.scalar.await_count == 2
+    user_service.invalidate_cached_user()
+
+async def test_report_content_is_compressed_and_revalidated(tmp_path, authed_client: AsyncClient):
+    """Rapor gzip ile sıkıştırılmalı, bitmiş deneyde uzun ömürlü olmalı ve aynı ETag ile 304 dönmelidir."""
+    (tmp_path / "report.md").write_text("# Rapor\n" + "satır\n" * 200, encoding="utf-8")
+
+    with patch('azuraforge_api.services.experiment_service.get_experiment_report_location', return_value=(str(tmp_path), True)):
+        response = await authed_client.get("/api/v1/experiments/exp-1/report/content", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.text.startswith("# Rapor")
+
+        revalidated = await authed_client.get("/api/v1/experiments/exp-1/report/content", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+
+async def test_stream_zip_applies_filters(tmp_path):
+    """Akışla üretilen zip geçerli olmalı ve include/exclude desenlerine uymalıdır."""
+    import io
+    import zipfile
+    from azuraforge_api.services import artifact_archive
+
+    (tmp_path / "images").mkdir()
+    (tmp_path / "report.md").write_text("# Rapor\n" * 100)
+    (tmp_path / "images" / "loss.png").write_bytes(b"\x89PNG" + b"0" * 1000)
+    (tmp_path / "model.pt").write_bytes(b"weights" * 100)
+
+    entries = artifact_archive.iter_directory(str(tmp_path), prefix="exp-1/", exclude=artifact_archive.parse_patterns("*.pt"))
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(artifact_archive.stream_zip(entries))))
+
+    assert archive.namelist() == ["exp-1/report.md", "exp-1/images/loss.png"]
+    assert archive.read("exp-1/report.md") == b"# Rapor\n" * 100
+    assert archive.testzip() is None
+
+async def test_batch_quantile_matches_percentile_cont():
+    """SQL dışı kantil hesabı PostgreSQL percentile_cont ile aynı doğrusal enterpolasyonu kullanmalıdır."""
+    from azuraforge_api.services.batch_service import _quantile
+
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert _quantile(values, 0.5) == 2.5
+    assert _quantile(values, 0.25) == 1.75
+    assert _quantile([7.0], 0.75) == 7.0
+    assert _quantile([], 0.5) is None
+
+async def test_batch_leaderboard_rejects_unknown_metric(authed_client: AsyncClient):
+    """Bilinmeyen bir metrik 400 ve INVALID_METRIC döndürmelidir."""
+    response = await authed_client.get("/api/v1/batches/b1/leaderboard", params={"metric": "bogus"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_METRIC"
+
+async def test_lttb_keeps_endpoints_and_extremes():
+    """LTTB hedef nokta sayısına inmeli, uçları ve belirgin bir tepeyi korumalıdır."""
+    from azuraforge_api.services.curve_service import lttb
+
+    xs = list(range(1, 1001))
+    ys = [1.0 / x for x in xs]
+    ys[500] = 5.0  # keskin bir sıçrama
+    out_x, out_y = lttb(xs, ys, 50)
+
+    assert len(out_x) == len(out_y) == 50
+    assert (out_x[0], out_x[-1]) == (1, 1000)
+    assert 5.0 in out_y
+    assert out_x == sorted(out_x)
+
+async def test_curve_cache_is_bounded_by_total_points():
+    """Eğri önbelleği toplam nokta sınırını aşınca en eski kayıtları atmalı, sınırdan büyük kaydı hiç tutmamalıdır."""
+    from azuraforge_api.core.cache import TTLCache
+    from azuraforge_api.services.curve_service import _curve_points
+
+    def curve(n):
+        return {"status": "COMPLETED", "series": {"loss": {"x": list(range(n)), "y": [0.0] * n, "original_length": n}}}
+
+    cache = TTLCache(maxsize=100, ttl=None, weigher=_curve_points, maxweight=250)
+    cache.set("a", curve(100)); cache.set("b", curve(100))
+    assert cache.weight == 200
+    cache.set("c", curve(100))
+    assert cache.get("a") is None and cache.get("c") is not None and cache.weight == 200
+    cache.set("b", curve(10))
+    assert cache.weight == 110
+    cache.set("huge", curve(300))
+    assert cache.get("huge") is None and len(cache) == 2
+    cache.pop("b")
+    assert cache.weight == 100
+
+async def test_accept_negotiation_prefers_highest_quality():
+    """Accept müzakeresi q değerine göre seçmeli, üretilemeyen temsil için 406 vermelidir."""
+    from unittest.mock import MagicMock
+    from fastapi import HTTPException
+    from azuraforge_api.core import negotiation
+
+    assert negotiation.negotiate(None) == negotiation.JSON
+    assert negotiation.negotiate("text/html, */*;q=0.8") == negotiation.JSON
+    with patch.object(negotiation, "msgpack", MagicMock()):
+        assert negotiation.negotiate("application/json;q=0.5, application/x-msgpack") == negotiation.MSGPACK
+    with patch.object(negotiation, "msgpack", None), pytest.raises(HTTPException) as exc_info:
+        negotiation.negotiate("application/msgpack")
+    assert exc_info.value.status_code == 406
+
+async def test_arrow_table_encodes_mixed_config_shapes_as_json():
+    """Satırdan satıra tipi değişen config değerleri Arrow tablosunu bozmamalı; serbest alanlar JSON metni olmalıdır."""
+    pyarrow = pytest.importorskip("pyarrow")
+    import json
+    import pyarrow.ipc
+    from azuraforge_api.core import negotiation
+    from azuraforge_api.services import experiment_service
+
+    rows = [
+        {"experiment_id": "parent", "config": {"training_params": {"lr": "0.01,0.1"}}, "config_summary": {"epochs": 10.0}},
+        {"experiment_id": "child", "config": {"training_params": {"lr": 0.01}}, "config_summary": {"epochs": None}},
+        {"experiment_id": "empty", "config": None, "config_summary": {"epochs": 5.0}},
+    ]
+    table = negotiation.rows_to_table(rows, json_columns=experiment_service.EXPERIMENT_BLOB_FIELDS)
+
+    assert str(table.schema.field("config").type) == "string"
+    assert [json.loads(v) if v else v for v in table.column("config").to_pylist()] == [r["config"] for r in rows]
+    assert table.column("config_summary").to_pylist()[0] == {"epochs": 10.0}
+    assert json.loads(table.schema.metadata[b"json_columns"]) == ["config"]
+    body = negotiation.render(rows, negotiation.ARROW, to_table=lambda r: negotiation.rows_to_table(r, json_columns=["config"])).body
+    assert pyarrow.ipc.open_stream(body).read_all().num_rows == 3
+
+async def test_list_experiments_pages_through_null_created_at_rows():
+    """`created_at`'i NULL olan satırlar sayfa sınırına denk gelse de atlanmadan ve tekrarlanmadan listelenmelidir."""
+    from datetime import datetime
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from azuraforge_dbmodels import Experiment
+    from azuraforge_api.services import summary_service
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Experiment.metadata.create_all)
+        await conn.execute(Experiment.__table__.insert(), [
+            {"id": "a", "created_at": datetime(2024, 3, 1)}, {"id": "b", "created_at": datetime(2024, 2, 1)},
+            {"id": "c", "created_at": None}, {"id": "d", "created_at": None}, {"id": "e", "created_at": datetime(2024, 1, 1)},
+        ])
+    await summary_service.install_summary_schema(engine)
+    pages, cursor = [], None
+    async with AsyncSession(engine) as db:
+        while True:
+            page = await experiment_service.list_experiments(db, limit=2, cursor=cursor, fields="experiment_id")
+            pages.append([item["experiment_id"] for item in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None: break
+    await engine.dispose()
+
+    assert pages == [["a", "b"], ["e", "d"], ["c"]]
+
+async def test_experiment_summary_triggers_and_backfill():
+    """Özet tablosu yazmada tetikleyicilerle güncellenmeli; backfill sadece eksik satırları doldurmalıdır."""
+    import json
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from azuraforge_api.services import summary_service
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE experiments (id VARCHAR PRIMARY KEY, config JSON, results JSON)"))
+        await conn.execute(text("INSERT INTO experiments VALUES ('old', :c, NULL)"), {"c": json.dumps({"data_sourcing": {"ticker": "MSFT"}})})
+    await summary_service.install_summary_schema(engine)
+    async with AsyncSession(engine) as db:
+        assert await summary_service.backfill_experiment_summaries(db) == 1
+        assert await summary_service.backfill_experiment_summaries(db) == 0
+        await db.execute(text("INSERT INTO experiments VALUES ('new', :c, NULL)"), {"c": json.dumps({"training_params": {"epochs": 5}})})
+        await db.execute(text("UPDATE experiments SET results = :r WHERE id = 'old'"), {"r": json.dumps({"metrics": {"r2_score": 0.9, "mae": "n/a"}})})
+        rows = {row.experiment_id: row for row in await db.execute(text("SELECT * FROM experiment_summaries"))}
+    await engine.dispose()
+
+    assert rows["new"].epochs == 5
+    assert (rows["old"].ticker, rows["old"].r2_score, rows["old"].mae) == ("MSFT", 0.9, None)
+
+async def test_listing_and_ranking_work_without_the_summary_schema():
+    """Özet şeması kurulu değilken listeleme ve batch sıralaması join yapmadan, aynı sonuçlarla çalışmalıdır."""
+    from datetime import datetime
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from azuraforge_dbmodels import Experiment
+    from azuraforge_api.services import batch_service, summary_service
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Experiment.metadata.create_all)
+        await conn.execute(Experiment.__table__.insert(), [
+            {"id": f"e{i}", "batch_id": "b1", "status": "SUCCESS", "created_at": datetime(2024, 1, i + 1),
+             "config": {"data_sourcing": {"ticker": "MSFT"}, "training_params": {"epochs": 10, "lr": 0.01 * (i + 1)}},
+             "results": {"final_loss": 1.0 / (i + 1), "metrics": {"r2_score": 0.1 * i, "mae": "n/a"}}}
+            for i in range(4)
+        ])
+    assert await summary_service.check_summary_schema(engine) is False
+
+    async def snapshot():
+        async with AsyncSession(engine) as db:
+            listing = await experiment_service.list_experiments(db, limit=3, fields="experiment_id,config_summary,results_summary")
+            leaderboard = await batch_service.get_batch_leaderboard(db, "b1", metric="r2_score", k=2)
+            summary = await batch_service.get_batch_summary(db, "b1", top_k=2)
+        return listing, leaderboard, summary
+
+    without_schema = await snapshot()
+    assert without_schema[0]["items"][0]["config_summary"] == {"ticker": "MSFT", "epochs": 10, "lr": 0.04}
+    assert [item["experiment_id"] for item in without_schema[1]["items"]] == ["e3", "e2"]
+
+    await summary_service.install_summary_schema(engine)
+    async with AsyncSession(engine) as db:
+        await summary_service.backfill_experiment_summaries(db)
+    with_schema = await snapshot()
+    await engine.dispose()
+    assert without_schema == with_schema
+
+async def test_summary_schema_is_checked_at_startup_and_installed_explicitly():
+    """Başlangıç kontrolü DDL çalıştırmamalı; açık kurulum değişmiş SQLite tetikleyici gövdelerini yenilemelidir."""
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from azuraforge_api.services import summary_service
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE experiments (id VARCHAR PRIMARY KEY, config JSON, results JSON)"))
+    assert await summary_service.check_summary_schema(engine) is False
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM sqlite_master WHERE name = 'experiment_summaries'"))).scalar() == 0
+
+    assert await summary_service.install_summary_schema(engine) is True
+    assert await summary_service.check_summary_schema(engine) is True
+    assert await summary_service.install_summary_schema(engine) is False
+
+    # Eski bir sürümün tetikleyicisi: kontrol bunu fark etmeli, kurulum yenisiyle değiştirmeli.
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TRIGGER azuraforge_experiment_summary_insert"))
+        await conn.execute(text("CREATE TRIGGER azuraforge_experiment_summary_insert AFTER INSERT ON experiments BEGIN SELECT 1; END"))
+    assert await summary_service.check_summary_schema(engine) is False
+    assert await summary_service.install_summary_schema(engine) is True
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO experiments VALUES ('x', '{\"training_params\": {\"epochs\": 3}}', NULL)"))
+        assert (await conn.execute(text("SELECT epochs FROM experiment_summaries WHERE experiment_id = 'x'"))).scalar() == 3
+    await engine.dispose()
+
+async def test_metrics_endpoint_labels_by_route_template(async_client: AsyncClient):
+    """/metrics istekleri ham yol yerine route şablonuyla etiketlemeli ve kuyruk derinliğini raporlamalıdır."""
+    from unittest.mock import MagicMock
+    redis_client = MagicMock()
+    redis_client.llen.return_value = 3
+
+    await async_client.get("/api/v1/experiments/abc123/details")
+    with patch("azuraforge_api.routes.metrics.redis_pools.sync_client", return_value=redis_client):
+        response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'route="/api/v1/experiments/{experiment_id}/details",status="401"' in response.text
+    assert "abc123" not in response.text
+    assert 'azuraforge_celery_queue_depth{queue="celery"} 3.0' in response.text
+
+async def test_profiling_is_admin_only_and_adds_server_timing():
+    """Sadece yöneticinin istediği istekler profillenmeli; Server-Timing başlığı sadece yöneticilere gönderilmelidir."""
+    from types import SimpleNamespace
+    from azuraforge_api.core.security import create_access_token
+
+    app.dependency_overrides[security.get_current_user] = lambda: SimpleNamespace(username="admin")
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            admin = {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"}
+            other = {"Authorization": f"Bearer {create_access_token({'sub': 'someone'})}"}
+
+            response = await client.get("/api/v1/system/model-serving", headers={**admin, "X-Profile": "1"})
+            profile_id = response.headers.get("x-profile-id")
+            assert response.status_code == 200 and profile_id
+            assert "total;dur=" in response.headers["server-timing"]
+
+            profile = await client.get(f"/api/v1/system/profiles/{profile_id}", headers=admin)
+            assert profile.status_code == 200
+
+            response = await client.get("/api/v1/system/model-serving", params={"profile": "1"}, headers=other)
+            assert "x-profile-id" not in response.headers
+            assert "server-timing" not in response.headers
+            response = await client.get("/api/v1/system/model-serving")
+            assert "server-timing" not in response.headers
+    finally:
+        app.dependency_overrides.pop(security.get_current_user, None)
+
+async def test_failed_queries_are_timed_without_leaking_state():
+    """Hata veren sorgu da `db` fazına eklenmeli ve bağlantıda başlangıç zamanı bırakmamalıdır."""
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.exc import OperationalError
+    from azuraforge_api import database
+
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", database._before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", database._after_cursor_execute)
+    event.listen(engine, "handle_error", database._handle_error)
+    with patch.object(database, "record_phase") as record_phase, engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert record_phase.call_count == 4
+        assert "query_start" not in conn.info
+    engine.dispose()
+
+async def test_import_does_not_load_heavy_dependencies():
+    """Uygulama import'u pandas/numpy/pyarrow/celery yüklememeli; veritabanı engine'i de ilk kullanıma kadar kurulmamalı."""
+    import json
+    import subprocess
+    import sys
+
+    code = (
+        "import json, sys\n"
+        "import azuraforge_api.main\n"
+        "from azuraforge_api import database\n"
+        "print(json.dumps({'loaded': [m for m in ('pandas', 'numpy', 'pyarrow', 'celery', 'kombu') if m in sys.modules], 'engine': database._engine is not None}))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == {"loaded": [], "engine": False}
+
+async def test_bulk_task_status_reads_backend_in_one_pipeline(authed_client: AsyncClient):
+    """Toplu durum sorgusu tüm görevleri tek pipeline ile okumalı, durum haritası ve sayıları döndürmelidir."""
+    from unittest.mock import AsyncMock, MagicMock
+    backend = experiment_service.celery_app.backend
+    # Redis istemcisi (decode_responses=False) değerleri bayt olarak döndürür.
+    encode = lambda meta: (lambda v: v if isinstance(v, bytes) else v.encode("utf-8"))(backend.encode(meta))
+    success = encode({"status": "SUCCESS", "result": {"history": {"loss": [0.1] * 1000}}})
+    failure = encode({"status": "FAILURE", "result": {"exc_type": "ValueError"}})
+
+    pipe = MagicMock()
+    # task-1: JSON, durum baştaki baytlarda; task-2: henüz anahtar yok; task-3: durum önekte yok, tam değer okunur.
+    pipe.execute = AsyncMock(return_value=[success[:64], b"", b"\x80\x04 not json"])
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value = pipe
+    redis_client.mget = AsyncMock(return_value=[failure])
+
+    with patch("azuraforge_api.services.experiment_service.redis_pools.async_client", return_value=redis_client):
+        response = await authed_client.post("/api/v1/experiments/status", json={"task_ids": ["task-1", "task-2", "task-3", "task-1"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["statuses"] == {"task-1": "SUCCESS", "task-2": "PENDING", "task-3": "FAILURE"}
+    assert body["counts"] == {"SUCCESS": 1, "PENDING": 1, "FAILURE": 1}
+    assert (body["total"], body["finished"], body["done"]) == (3, 2, False)
+    assert pipe.getrange.call_count == 3
+    redis_client.mget.assert_awaited_once_with([backend.get_key_for_task("task-3")])